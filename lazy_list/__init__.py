@@ -1,6 +1,9 @@
+from lazy_list.async_lazy_list import AsyncLazyList
 from lazy_list.eager_list import EagerList
 from lazy_list.lazy_list import LazyList
+from lazy_list.memory import track_memory
+from lazy_list.profiling import profile
 from lazy_list.str_list import StrList
 
 __version__ = "0.1.0"
-__all__ = ["EagerList", "LazyList", "StrList"]
+__all__ = ["AsyncLazyList", "EagerList", "LazyList", "StrList", "profile", "track_memory"]
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import operator
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+from lazy_list.memory import sizeof
+from lazy_list.spill import SpillFile
+
+# number of partition files a table is spilled to
+FANOUT = 16
+# partitions are not split further after this many levels, e.g. when a single group is too big
+MAX_DEPTH = 8
+# rough size of a table entry besides its key and value, in bytes
+ENTRY_SIZE = 100
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class Aggregation(NamedTuple):
+    """How the items of a group are folded: the first item of a group is turned into an
+    accumulator with `start`, the next ones are added with `add`, and `finish` turns the
+    accumulator into the result of the group."""
+
+    start: Callable[[Any], Any]
+    add: Callable[[Any, Any], Any]
+    finish: Callable[[Any], Any] = _identity
+    # whether the accumulator keeps every item, like a list of the items of a group
+    grows: bool = False
+    # combines the accumulators of two consecutive runs of items of a group
+    merge: Callable[[Any, Any], Any] | None = None
+
+
+def _count_start(_: Any) -> int:
+    return 1
+
+
+def _count_add(count: int, _: Any) -> int:
+    return count + 1
+
+
+def _group_start(value: Any) -> List[Any]:
+    return [value]
+
+
+def _group_add(group: List[Any], value: Any) -> List[Any]:
+    group.append(value)
+    return group
+
+
+def _group_merge(group: List[Any], other: List[Any]) -> List[Any]:
+    group.extend(other)
+    return group
+
+
+COUNT = Aggregation(_count_start, _count_add, merge=operator.add)
+
+
+def reduction(reducer: Callable[[Any, Any], Any]) -> Aggregation:
+    """Reduce the items of a group with `reducer`. Merging partial results with `reducer` too
+    assumes it is associative."""
+    return Aggregation(_identity, reducer, merge=reducer)
+
+
+def grouping(finish: Callable[[List[Any]], Any] = _identity) -> Aggregation:
+    return Aggregation(_group_start, _group_add, finish, grows=True, merge=_group_merge)
+
+
+def combine(key: Callable[[Any], Any] | None, aggregation: Aggregation, values: Iterable[Any]) -> Dict[Any, Any]:
+    """The accumulators of the groups of `values`, by key. A `key` of `None` groups equal items."""
+    if key is None and aggregation == COUNT:
+        return dict(Counter(values))
+    table: Dict[Any, Any] = {}
+    for value in values:
+        group = value if key is None else key(value)
+        table[group] = aggregation.add(table[group], value) if group in table else aggregation.start(value)
+    return table
+
+
+def merge_into(table: Dict[Any, Any], partial: Dict[Any, Any], aggregation: Aggregation):
+    """Merge the accumulators of `partial` into `table`, whose items came first."""
+    for group, accumulator in partial.items():
+        table[group] = aggregation.merge(table[group], accumulator) if group in table else accumulator
+
+
+# A record is `(key, partial, value)`: an item, or the accumulator of the items of its key that
+# were aggregated before the table was spilled if `partial` is true.
+Record = Tuple[Any, bool, Any]
+
+
+def hash_aggregate(
+    values: Iterable[Any],
+    key: Callable[[Any], Any],
+    aggregation: Aggregation,
+    memory_limit: int,
+    directory: str | None = None,
+) -> Iterator[Tuple[Any, Any]]:
+    """Aggregate the items of each group and yield `(key, result)` pairs, keeping a table of
+    about `memory_limit` bytes in memory.
+
+    When the table grows over the limit, the accumulators in it and all the remaining items are
+    spilled to `FANOUT` temporary files in `directory` by the hash of their key, and each file
+    is aggregated in turn, spilling again if needed. The accumulator of a key is written before
+    its later items, so every group is still folded from left to right and `add` does not need
+    to be associative. Groups come out in order of their first item if nothing was spilled,
+    otherwise in no particular order."""
+    if memory_limit < 1:
+        raise ValueError("`memory_limit` must be a positive value")
+    records = ((key(value), False, value) for value in values)
+    return _aggregate(records, aggregation, memory_limit, directory, 0)
+
+
+def _aggregate(
+    records: Iterable[Record],
+    aggregation: Aggregation,
+    memory_limit: int,
+    directory: str | None,
+    depth: int,
+) -> Iterator[Tuple[Any, Any]]:
+    table: Dict[Any, Any] = {}
+    size = 0
+    records = iter(records)
+    for group, partial, value in records:
+        if group in table:
+            table[group] = aggregation.add(table[group], value)
+            if aggregation.grows:
+                size += sizeof(value) + 8
+        else:
+            table[group] = value if partial else aggregation.start(value)
+            size += sizeof(group) + sizeof(value) + ENTRY_SIZE
+        if size > memory_limit and depth < MAX_DEPTH:
+            yield from _spill(table, records, aggregation, memory_limit, directory, depth)
+            return
+    for group, accumulator in table.items():
+        yield group, aggregation.finish(accumulator)
+
+
+def _spill(
+    table: Dict[Any, Any],
+    records: Iterator[Record],
+    aggregation: Aggregation,
+    memory_limit: int,
+    directory: str | None,
+    depth: int,
+) -> Iterator[Tuple[Any, Any]]:
+    partitions = [SpillFile(directory) for _ in range(FANOUT)]
+    try:
+        for group, accumulator in table.items():
+            # `depth` salts the hash, so the groups of a partition are split when it is spilled again
+            partitions[hash((depth, group)) % FANOUT].write((group, True, accumulator))
+        table.clear()
+        for record in records:
+            partitions[hash((depth, record[0])) % FANOUT].write(record)
+        for partition in partitions:
+            if partition.count:
+                yield from _aggregate(partition, aggregation, memory_limit, directory, depth + 1)
+            partition.close()
+    finally:
+        for partition in partitions:
+            partition.close()
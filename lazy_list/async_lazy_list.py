@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import itertools
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from lazy_list import background
+from lazy_list.lazy_list import LazyList
+
+X = TypeVar("X")
+Y = TypeVar("Y")
+
+MaybeAwaitable = Union[Y, Awaitable[Y]]
+
+
+async def _resolve(value: MaybeAwaitable[Y]) -> Y:
+    return await value if inspect.isawaitable(value) else value
+
+
+async def _from_iterable(values: Iterable[X]) -> AsyncIterator[X]:
+    for value in values:
+        yield value
+
+
+async def _map(function: Callable[[X], MaybeAwaitable[Y]], values: AsyncIterable[X]) -> AsyncIterator[Y]:
+    async for value in values:
+        yield await _resolve(function(value))
+
+
+async def _amap(
+    function: Callable[[X], MaybeAwaitable[Y]],
+    values: AsyncIterable[X],
+    concurrency: int,
+) -> AsyncIterator[Y]:
+    pending: Deque[asyncio.Future[Y]] = deque()
+    try:
+        async for value in values:
+            pending.append(asyncio.ensure_future(_resolve(function(value))))
+            if len(pending) >= concurrency:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def _filter(function: Callable[[X], MaybeAwaitable[Any]] | None, values: AsyncIterable[X]) -> AsyncIterator[X]:
+    async for value in values:
+        if (await _resolve(function(value))) if function is not None else value:
+            yield value
+
+
+async def _take(n: int, values: AsyncIterable[X]) -> AsyncIterator[X]:
+    if n <= 0:
+        return
+    count = 0
+    async for value in values:
+        yield value
+        count += 1
+        if count >= n:
+            return
+
+
+async def _partition_all(n: int, values: AsyncIterable[X]) -> AsyncIterator[Tuple[X, ...]]:
+    chunk: List[X] = []
+    async for value in values:
+        chunk.append(value)
+        if len(chunk) == n:
+            yield tuple(chunk)
+            chunk = []
+    if chunk:
+        yield tuple(chunk)
+
+
+async def _unique(values: AsyncIterable[X]) -> AsyncIterator[X]:
+    seen: Set[X] = set()
+    async for value in values:
+        if value not in seen:
+            seen.add(value)
+            yield value
+
+
+def _take_chunk(iterator: Iterator[X], n: int) -> List[X]:
+    return list(itertools.islice(iterator, n))
+
+
+class AsyncLazyList(AsyncIterable[X]):
+    """A lazily evaluated list over an async iterable, for use in asyncio code.
+
+    Mirrors the core `LazyList` API. Functions passed to `map`, `filter` and `amap` may be plain
+    functions or coroutine functions. An `AsyncLazyList` can only be iterated once.
+
+    Example:
+    >>> async def main():
+    ...     return await AsyncLazyList(fetch_all()).amap(parse, concurrency=8).take(10).to_list()
+    """
+
+    def __init__(self, values: AsyncIterable[X] | Iterable[X]):
+        """Wrap an async iterable, or a sync iterable that is iterated on the event loop.
+        Use `AsyncLazyList.from_sync` for sync sources that block."""
+        self.__values: AsyncIterable[X] | None = values if hasattr(values, "__aiter__") else _from_iterable(values)
+
+    @classmethod
+    def from_sync(cls, values: Iterable[X], chunksize: int = 64) -> "AsyncLazyList[X]":
+        """Wrap a sync iterable, such as a `LazyList`, pulling `chunksize` items at a time in the
+        default executor so a slow source does not block the event loop."""
+        if chunksize < 1:
+            raise ValueError("`chunksize` must be a positive value")
+
+        async def pull() -> AsyncIterator[X]:
+            loop = asyncio.get_running_loop()
+            iterator = iter(values)
+            while True:
+                chunk = await loop.run_in_executor(None, _take_chunk, iterator, chunksize)
+                if not chunk:
+                    return
+                for value in chunk:
+                    yield value
+
+        return cls(pull())
+
+    def __str__(self) -> str:
+        return "AsyncLazyList(...)"
+
+    def __repr__(self) -> str:
+        return "AsyncLazyList(...)"
+
+    def __aiter__(self) -> AsyncIterator[X]:
+        values = self.__values
+        if values is None:
+            raise RuntimeError("AsyncLazyList has already been iterated")
+        self.__values = None
+        return values.__aiter__()
+
+    def map(self, function: Callable[[X], MaybeAwaitable[Y]]) -> "AsyncLazyList[Y]":
+        """Map function over elements of the list, awaiting one call at a time."""
+        return AsyncLazyList(_map(function, self))
+
+    def amap(self, function: Callable[[X], MaybeAwaitable[Y]], concurrency: int = 1) -> "AsyncLazyList[Y]":
+        """Map function over elements of the list, running up to `concurrency` calls at once.
+        Results keep the order of the items."""
+        if concurrency < 1:
+            raise ValueError("`concurrency` must be a positive value")
+        return AsyncLazyList(_amap(function, self, concurrency))
+
+    def filter(self, function: Callable[[X], MaybeAwaitable[Any]] | None = None) -> "AsyncLazyList[X]":
+        """Return the items for which function(item) is true.
+        If function is None, return the items that are true."""
+        return AsyncLazyList(_filter(function, self))
+
+    def take(self, n: int) -> "AsyncLazyList[X]":
+        """The first n elements of a sequence"""
+        return AsyncLazyList(_take(n, self))
+
+    def partition_all(self, n: int) -> "AsyncLazyList[Tuple[X, ...]]":
+        """Partition all elements of sequence into tuples of length at most n
+        The final tuple may be shorter to accommodate extra elements."""
+        if n < 1:
+            raise ValueError("`n` must be a positive value")
+        return AsyncLazyList(_partition_all(n, self))
+
+    def unique(self) -> "AsyncLazyList[X]":
+        """Return only unique elements of a sequence"""
+        return AsyncLazyList(_unique(self))
+
+    async def to_list(self) -> List[X]:
+        return [value async for value in self]
+
+    def to_lazy(self, buffer_size: int = 64) -> LazyList[X]:
+        """Return a sync `LazyList` over the items.
+
+        The async pipeline runs on its own event loop in a background thread, up to
+        `buffer_size` items ahead of the consumer."""
+
+        def produce(emit: Callable[[X], bool]):
+            async def pump():
+                async for value in self:
+                    if not emit(value):
+                        return
+
+            asyncio.run(pump())
+
+        return LazyList(background.iterate_in_thread(produce, maxsize=buffer_size))
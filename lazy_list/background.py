@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Callable, Iterator, TypeVar
+
+X = TypeVar("X")
+
+_DONE = object()
+
+# how often a blocked producer checks whether the consumer has stopped, in seconds
+POLL_INTERVAL = 0.05
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def iterate_in_thread(produce: Callable[[Callable[[X], bool]], None], maxsize: int = 1) -> Iterator[X]:
+    """Run `produce` in a background thread and yield the items it emits.
+
+    `produce` is called with an `emit(item)` function that hands an item over through a queue of
+    at most `maxsize` items, blocking while the queue is full. `emit` returns `False` once the
+    consumer has stopped, and `produce` should then return. Exceptions raised by `produce` are
+    raised to the consumer. The thread starts when the first item is requested, and is joined
+    when the iterator is exhausted, fails or is closed."""
+    items: queue.Queue = queue.Queue(maxsize)
+    stopped = threading.Event()
+
+    def emit(item) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def run():
+        try:
+            produce(emit)
+            emit(_DONE)
+        except BaseException as error:
+            emit(_Failure(error))
+
+    thread = threading.Thread(target=run, name="lazy_list-producer", daemon=True)
+    thread.start()
+    try:
+        yield from _consume(items)
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def _consume(items: queue.Queue) -> Iterator[X]:
+    """Yield the items put on `items` until `_DONE`, raising the error of a `_Failure`."""
+    while True:
+        item = items.get()
+        if item is _DONE:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
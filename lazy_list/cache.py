@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import itertools
+from collections import OrderedDict
+from typing import Callable, Generic, Iterator, List, NamedTuple, TypeVar
+
+from lazy_list import memory
+from lazy_list.memory import sizeof
+
+X = TypeVar("X")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    items: int
+    bytes: int
+
+
+class _Reader(Generic[X]):
+    """Reads chunks from a fresh upstream iterator, restarting it when a chunk that is not next
+    in line is requested."""
+
+    def __init__(self, open_upstream: Callable[[], Iterator[X]]):
+        self._open_upstream = open_upstream
+        self._values: Iterator[X] | None = None
+        self._position = 0
+
+    def read(self, start: int, n: int) -> List[X]:
+        if self._values is None or self._position > start:
+            self._values = self._open_upstream()
+            self._position = 0
+        if self._position < start:
+            # skip to `start` without keeping the items
+            next(itertools.islice(self._values, start - self._position, start - self._position), None)
+            self._position = start
+        chunk = list(itertools.islice(self._values, n))
+        self._position += len(chunk)
+        return chunk
+
+
+class ChunkCache(Generic[X]):
+    """Items of an upstream iterable stored in chunks of `chunksize` items, with the least recently
+    used chunks evicted once there are more than `max_items` items or `max_bytes` bytes.
+
+    Each iteration reads the cached chunks in order. Missing chunks are read again from a new
+    upstream iterator returned by `open_upstream`. An iteration that reads the chunks in order
+    keeps its upstream iterator open between misses, so consecutive misses cost one upstream
+    item each."""
+
+    def __init__(
+        self,
+        open_upstream: Callable[[], Iterator[X]],
+        chunksize: int = 256,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        if chunksize < 1:
+            raise ValueError("`chunksize` must be a positive value")
+        self._open_upstream = open_upstream
+        self._chunksize = chunksize
+        self._max_items = max_items
+        self._max_bytes = max_bytes
+        self._chunks: OrderedDict[int, List[X]] = OrderedDict()
+        self._sizes: dict[int, int] = {}
+        self._end: int | None = None
+        self._hits = self._misses = self._evictions = self._items = self._bytes = 0
+        self._stats = memory.buffer("cache")
+
+    def __iter__(self) -> Iterator[X]:
+        reader = _Reader(self._open_upstream)
+        for index in itertools.count():
+            chunk = self._chunk(index, reader)
+            yield from chunk
+            if len(chunk) < self._chunksize:
+                return
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, self._evictions, self._items, self._bytes)
+
+    def _chunk(self, index: int, reader: _Reader[X]) -> List[X]:
+        chunk = self._chunks.get(index)
+        if chunk is not None:
+            self._chunks.move_to_end(index)
+            self._hits += 1
+            return chunk
+        if self._end is not None and index >= self._end:
+            return []
+        self._misses += 1
+        chunk = reader.read(index * self._chunksize, self._chunksize)
+        if len(chunk) < self._chunksize:
+            self._end = index + 1
+        self._store(index, chunk)
+        return chunk
+
+    def _store(self, index: int, chunk: List[X]):
+        size = sum(map(sizeof, chunk)) if self._max_bytes is not None else 0
+        self._chunks[index] = chunk
+        self._sizes[index] = size
+        self._items += len(chunk)
+        self._bytes += size
+        if self._stats is not None:
+            for value in chunk:
+                self._stats.add(value)
+        while len(self._chunks) > 1 and self._over_budget():
+            evicted, values = self._chunks.popitem(last=False)
+            self._items -= len(values)
+            self._bytes -= self._sizes.pop(evicted)
+            self._evictions += 1
+            if self._stats is not None:
+                self._stats.release(values)
+
+    def _over_budget(self) -> bool:
+        over_items = self._max_items is not None and self._items > self._max_items
+        return over_items or (self._max_bytes is not None and self._bytes > self._max_bytes)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import itertools
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from toolz import itertoolz
+
+from lazy_list.sketches import BloomFilter
+
+X = TypeVar("X")
+
+
+def exact(values: Iterable[X], key: Callable[[X], Any] | None = None) -> Iterator[X]:
+    """The first item of every key, keeping every key seen so far in a set."""
+    return itertoolz.unique(values, key)
+
+
+def window(values: Iterable[X], n: int, key: Callable[[X], Any] | None = None) -> Iterator[X]:
+    """Drop items whose key is one of the `n` most recently seen keys. A key is seen again
+    each time it occurs, so a key that keeps occurring is never let through again."""
+    if n < 1:
+        raise ValueError("`window` must be a positive value")
+    return _window(values, n, key)
+
+
+def _window(values: Iterable[X], n: int, key: Callable[[X], Any] | None) -> Iterator[X]:
+    recent: OrderedDict[Any, None] = OrderedDict()
+    for value in values:
+        k = value if key is None else key(value)
+        if k in recent:
+            recent.move_to_end(k)
+            continue
+        recent[k] = None
+        if len(recent) > n:
+            recent.popitem(last=False)
+        yield value
+
+
+def bloom(
+    values: Iterable[X],
+    key: Callable[[X], Any] | None = None,
+    capacity: int = 1_000_000,
+    error_rate: float = 0.001,
+) -> Iterator[X]:
+    """Drop items whose key is probably seen before, using a Bloom filter of fixed size.
+    About `error_rate` of the unique items are dropped by mistake, while there are fewer
+    than `capacity` unique keys. Duplicates are always dropped."""
+    return _bloom(values, key, BloomFilter(capacity, error_rate))
+
+
+def _bloom(values: Iterable[X], key: Callable[[X], Any] | None, seen: BloomFilter) -> Iterator[X]:
+    for value in values:
+        if not seen.add(value if key is None else key(value)):
+            yield value
+
+
+def adjacent(values: Iterable[X], key: Callable[[X], Any] | None = None) -> Iterator[X]:
+    """The first item of every run of items with equal keys, so all duplicates are dropped if
+    the items are sorted by key."""
+    return map(next, map(itemgetter(1), itertools.groupby(values, key)))
@@ -1,16 +1,37 @@
 from __future__ import annotations
 
 import itertools
+import math
 import random
 import statistics
 from ast import Slice
 from collections import deque
 from functools import reduce
 from operator import attrgetter, itemgetter, methodcaller
-from typing import Any, Callable, Deque, Dict, Hashable, Iterable, List, Sequence, Set, Tuple, TypeVar, overload
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Literal,
+    Sequence,
+    Set,
+    Tuple,
+    TYPE_CHECKING,
+    TypeVar,
+    overload,
+)
 
 from toolz import itertoolz
 
+from lazy_list import sketches
+
+if TYPE_CHECKING:
+    from lazy_list.lazy_list import LazyList
+
 X = TypeVar("X")
 Y = TypeVar("Y")
 Y1 = TypeVar("Y1")
@@ -43,10 +64,26 @@ class EagerList(List[X]):
         else:
             return reduce(function, self, initial)
 
+    @overload
     def sort(self, key: Callable[[X], Any] | None = None, reverse: bool = False) -> "EagerList[X]":
+        pass
+
+    @overload
+    def sort(
+        self, key: Callable[[X], Any] | None = None, reverse: bool = False, *, memory_limit: int
+    ) -> "LazyList[X]":
+        pass
+
+    def sort(self, key=None, reverse=False, memory_limit=None):
         """Return a new list containing all items from the iterable in ascending order.
         A custom key function can be supplied to customize the sort order, and the
-        reverse flag can be set to request the result in descending order."""
+        reverse flag can be set to request the result in descending order.
+
+        With `memory_limit`, the sorted copy is not built in memory: runs of about
+        `memory_limit` bytes of items are sorted and spilled to temporary files, and a
+        `LazyList` streaming the merged runs is returned."""
+        if memory_limit is not None:
+            return self.lazy.sort(key, reverse, memory_limit)
         return EagerList(sorted(self, key=key, reverse=reverse))
 
     def reverse(self) -> "EagerList[X]":
@@ -149,6 +186,29 @@ class EagerList(List[X]):
         """
         return delimiter.join(self.map(str))
 
+    def hash_join(
+        self,
+        other: Iterable[Y],
+        left_key: Callable[[X], Any],
+        right_key: Callable[[Y], Any] | None = None,
+        how: Literal["inner", "left", "outer"] = "inner",
+    ) -> "LazyList[Tuple[X | None, Y | None]]":
+        """Join with `other` on `left_key(item) == right_key(other_item)`, as a `LazyList` of
+        `(item, other_item)` pairs. See `LazyList.hash_join`."""
+        return self.lazy.hash_join(other, left_key, right_key, how)
+
+    def merge_join(
+        self,
+        other: Iterable[Y],
+        left_key: Callable[[X], Any],
+        right_key: Callable[[Y], Any] | None = None,
+        how: Literal["inner", "left", "outer"] = "inner",
+        reverse: bool = False,
+    ) -> "LazyList[Tuple[X | None, Y | None]]":
+        """Join with `other`, both sorted by key, as a `LazyList` of `(item, other_item)` pairs.
+        See `LazyList.merge_join`."""
+        return self.lazy.merge_join(other, left_key, right_key, how, reverse)
+
     def index_last(self, value: X) -> int:
         """Return the last index of value"""
         index = self.reverse().index(value)
@@ -351,6 +411,39 @@ class EagerList(List[X]):
         """Return number of unique elements"""
         return len(set(self))
 
+    def approx_n_unique(self, error: float = 0.01) -> int:
+        """Estimate the number of unique elements with a HyperLogLog sketch, using a fixed
+        amount of memory. The relative standard error of the estimate is about `error`; 1% takes
+        16 KiB. See `sketches.HyperLogLog` to merge sketches of chunks."""
+        return sketches.HyperLogLog(error).update(self).estimate()
+
+    def heavy_hitters(self, k: int, error: float | None = None) -> Dict[X, int]:
+        """Find up to `k` of the most frequent elements in a single pass with a fixed number of
+        counters (Misra-Gries summary), and return them with lower bounds of their counts, most
+        frequent first.
+
+        Every element occurring more than `n * error` times among `n` elements is found, and
+        counts are too small by at most `n * error`. `error` defaults to `1 / (k + 1)`.
+
+        Example:
+        >>> a = EagerList("abracadabra")
+        >>> a.heavy_hitters(1, error=0.1)
+        {'a': 5}"""
+        counters = k if error is None else max(k, math.ceil(1 / error) - 1)
+        summary = sketches.MisraGries(counters).update(self)
+        return dict(summary.most_common()[:k])
+
+    def approx_counts(self, error: float = 0.001, confidence: float = 0.99) -> sketches.CountMinSketch:
+        """Count the elements with a Count-Min sketch of fixed size, to estimate how often any
+        value occurs with `sketch[value]`. Estimates are never too small, and with probability
+        `confidence` they are too large by at most `n * error` for `n` elements."""
+        return sketches.CountMinSketch(error, confidence).update(self)
+
+    def approx_count(self, value: X, error: float = 0.001, confidence: float = 0.99) -> int:
+        """Estimate how often `value` occurs with a Count-Min sketch. See `approx_counts`, which
+        builds the sketch once to query many values."""
+        return self.approx_counts(error, confidence)[value]
+
     def is_distinct(self) -> bool:
         """All values in sequence are distinct"""
         return itertoolz.isdistinct(self)
@@ -577,4 +670,4 @@ class EagerList(List[X]):
     def lazy(self):
         from lazy_list.lazy_list import LazyList
 
-        return LazyList(iter(self))
+        return LazyList(self)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import itertools
+import operator
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, Sized, Tuple
+
+from lazy_list.plan import Stage
+
+# Memory classes: constant, bounded by an argument like `k` or `window`, or growing with the input
+O1 = "O(1)"
+OK = "O(k)"
+ON = "O(n)"
+
+# Memory held by the lists derived by these methods; other methods hold O(1) items
+METHODS: Dict[str, str] = {
+    "sort": ON,
+    "reverse": ON,
+    "unique": ON,
+    "cache": ON,
+    "hash_join": ON,
+    "product": ON,
+    "combinations": ON,
+    "combinations_with_replacement": ON,
+    "permutations": ON,
+    "group_by": OK,
+    "reduce_by": OK,
+    "frequencies": OK,
+    "random_sample": OK,
+    "tail": OK,
+    "top_k": OK,
+    "sliding_window": OK,
+    "partition": OK,
+    "partition_all": OK,
+    "par_map": OK,
+    "map_batches": OK,
+    "prefetch": OK,
+    "merge_join": OK,
+    "merge_sorted": OK,
+}
+
+# Memory held by methods that consume the list and return something else
+TERMINALS: Dict[str, str] = {
+    "evaluate": ON,
+    "to_list": ON,
+    "to_set": ON,
+    "to_deque": ON,
+    "is_distinct": ON,
+    "group_by": ON,
+    "reduce_by": ON,
+    "frequencies": ON,
+    "heavy_hitters": OK,
+    "approx_n_unique": O1,
+    "approx_count": O1,
+    "approx_counts": O1,
+    "get_length_eagerly": O1,
+    "find_first": O1,
+    "find_first_index": O1,
+    "find_last": O1,
+    "find_last_index": O1,
+    "index": O1,
+    "count": O1,
+    "contains": O1,
+    "all": O1,
+    "any": O1,
+    "reduce": O1,
+    "join": ON,
+    "nth": O1,
+    "at": O1,
+    "first": O1,
+    "second": O1,
+    "last": O1,
+    "__eq__": O1,
+}
+
+
+class PlanNode(NamedTuple):
+    """A step of the plan of a `LazyList`, as shown by `LazyList.explain`. Plan nodes only
+    describe the steps, they do not reference the items."""
+
+    name: str
+    detail: str = ""
+    memory: str = O1
+    inputs: Tuple["PlanNode", ...] = ()
+    # whether the number of items is known to be finite
+    bounded: bool = False
+
+
+def _name(function: Any) -> str:
+    if function is None:
+        return "None"
+    return getattr(function, "__qualname__", None) or repr(function)
+
+
+def source(values: Iterable[Any], inputs: Tuple[PlanNode, ...] = ()) -> PlanNode:
+    """The plan node of the items a `LazyList` is created from."""
+    kind = type(values).__name__
+    if inputs:
+        return PlanNode("LazyList", "", O1, inputs, all(node.bounded for node in inputs))
+    if isinstance(values, Sized):
+        return PlanNode("source", f"{kind}, {len(values)} items", O1, bounded=True)
+    hint = operator.length_hint(values, -1)
+    if hint > 0:
+        return PlanNode("source", f"{kind}, about {hint} items", O1, bounded=True)
+    infinite = isinstance(values, (itertools.count, itertools.cycle)) or (
+        isinstance(values, itertools.repeat) and hint == -1
+    )
+    return PlanNode("source", f"{kind}, {'infinite' if infinite else 'unknown length'}", O1)
+
+
+def _stage(stage: Stage, upstream: PlanNode) -> PlanNode:
+    kind, argument = stage
+    if kind == "slice":
+        start, stop, step = argument.start, argument.stop, argument.step
+        bounds = f"{'' if start in (None, 0) else start}:{'' if stop is None else stop}"
+        detail = bounds + ("" if step in (None, 1) else f":{step}")
+        bounded = upstream.bounded or (stop is not None and stop >= 0)
+        return PlanNode(kind, detail, O1, (upstream,), bounded)
+    if kind == "sort":
+        key, reverse, limit = argument
+        details = [f"key={_name(key)}"] if key is not None else []
+        details += ["reverse=True"] if reverse else []
+        details += [f"limit={limit}"] if limit is not None else []
+        memory = ON if limit is None else O1 if limit == 1 else OK
+        return PlanNode(kind, ", ".join(details), memory, (upstream,), upstream.bounded or limit is not None)
+    if kind == "reverse":
+        memory = ON if argument is None else OK
+        detail = "" if argument is None else f"limit={argument}"
+        return PlanNode(kind, detail, memory, (upstream,), upstream.bounded or argument is not None)
+    detail = "" if kind == "enumerate" else _name(argument)
+    return PlanNode(kind, detail, O1, (upstream,), upstream.bounded)
+
+
+def stages(upstream: PlanNode, run: Sequence[Stage]) -> PlanNode:
+    """The plan node of a fused run of stages, with one node per stage as they will run, e.g. a
+    `sort` followed by `take(k)` shows as a sort with a limit of k."""
+    for stage in run:
+        upstream = _stage(stage, upstream)
+    return upstream
+
+
+def _warning(node: PlanNode) -> str:
+    if node.memory == ON and not all(upstream.bounded for upstream in node.inputs):
+        return "! holds every item of an input that is not known to be bounded"
+    return ""
+
+
+def _rows(node: PlanNode, depth: int, rows: List[Tuple[str, str, str]]):
+    label = "   " * (depth - 1) + "└─ " if depth else ""
+    label += node.name + (f"({node.detail})" if node.detail else "")
+    rows.append((label, node.memory, _warning(node)))
+    for upstream in node.inputs:
+        _rows(upstream, depth + 1, rows)
+
+
+def render(node: PlanNode, terminal: str | None = None, buffered: bool = False) -> str:
+    """The plan as a tree, from the last step to the sources, with the memory class of every
+    step and warnings for the steps that hold every item of an input that may not end."""
+    if terminal is not None:
+        node = PlanNode(terminal, "", TERMINALS.get(terminal, METHODS.get(terminal, O1)), (node,), True)
+    rows: List[Tuple[str, str, str]] = []
+    _rows(node, 0, rows)
+    width = max(len(label) for label, _, _ in rows)
+    lines = [f"{label.ljust(width)}  {memory}  {warning}".rstrip() for label, memory, warning in rows]
+    if buffered:
+        lines.append("note: once iterated, the items of this list stay in its replay buffer while it is referenced;")
+        lines.append("      use `LazyList.once` to stream them instead")
+    return "\n".join(lines)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import itertools
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Set, Tuple, TypeVar
+
+X = TypeVar("X")
+Y = TypeVar("Y")
+
+JoinKind = Literal["inner", "left", "outer"]
+
+HOWS = ("inner", "left", "outer")
+
+
+def check_how(how: str):
+    if how not in HOWS:
+        raise ValueError(f"`how` must be one of {', '.join(HOWS)}, not {how!r}")
+
+
+def _table(values: Iterable[X], key: Callable[[X], Any]) -> Dict[Any, List[X]]:
+    table: Dict[Any, List[X]] = {}
+    for value in values:
+        table.setdefault(key(value), []).append(value)
+    return table
+
+
+def hash_join(
+    left: Iterable[X],
+    right: Iterable[Y],
+    left_key: Callable[[X], Any],
+    right_key: Callable[[Y], Any],
+    how: JoinKind = "inner",
+    build_left: bool = False,
+) -> Iterator[Tuple[X | None, Y | None]]:
+    """Join two iterables on equal keys, yielding `(left, right)` pairs.
+
+    A hash table is built from one side, the right one unless `build_left` is true, and the
+    other side is streamed against it, so pairs come in the order of the streamed side. With
+    `how="left"`, left items without a match are paired with `None`; with `how="outer"`, right
+    items without a match are paired with `None` too. Unmatched items of the built side come
+    after all the pairs."""
+    check_how(how)
+    keep_left = how in ("left", "outer")
+    keep_right = how == "outer"
+    if build_left:
+        return _stream_right(left, right, left_key, right_key, keep_left, keep_right)
+    return _stream_left(left, right, left_key, right_key, keep_left, keep_right)
+
+
+def _stream_left(
+    left: Iterable[X],
+    right: Iterable[Y],
+    left_key: Callable[[X], Any],
+    right_key: Callable[[Y], Any],
+    keep_left: bool,
+    keep_right: bool,
+) -> Iterator[Tuple[X | None, Y | None]]:
+    """Build a table of the right side and stream the left side against it."""
+    table = _table(right, right_key)
+    matched = set()
+    for value in left:
+        k = left_key(value)
+        matches = table.get(k)
+        if matches is None:
+            if keep_left:
+                yield value, None
+            continue
+        if keep_right:
+            matched.add(k)
+        for match in matches:
+            yield value, match
+    if keep_right:
+        for matches in _unmatched(table, matched):
+            yield from zip(itertools.repeat(None), matches)
+
+
+def _stream_right(
+    left: Iterable[X],
+    right: Iterable[Y],
+    left_key: Callable[[X], Any],
+    right_key: Callable[[Y], Any],
+    keep_left: bool,
+    keep_right: bool,
+) -> Iterator[Tuple[X | None, Y | None]]:
+    """Build a table of the left side and stream the right side against it."""
+    table = _table(left, left_key)
+    matched = set()
+    for value in right:
+        k = right_key(value)
+        matches = table.get(k)
+        if matches is None:
+            if keep_right:
+                yield None, value
+            continue
+        matched.add(k)
+        for match in matches:
+            yield match, value
+    if keep_left:
+        for matches in _unmatched(table, matched):
+            yield from zip(matches, itertools.repeat(None))
+
+
+def _unmatched(table: Dict[Any, List[X]], matched: Set[Any]) -> Iterator[List[X]]:
+    """The items of the keys of `table` that are not in `matched`."""
+    return (matches for k, matches in table.items() if k not in matched)
+
+
+def merge_join(
+    left: Iterable[X],
+    right: Iterable[Y],
+    left_key: Callable[[X], Any],
+    right_key: Callable[[Y], Any],
+    how: JoinKind = "inner",
+    reverse: bool = False,
+) -> Iterator[Tuple[X | None, Y | None]]:
+    """Join two iterables sorted by key, yielding `(left, right)` pairs in key order.
+
+    Both sides are streamed once. Only the right items of the current key are held in memory,
+    so memory is O(1) when right keys are unique. `reverse` is true if the sides are sorted in
+    descending order. Raises `ValueError` if a side turns out not to be sorted."""
+    check_how(how)
+    keep_left = how in ("left", "outer")
+    keep_right = how == "outer"
+    before = (lambda a, b: a > b) if reverse else (lambda a, b: a < b)
+    lefts = _sorted_groups(left, left_key, before, "left")
+    rights = _sorted_groups(right, right_key, before, "right")
+    left_group = next(lefts, None)
+    right_group = next(rights, None)
+    while left_group is not None and right_group is not None:
+        (lk, left_values), (rk, right_values) = left_group, right_group
+        if before(lk, rk):
+            if keep_left:
+                yield from zip(left_values, itertools.repeat(None))
+            left_group = next(lefts, None)
+        elif before(rk, lk):
+            if keep_right:
+                yield from zip(itertools.repeat(None), right_values)
+            right_group = next(rights, None)
+        else:
+            matches = list(right_values)
+            for value in left_values:
+                for match in matches:
+                    yield value, match
+            left_group = next(lefts, None)
+            right_group = next(rights, None)
+    if keep_left and left_group is not None:
+        yield from zip(_rest(left_group, lefts), itertools.repeat(None))
+    if keep_right and right_group is not None:
+        yield from zip(itertools.repeat(None), _rest(right_group, rights))
+
+
+def _rest(group: Tuple[Any, Iterator[X]], groups: Iterator[Tuple[Any, Iterator[X]]]) -> Iterator[X]:
+    """The items of `group` and of the groups after it."""
+    yield from group[1]
+    for _, values in groups:
+        yield from values
+
+
+def _sorted_groups(
+    values: Iterable[X],
+    key: Callable[[X], Any],
+    before: Callable[[Any, Any], bool],
+    side: str,
+) -> Iterator[Tuple[Any, Iterator[X]]]:
+    """`itertools.groupby` that checks that the keys are sorted."""
+    previous = None
+    for i, (k, group) in enumerate(itertools.groupby(values, key)):
+        if i and not before(previous, k):
+            raise ValueError(f"The {side} side of a merge join is not sorted by key")
+        previous = k
+        yield k, group
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import heapq
 import itertools
+import math
+import operator
 import random
+import weakref
 from collections import deque
 from functools import reduce
 from operator import attrgetter, itemgetter, methodcaller
@@ -14,8 +18,11 @@ from typing import (
     Iterable,
     Iterator,
     List,
+    Literal,
     Sequence,
     Set,
+    Sized,
+    TextIO,
     Tuple,
     TypeVar,
     overload,
@@ -24,6 +31,23 @@ from typing import (
 from toolz import itertoolz
 
 from lazy_list.eager_list import EagerList
+from lazy_list import (
+    aggregate,
+    background,
+    dedup,
+    explain,
+    joins,
+    memory,
+    parallel,
+    profiling,
+    sampling,
+    sketches,
+    spill,
+    views,
+)
+from lazy_list.cache import CacheInfo, ChunkCache
+from lazy_list.plan import BARRIERS, Stage, extend, output_length, run_stages, runnable
+from lazy_list.replay import ReplayBuffer
 
 X = TypeVar("X")
 Y = TypeVar("Y")
@@ -32,10 +56,83 @@ Y2 = TypeVar("Y2")
 Y3 = TypeVar("Y3")
 Y4 = TypeVar("Y4")
 
+_MISSING = object()
+
+
+def _identity(value: X) -> X:
+    return value
+
+
+def _check_aggregation(memory_limit: int | None, workers: int | None):
+    if memory_limit is not None and workers is not None:
+        raise ValueError("`memory_limit` and `workers` cannot be used together")
+
+
+def _known_length(values: Iterable[Any]) -> int | None:
+    if isinstance(values, LazyList):
+        return values.known_length
+    return len(values) if isinstance(values, Sized) else None
+
+
+def _add(*lengths: int | None) -> int | None:
+    return None if None in lengths else sum(lengths)
+
+
+def _mul(length: int | None, n: int) -> int | None:
+    return None if length is None else length * max(n, 0)
+
+
+def _insert(values: Iterable[X], index: int, item: X) -> Iterator[X]:
+    values = iter(values)
+    yield from itertools.islice(values, index)
+    yield item
+    yield from values
+
+
+def _map_batches(
+    function: Callable[[Sequence[X]], Sequence[Y]],
+    batches: Iterable[Tuple[X, ...]],
+    batch_type: Callable[[Iterable[X]], Sequence[X]],
+) -> Iterator[Y]:
+    for batch in batches:
+        results = function(batch_type(batch))
+        if len(results) != len(batch):
+            raise ValueError(f"`function` returned {len(results)} results for a batch of {len(batch)} items")
+        yield from results
+
 
 class LazyList(Iterable[X]):
-    def __init__(self, values: Iterable[X]):
-        self.__values = iter(values)
+    def __init__(self, values: Iterable[X], replayable: bool = True):
+        """Wrap `values` in a lazily evaluated list.
+
+        By default items are buffered as they are pulled, so the list can be iterated any number
+        of times. With `replayable=False` the source iterator is handed straight to the single
+        consumer without buffering, and iterating the list a second time raises `RuntimeError`.
+        Lists derived from a one-shot list are one-shot too."""
+        self.__replayable = replayable
+        self.__length = _known_length(values)
+        self.__length_estimate = 0 if self.__length is not None else operator.length_hint(values)
+        self.__view: Sequence[X] | None = values if isinstance(values, Sequence) else None
+        self.__values: Iterator[X] | None = iter(values)
+        self.__buffer: ReplayBuffer[X] | None = None
+        self.__parent: LazyList[Any] | None = None
+        self.__stages: Tuple[Stage, ...] = ()
+        # the lists between the parent and this list, with the stages that lead from each of them to this list
+        self.__through: Tuple[Tuple[weakref.ref[LazyList[Any]], Tuple[Stage, ...]], ...] = ()
+        self.__compiled = False
+        self.__opened = False
+        # makes a new iterator over the items, for lists that replay their items without a buffer
+        self.__factory: Callable[[], Iterator[X]] | None = None
+        self.__cache: ChunkCache[X] | None = None
+        profile = profiling.active()
+        self.__stats = profile.add("LazyList") if profile is not None else None
+        self.__plan = explain.source(values, (values.__current_plan(),) if isinstance(values, LazyList) else ())
+
+    @classmethod
+    def once(cls, values: Iterable[X]) -> "LazyList[X]":
+        """Create a one-shot `LazyList` that can only be iterated once.
+        Same as `LazyList(values, replayable=False)`."""
+        return cls(values, replayable=False)
 
     def __str__(self) -> str:
         return "LazyList(...)"
@@ -43,6 +140,176 @@ class LazyList(Iterable[X]):
     def __repr__(self) -> str:
         return "LazyList(...)"
 
+    def __length_hint__(self) -> int:
+        length = self.known_length
+        return length if length is not None else self.__length_estimate
+
+    @property
+    def known_length(self) -> int | None:
+        """The number of items if it is known without evaluating the list, otherwise `None`.
+        The length is known for sized sources and is carried through stages that do not depend
+        on the values of the items, e.g. `map`, `enumerate`, `zip`, `slice` and `append`."""
+        if self.__view is not None:
+            return len(self.__view)
+        return self.__length
+
+    def _derive(
+        self,
+        values: Iterable[Y],
+        length: int | None = None,
+        memory: str | None = None,
+        detail: str = "",
+        *,
+        name: str,
+        inputs: Sequence[Iterable[Any]] = (),
+    ) -> "LazyList[Y]":
+        """Wrap the output of a stage in a new `LazyList` with the same replay mode and engine.
+        `length` is the number of items of the output, if it is known. `name` is the method
+        creating the stage, and names it in `explain` and `profile`. `memory` and `detail`
+        describe the stage in `explain`, `memory` defaulting to `explain.METHODS`. `inputs` are
+        the iterables the stage reads besides this list, shown as inputs of the stage in `explain`."""
+        result = LazyList(values, replayable=self.__replayable)
+        result.__compiled = self.__compiled
+        result.__length = length
+        result.__view = None
+        memory = memory or explain.METHODS.get(name, explain.O1)
+        plans = (self.__current_plan(),) + tuple(
+            value.__current_plan() if isinstance(value, LazyList) else explain.source(value) for value in inputs
+        )
+        bounded = length is not None or all(plan.bounded for plan in plans)
+        result.__plan = explain.PlanNode(name, detail, memory, plans, bounded)
+        if result.__stats is not None:
+            result.__stats.name = name
+            result.__stats.parent = self.__stats
+        return result
+
+    def _fuse(self, kind: str, argument: Any, name: str | None = None) -> "LazyList[Any]":
+        """Record a stage on the plan instead of wrapping the list in a new layer.
+
+        Consecutive stages share one upstream iterator and run as a single fused run when the
+        list is consumed. The lists in between are skipped only if they are gone by then: a list
+        that is still referenced may be iterated too, so its items are read from its buffer
+        instead, and every stage still runs once per item. `name` is the method creating the
+        stage, `kind` by default."""
+        result = self.__extend((Stage(kind, argument),), name or kind)
+        if result.__stats is not None:
+            # stages are not fused while profiling, so this is the only stage of the list
+            result.__stages = (Stage(kind, profiling.time_stage(kind, argument, result.__stats)),)
+            result.__view = views.apply(self.__view, result.__stages)
+        return result
+
+    def __extend(self, stages: Tuple[Stage, ...], name: str) -> "LazyList[Any]":
+        result = self._derive((), output_length(stages, self.__length), name=name)
+        result.__length_estimate = output_length(stages, self.__length_estimate) or 0
+        result.__view = views.apply(self.__view, stages)
+        if self.__parent is not None and runnable(self.__stages) and result.__stats is None:
+            result.__parent = self.__parent
+            result.__stages = extend(self.__stages, stages)
+            through = tuple((ref, extend(after, stages)) for ref, after in self.__through if ref() is not None)
+            result.__through = through + ((weakref.ref(self), stages),)
+        else:
+            result.__parent = self
+            result.__stages = stages
+        result.__plan = explain.stages(result.__parent.__plan, result.__stages)
+        return result
+
+    def compiled(self) -> "LazyList[X]":
+        """Run the fused stages of this list, and of the lists derived from it, with generated code.
+
+        Each run of `map`, `filter`, `slice`, `enumerate`, etc. is executed by a single Python
+        function generated for the shape of the run and cached, with every stage inlined as a few
+        statements in one loop. This pays off for runs of several cheap Python callables; runs
+        made mostly of `slice` and `enumerate` are faster with the default C-level iterators."""
+        result = self.__extend((), "compiled")
+        result.__compiled = True
+        return result
+
+    def __open(self) -> Iterator[X]:
+        """Return the source of the list. It can only be taken once."""
+        if self.__opened:
+            raise RuntimeError("One-shot LazyList has already been iterated; use `replayable=True` to iterate again")
+        self.__opened = True
+        upstream = self.__upstream()
+        self.__parent, self.__through = None, ()
+        # a view is cheaper to iterate than the stages, unless the upstream list has already buffered its items or
+        # computes them with user functions, which must run once per item, or the stages are profiled, as a view
+        # reads the sequence without going through the upstream list
+        if upstream is not None and (
+            self.__view is None
+            or upstream[0].__buffer is not None
+            or views.is_computed(upstream[0].__view)
+            or self.__stats is not None
+        ):
+            parent, stages = upstream
+            del upstream
+            source = parent.__source()
+            if source is not None:
+                # once this list lets go of the parent, the parent is gone unless something else references it,
+                # and then nothing else can replay its items, so its source is read without buffering it
+                ref = weakref.ref(parent)
+                del parent
+                parent = ref()
+                if parent is None:
+                    return run_stages(source, stages, compiled=self.__compiled)
+            return run_stages(parent.iterator, stages, compiled=self.__compiled)
+        if self.__factory is not None:
+            return self.__factory()
+        if self.__view is not None:
+            return iter(self.__view)
+        values, self.__values = self.__values, None
+        return values
+
+    def __source(self) -> Iterator[X] | None:
+        """The source iterator of a list that would buffer it and has not been iterated yet, `None`
+        for other lists."""
+        if self.__buffer is not None or self.__parent is not None or self.__stats is not None:
+            return None
+        if self.__factory is not None or self.__view is not None:
+            return None
+        return self.__values
+
+    def __rerun(self) -> Iterator[X]:
+        """A new iterator over the items that runs the stages of the list again instead of
+        buffering their output. Lists whose source is an iterator fall back to their buffer."""
+        if self.__buffer is not None:
+            return iter(self.__buffer)
+        if self.__factory is not None:
+            return self.__factory()
+        if self.__view is not None:
+            return iter(self.__view)
+        upstream = self.__upstream()
+        if upstream is not None:
+            return run_stages(upstream[0].iterator, upstream[1], compiled=self.__compiled)
+        return self.iterator
+
+    def __upstream(self) -> Tuple[LazyList[Any], Tuple[Stage, ...]] | None:
+        """The list the stages of this list read from, with the stages from it to this list: the
+        last list between the parent and this list that is still referenced, or else the parent.
+        `None` if the stages cannot run over an iterator.
+
+        A referenced list is skipped if this list pushed a limit into its last barrier and it has
+        not been iterated yet, e.g. `s.take(k)` for `s = x.sort()` sorts with a bounded heap
+        instead of reading all the items sorted by `s`."""
+        for ref, stages in reversed(self.__through):
+            upstream = ref()
+            if upstream is not None and runnable(stages) and not self.__limits(upstream, stages):
+                return upstream, stages
+        if self.__parent is not None and runnable(self.__stages):
+            return self.__parent, self.__stages
+        return None
+
+    def __current_plan(self) -> explain.PlanNode:
+        """The plan of the stages as they would run now, from the list `__upstream` reads."""
+        upstream = self.__upstream()
+        if self.__buffer is not None or upstream is None or upstream[0] is self.__parent:
+            return self.__plan
+        return explain.stages(upstream[0].__current_plan(), upstream[1])
+
+    def __limits(self, upstream: LazyList[Any], stages: Tuple[Stage, ...]) -> bool:
+        """Whether the stages of this list limit a barrier of `upstream`, a list between the
+        parent and this list that `stages` lead from, and `upstream` has not buffered its items."""
+        return upstream.__buffer is None and self.__stages[: len(self.__stages) - len(stages)] != upstream.__stages
+
     def __iter__(self) -> Iterator[X]:
         return self.iterator
 
@@ -50,13 +317,81 @@ class LazyList(Iterable[X]):
         return self.zip_longest(other).map(lambda x: x[0] == x[1]).all()
 
     def to_list(self) -> List[X]:
-        return list(self.iterator)
+        return list(self)
 
     @property
-    def iterator(self):
-        iter1, iter2 = itertools.tee(self.__values)
-        self.__values = iter1
-        return iter2
+    def iterator(self) -> Iterator[X]:
+        """A new iterator over the items, starting from the first one.
+        Items are pulled from the source once and replayed from a shared buffer. Lists backed by
+        a sequence, such as a `list`, `tuple`, `range` or `EagerList`, iterate it directly."""
+        if self.__stats is not None:
+            return profiling.observe(self.__iterate, self.__stats)
+        return self.__iterate()
+
+    def __iterate(self) -> Iterator[X]:
+        if not self.__replayable:
+            return self.__open()
+        if self.__factory is not None:
+            return self.__factory()
+        profiled = self.__stats is not None and self.__upstream() is not None
+        if self.__view is not None and not views.is_computed(self.__view) and not profiled:
+            return iter(self.__view)
+        if self.__buffer is None:
+            self.__buffer = self.__buffered()
+        return iter(self.__buffer)
+
+    def __random_access(self) -> Sequence[X] | None:
+        """The view of the items to look them up by index, `None` if there is none. A computed
+        view is replaced by a view of the replay buffer first, so that every item is computed
+        once and looks the same however it is read. One-shot lists have no buffer, so they only
+        look up items of a sequence that is not computed."""
+        if not views.is_computed(self.__view):
+            return self.__view
+        if not self.__replayable:
+            return None
+        if self.__buffer is None:
+            self.__buffer = self.__buffered()
+        return self.__view
+
+    def __buffered(self) -> ReplayBuffer[X]:
+        """A buffer of the items. A computed view is frozen to the items in the buffer, so the
+        length and the items looked up by index match what iterating the list gives, even if
+        the underlying sequence changes later."""
+        values = self.__open()
+        if self.__view is None:
+            return ReplayBuffer(values, stats=memory.buffer("replay"))
+        length = len(self.__view)
+        buffer = ReplayBuffer(itertools.islice(values, length), stats=memory.buffer("replay"))
+        self.__view = views.BufferedView(buffer, length)
+        return buffer
+
+    @property
+    def replayable(self) -> bool:
+        return self.__replayable
+
+    def to_async(self, chunksize: int = 64):
+        """Return an `AsyncLazyList` over the items, pulled `chunksize` at a time in a thread.
+        See `AsyncLazyList.from_sync`."""
+        from lazy_list.async_lazy_list import AsyncLazyList
+
+        return AsyncLazyList.from_sync(self, chunksize)
+
+    def explain(self, terminal: str | None = None, file: TextIO | None = None):
+        """Print the plan of the list as a tree, from the last stage to the sources.
+
+        Every stage is marked with the memory it holds: O(1), O(k) for a bound given as an
+        argument (e.g. `sort().take(k)`, `tail(k)` or `unique(window=k)`), or O(n) for stages
+        that hold every item, like `sort` or `reverse`. O(n) stages on an input that is not
+        known to be bounded are flagged with a warning. Pass the name of a method that consumes
+        the list, like `"group_by"` or `"to_list"`, as `terminal` to show it on top of the plan.
+
+        Example:
+        >>> LazyList.once(itertools.count()).map(str).sort().explain()
+        sort                           O(n)  ! holds every item of an input that is not known to be bounded
+        └─ map(str)                    O(1)
+           └─ source(count, infinite)  O(1)"""
+        buffered = self.__replayable and self.__factory is None and self.__view is None
+        print(explain.render(self.__current_plan(), terminal, buffered), file=file)
 
     def evaluate(self) -> EagerList[X]:
         """Evaluate items and return as `EagerList`"""
@@ -64,12 +399,107 @@ class LazyList(Iterable[X]):
 
     def map(self, function: Callable[[X], Y]) -> "LazyList[Y]":
         """Map function over elements of the list"""
-        return LazyList(map(function, self))
+        return self._fuse("map", function)
+
+    def par_map(
+        self,
+        function: Callable[[X], Y],
+        workers: int | None = None,
+        executor: Literal["thread", "process"] = "thread",
+        chunksize: int = 1,
+        ordered: bool = True,
+    ) -> "LazyList[Y]":
+        """Map function over elements of the list in a pool of `workers` threads or processes.
+
+        Items are sent to the pool in chunks of `chunksize`, with at most two chunks per worker
+        in flight, so the list is read only as fast as results are consumed. Results keep the
+        order of the items, or come in the order chunks complete if `ordered` is `False`. With
+        `executor="process"`, `function` and the items must be picklable, e.g. `function` cannot
+        be a lambda."""
+        values = parallel.map_chunks(function, self, workers, executor, chunksize, ordered)
+        return self._derive(values, self.known_length, name="par_map")
+
+    def map_batches(
+        self,
+        function: Callable[[Sequence[X]], Sequence[Y]],
+        size: int,
+        batch_type: Callable[[Iterable[X]], Sequence[X]] = list,
+    ) -> "LazyList[Y]":
+        """Map a vectorized function over batches of up to `size` elements.
+
+        `function` is called with each batch, built with `batch_type` (e.g. `list`, `EagerList`,
+        `NumList` or `StrList`), and must return a sequence with one result per item. The results
+        are flattened back into a single list.
+
+        Example:
+        >>> a = LazyList(["1", "22", "333"])
+        >>> a.map_batches(lambda batch: batch.map(len), 2, batch_type=StrList).evaluate()
+        EagerList([1, 2, 3])"""
+        if size < 1:
+            raise ValueError("`size` must be a positive value")
+        batches = itertoolz.partition_all(size, self)
+        return self._derive(_map_batches(function, batches, batch_type), self.known_length, name="map_batches")
+
+    def prefetch(self, n: int, chunksize: int = 1) -> "LazyList[X]":
+        """Read the list in a background thread, up to `n` chunks of `chunksize` items ahead of
+        the consumer, so a slow source (files, network, database cursors) overlaps with the work
+        done on its items.
+
+        Exceptions raised by the source are raised to the consumer. The thread stops once the
+        source is exhausted, or once the prefetched list is no longer used, e.g. after `take`.
+        The list is read from the background thread, so it should not be iterated from other
+        threads at the same time."""
+        if n < 1 or chunksize < 1:
+            raise ValueError("`n` and `chunksize` must be positive values")
+
+        def produce(emit: Callable[[Any], bool]):
+            for chunk in itertoolz.partition_all(chunksize, self) if chunksize > 1 else self:
+                if not emit(chunk):
+                    return
+
+        values = background.iterate_in_thread(produce, maxsize=n)
+        return self._derive(itertoolz.concat(values) if chunksize > 1 else values, self.known_length, name="prefetch")
+
+    def cache(self, max_items: int | None = None, max_bytes: int | None = None, chunksize: int = 256) -> "LazyList[X]":
+        """Keep the computed items in memory, in chunks of `chunksize` items, so iterating the
+        list again does not run its stages again.
+
+        Once the cache holds more than `max_items` items or more than `max_bytes` bytes (as
+        estimated with `sys.getsizeof`), the least recently used chunks are evicted, and are
+        computed again from the upstream list if they are needed later. Hits, misses and
+        evictions are reported by `cache_info`.
+
+        The limits bound the computed items only. Evicted chunks are computed again from the
+        source, so a list whose source is an iterator still keeps every item pulled from the
+        iterator in its replay buffer to read them again; create the list from a sequence to
+        bound the memory of the whole pipeline.
+
+        Example:
+        >>> features = LazyList(paths).map(load).map(extract).cache(max_items=10_000)
+        >>> features.map(score).to_list(); features.map(label).to_list()
+        >>> features.cache_info()
+        CacheInfo(hits=..., misses=..., evictions=..., items=..., bytes=...)"""
+        if not self.__replayable:
+            raise ValueError("Cannot cache a one-shot LazyList")
+        store = ChunkCache(self.__rerun, chunksize=chunksize, max_items=max_items, max_bytes=max_bytes)
+        bounded = max_items is not None or max_bytes is not None
+        result = self._derive(
+            (), self.known_length, explain.OK if bounded else explain.ON, f"chunksize={chunksize}", name="cache"
+        )
+        result.__length_estimate = self.__length_hint__()
+        result.__factory = store.__iter__
+        result.__cache = store
+        return result
+
+    def cache_info(self) -> CacheInfo | None:
+        """Hits, misses and evictions of the chunks of a list returned by `cache`, and the number
+        of items and bytes it holds. `None` for lists that are not cached."""
+        return self.__cache.info() if self.__cache is not None else None
 
     def filter(self, function: Callable[[X], Y] | None = None) -> "LazyList[X]":
         """Return an iterator yielding those items of iterable for which function(item)
         is true. If function is None, return the items that are true."""
-        return LazyList(filter(function, self))
+        return self._fuse("filter", function)
 
     def reduce(self, function: Callable[[X, X], X], initial: X | None = None) -> X:
         """Apply a function of two arguments cumulatively to the items of a sequence,
@@ -79,62 +509,91 @@ class LazyList(Iterable[X]):
         else:
             return reduce(function, self, initial)
 
-    def sort(self, key: Callable[[X], Any] | None = None, reverse: bool = False) -> "LazyList[X]":
+    def sort(
+        self,
+        key: Callable[[X], Any] | None = None,
+        reverse: bool = False,
+        memory_limit: int | None = None,
+    ) -> "LazyList[X]":
         """Return a new list containing all items from the iterable in ascending order.
         A custom key function can be supplied to customize the sort order, and the
-        reverse flag can be set to request the result in descending order."""
-        if key is None:
-            return LazyList(iter(sorted(self, reverse=reverse)))
-        return LazyList(iter(sorted(self, key=key, reverse=reverse)))
+        reverse flag can be set to request the result in descending order.
+
+        Sorting is deferred until the list is consumed. If only the first k items are used,
+        e.g. `sort().take(k)` or `sort().first`, they are found with a bounded heap or a single
+        `min`/`max` scan instead of sorting everything.
+
+        With `memory_limit`, about `memory_limit` bytes of items are sorted in memory at a time
+        and spilled to temporary files, which are then merged as the list is consumed. This
+        sorts data larger than memory; the sort is still stable."""
+        if memory_limit is not None:
+            values = spill.external_sort(self, key, reverse, memory_limit)
+            return self._derive(
+                values, self.known_length, explain.OK, f"memory_limit={memory_limit}, spills to disk", name="sort"
+            )
+        return self._fuse("sort", (key, reverse, None))
 
     def reverse(self) -> "LazyList[X]":
         """Reverse the list.
-        It forces LazyList to evaluate, in order to reverse."""
-        return LazyList(reversed(self.to_list()))
+        It forces LazyList to evaluate, in order to reverse, when the list is consumed.
+        `reverse().take(k)` only keeps the last k items."""
+        return self._fuse("reverse", None)
 
     def append(self, item) -> "LazyList[X]":
         """Append an item to the end of the list"""
-        return LazyList(itertools.chain(self, [item]))
+        return self._derive(itertools.chain(self, [item]), _add(self.known_length, 1), name="append")
 
     def append_left(self, item) -> "LazyList[X]":
         """Append an item to the beginning of the list"""
-        return LazyList(itertools.chain([item], self))
+        return self._derive(itertools.chain([item], self), _add(self.known_length, 1), name="append_left")
 
     def extend(self, *iterables: Iterable[X]) -> "LazyList[X]":
         """Extend by appending items for one or more iterables to the end of the list"""
-        return LazyList(itertoolz.concatv(self, *iterables))
+        length = _add(self.known_length, *map(_known_length, iterables))
+        return self._derive(itertoolz.concatv(self, *iterables), length, name="extend", inputs=iterables)
 
     def extend_left(self, *iterables: Iterable[X]) -> "LazyList[X]":
         """Extend by appending items for one or more iterables to the beginning of the list"""
-        return LazyList(itertoolz.concatv(*iterables, self))
+        length = _add(self.known_length, *map(_known_length, iterables))
+        return self._derive(itertoolz.concatv(*iterables, self), length, name="extend_left", inputs=iterables)
 
     def enumerate(self) -> "LazyList[Tuple[int, X]]":
         """Return a tuple of (index, item) for every item in the list"""
-        return LazyList(enumerate(self))
+        return self._fuse("enumerate", None)
 
     def clear(self) -> "LazyList[X]":
         """Return an empty list"""
-        return LazyList([])
+        return self._derive([], 0, name="clear")
 
     def copy(self) -> "LazyList[X]":
         """Create a copy of the list"""
-        return LazyList(self.iterator)
+        return self._derive(self.iterator, self.known_length, name="copy")
 
     def insert(self, index: int, item: X) -> "LazyList[X]":
         """Insert object before index"""
-        left = self.slice(stop=index)
-        right = self.slice(start=index)
-        return left.extend([item], right)
+        if index < 0:
+            raise ValueError("`index` must be a positive value")
+        return self._derive(_insert(self, index, item), _add(self.known_length, 1), name="insert")
 
     def get_length_eagerly(self) -> int:
-        """Returns the length by eagerly evaluating `LazyList` into a `list`"""
-        return len(self.to_list())
+        """Returns the length of the list.
+        The length is returned directly when it is known. Otherwise the items are counted
+        one at a time, without collecting them into a `list`."""
+        length = self.known_length
+        if length is None:
+            counter = itertools.count()
+            deque(zip(self, counter), maxlen=0)
+            self.__length = length = next(counter)
+        return length
 
     def pop(self, index: int = 0) -> "LazyList[X]":
         """Remove item at index (default first)."""
         if index < 0:
             raise IndexError("`index` must be a positive value")
-        return LazyList(o for i, o in self.enumerate() if i != index)
+        n = self.known_length
+        return self._derive(
+            (o for i, o in enumerate(self) if i != index), None if n is None else n - (index < n), name="pop"
+        )
 
     def pop_left(self) -> "LazyList[X]":
         """Remove first item."""
@@ -153,10 +612,11 @@ class LazyList(Iterable[X]):
 
     def remove_all(self, value: X) -> "LazyList[X]":
         """Remove all occurrences of value."""
-        return self.filter(lambda x: x != value)
+        return self._fuse("filter", lambda x: x != value, "remove_all")
 
     def count(self, value: X) -> int:
-        return self.filter(lambda x: x == value).get_length_eagerly()
+        """Return number of occurrences of value."""
+        return operator.countOf(self, value)
 
     def all(self, function: Callable[[X], bool] | None = None) -> bool:
         """Apply `function` to all items and returns True if they are all True.
@@ -170,14 +630,23 @@ class LazyList(Iterable[X]):
 
     def fixed(self, value: Y) -> "LazyList[Y]":
         """Return a list of same size with a fixed value"""
-        return LazyList(value for _ in self)
+        return self._derive((value for _ in self), self.known_length, name="fixed")
 
     def slice(self, start: int | None = None, stop: int | None = None, step: int | None = None) -> "LazyList[X]":
-        """Use slice to subset the list."""
-        if start is None and step is None:
-            return LazyList(itertools.islice(self, stop))
-        else:
-            return LazyList(itertools.islice(self, start, stop, step))
+        """Use slice to subset the list.
+        Negative bounds are only supported when the list is backed by a sequence."""
+        return self.__slice(start, stop, step, "slice")
+
+    def __slice(self, start: int | None, stop: int | None, step: int | None, name: str) -> "LazyList[X]":
+        if self.__view is None:
+            # validate the bounds the same way `itertools.islice` does
+            itertools.islice((), start, stop, step)
+        elif step == 0:
+            raise ValueError("slice step cannot be zero")
+        step = 1 if step is None else step
+        if start is None and step > 0:
+            start = 0
+        return self._fuse("slice", slice(start, stop, step), name)
 
     def contains(self, value: X) -> bool:
         """Check if value is in the list"""
@@ -191,6 +660,50 @@ class LazyList(Iterable[X]):
         """
         return delimiter.join(self.map(str))
 
+    def hash_join(
+        self,
+        other: Iterable[Y],
+        left_key: Callable[[X], Any],
+        right_key: Callable[[Y], Any] | None = None,
+        how: Literal["inner", "left", "outer"] = "inner",
+    ) -> "LazyList[Tuple[X | None, Y | None]]":
+        """Join with `other` on `left_key(item) == right_key(other_item)`, as a list of
+        `(item, other_item)` pairs. `right_key` defaults to `left_key`.
+
+        With `how="left"`, items without a match are paired with `None`; with `how="outer"`,
+        items of `other` without a match are paired with `None` too. A hash table is built from
+        the smaller side if both lengths are known, otherwise from `other`, and the other side
+        is streamed, so pairs come in the order of the streamed side.
+
+        Example:
+        >>> users = LazyList([(1, "ann"), (2, "bob")])
+        >>> users.hash_join([(1, "admin")], itemgetter(0), how="left").to_list()
+        [((1, 'ann'), (1, 'admin')), ((2, 'bob'), None)]"""
+        joins.check_how(how)
+        other_length = _known_length(other)
+        build_left = self.known_length is not None and other_length is not None and self.known_length < other_length
+        pairs = joins.hash_join(self, other, left_key, right_key or left_key, how, build_left)
+        return self._derive(pairs, name="hash_join", inputs=(other,))
+
+    def merge_join(
+        self,
+        other: Iterable[Y],
+        left_key: Callable[[X], Any],
+        right_key: Callable[[Y], Any] | None = None,
+        how: Literal["inner", "left", "outer"] = "inner",
+        reverse: bool = False,
+    ) -> "LazyList[Tuple[X | None, Y | None]]":
+        """Join with `other` like `hash_join`, for sides that are both sorted by key, in
+        descending order if `reverse` is true. Both sides are streamed in a single pass and
+        pairs come in key order. Only the items of `other` with the current key are kept in
+        memory. Raises `ValueError` when it finds a side that is not sorted."""
+        joins.check_how(how)
+        return self._derive(
+            joins.merge_join(self, other, left_key, right_key or left_key, how, reverse),
+            name="merge_join",
+            inputs=(other,),
+        )
+
     def where(self, predicate: Callable[[X], bool]) -> LazyList[int]:
         """Return indices where predicate returns `True`"""
         return self.enumerate().filter(lambda o: predicate(o[1])).get_item(0)
@@ -234,7 +747,8 @@ class LazyList(Iterable[X]):
         pass
 
     def zip(self, *others):
-        return LazyList(zip(self, *others))
+        lengths = [self.known_length, *map(_known_length, others)]
+        return self._derive(zip(self, *others), None if None in lengths else min(lengths), name="zip", inputs=others)
 
     @overload
     def zip_longest(self, other: Iterable[Y]) -> "LazyList[Tuple[X|None, Y|None]]":
@@ -279,7 +793,13 @@ class LazyList(Iterable[X]):
         pass
 
     def zip_longest(self, *others):
-        return LazyList(itertools.zip_longest(self, *others))
+        lengths = [self.known_length, *map(_known_length, others)]
+        return self._derive(
+            itertools.zip_longest(self, *others),
+            None if None in lengths else max(lengths),
+            name="zip_longest",
+            inputs=others,
+        )
 
     def at(self, index: int) -> X:
         """Returns item(s) at index.
@@ -288,24 +808,34 @@ class LazyList(Iterable[X]):
 
     def accumulate(self, function: Callable[[X, X], X]) -> "LazyList[X]":
         """Apply function over values cumulatively"""
-        return LazyList(itertools.accumulate(self, function))
+        return self._derive(itertools.accumulate(self, function), self.known_length, name="accumulate")
 
     def combinations(self, r: int) -> "LazyList[Tuple[X, ...]]":
         """Return successive r-length combinations of elements in the iterable.
 
         LazyList(range(4)).combinations(3) --> (0,1,2), (0,1,3), (0,2,3), (1,2,3)"""
-        return LazyList(itertools.combinations(self, r))
+        n = self.known_length
+        return self._derive(
+            itertools.combinations(self, r), None if n is None else math.comb(n, r), name="combinations"
+        )
 
     def combinations_with_replacement(self, r: int) -> "LazyList[Tuple[X, ...]]":
         """Return successive r-length combinations of elements in the iterable allowing
         individual elements to have successive repeats."""
-        return LazyList(itertools.combinations_with_replacement(self, r))
+        n = self.known_length
+        length = None if n is None else math.comb(n + r - 1, r) if n else int(r == 0)
+        return self._derive(
+            itertools.combinations_with_replacement(self, r), length, name="combinations_with_replacement"
+        )
 
     def permutations(self, r: int) -> "LazyList[Tuple[X, ...]]":
         """Return successive r-length permutations of elements in the iterable.
 
         LazyList(range(3)).permutations(2) --> (0,1), (0,2), (1,0), (1,2), (2,0), (2,1)"""
-        return LazyList(itertools.permutations(self, r))
+        n = self.known_length
+        return self._derive(
+            itertools.permutations(self, r), None if n is None else math.perm(n, r), name="permutations"
+        )
 
     def product(self, other: Iterable[Y]) -> "LazyList[Tuple[X, Y]]":
         """Cartesian product of input iterables. Equivalent to nested for-loops.
@@ -314,7 +844,9 @@ class LazyList(Iterable[X]):
         >>> a.product(b).evaluate()
         EagerList([(1, 'A'), (1, 'B'), (2, 'A'), (2, 'B')])
         """
-        return LazyList(itertools.product(self, other))
+        other_length = _known_length(other)
+        length = None if self.known_length is None or other_length is None else self.known_length * other_length
+        return self._derive(itertools.product(self, other), length, name="product", inputs=(other,))
 
     def compress(self, selector: Iterable[bool]) -> "LazyList[Tuple[X, ...]]":
         """Return data elements corresponding to true selector elements.
@@ -323,29 +855,29 @@ class LazyList(Iterable[X]):
         >>> a.compress(b).evaluate()
         EagerList([1, 3])
         """
-        return LazyList(itertools.compress(self, selector))
+        return self._derive(itertools.compress(self, selector), name="compress", inputs=(selector,))
 
     def dropwhile(self, predicate: Callable[[X], bool]) -> "LazyList[X]":
         """Drop items from the iterable while predicate(item) is true.
 
         Afterwards, return every element in the list"""
-        return LazyList(itertools.dropwhile(predicate, self))
+        return self._fuse("dropwhile", predicate)
 
     def takewhile(self, predicate: Callable[[X], bool]) -> "LazyList[X]":
         """Return successive entries from an iterable as long as the predicate evaluates
         to true for each entry."""
-        return LazyList(itertools.takewhile(predicate, self))
+        return self._fuse("takewhile", predicate)
 
     def filterfalse(self, predicate: Callable[[X], bool] | None) -> "LazyList[X]":
         """Return those items of iterable for which function(item) is false.
 
         If function is None, return the items that are false.
         """
-        return LazyList(itertools.filterfalse(predicate, self))
+        return self._fuse("filterfalse", predicate)
 
     def loop(self, n: int) -> "LazyList[X]":
         """Loops over the list `n` times"""
-        return LazyList(itertoolz.concat(itertools.repeat(self, n)))
+        return self._derive(itertoolz.concat(itertools.repeat(self, n)), _mul(self.known_length, n), name="loop")
 
     def interleave(self, *iterables: Iterable[X]) -> "LazyList[X]":
         """Interleave a sequence of sequences.
@@ -354,38 +886,137 @@ class LazyList(Iterable[X]):
         >>> b = [4,5,6]
         >>> a.interleave(b)
         LazyList([1, 4, 2, 5, 3, 6])"""
-        return LazyList(itertoolz.interleave([self, *iterables]))
+        length = _add(self.known_length, *map(_known_length, iterables))
+        return self._derive(itertoolz.interleave([self, *iterables]), length, name="interleave", inputs=iterables)
+
+    def merge_sorted(
+        self, *others: Iterable[X], key: Callable[[X], Any] | None = None, reverse: bool = False
+    ) -> "LazyList[X]":
+        """Merge this list and `others`, each already sorted, into a single sorted list.
 
-    def unique(self) -> "LazyList[X]":
-        """Return only unique elements of a sequence"""
-        return LazyList(itertoolz.unique(self))
+        The inputs are streamed through a heap-based k-way merge that holds one item per input,
+        and each input is read through its own iterator, so one-shot lists can be merged too.
+        Equal items keep the order of the inputs. `key` and `reverse` must match how the inputs
+        are sorted.
+
+        Example:
+        >>> LazyList([1, 4, 7]).merge_sorted([2, 5], [3, 6]).to_list()
+        [1, 2, 3, 4, 5, 6, 7]"""
+        length = _add(self.known_length, *map(_known_length, others))
+        return self._derive(
+            heapq.merge(self, *others, key=key, reverse=reverse), length, name="merge_sorted", inputs=others
+        )
+
+    def unique(
+        self,
+        key: Callable[[X], Any] | None = None,
+        mode: Literal["exact", "window", "bloom", "sorted"] | None = None,
+        window: int | None = None,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+    ) -> "LazyList[X]":
+        """Return only unique elements of a sequence, or the first element of each `key`.
+
+        `mode` sets how the seen keys are remembered:
+        - `"exact"` (the default) keeps every key seen so far in a set.
+        - `"window"` (the default if `window` is given) only drops elements whose key is one of
+          the last `window` distinct keys seen, keeping the most recently seen ones.
+        - `"bloom"` keeps a Bloom filter of fixed size, sized for `capacity` keys. Each unique
+          element is dropped by mistake with a probability of about `error_rate`.
+        - `"sorted"` assumes the elements are sorted by key and only compares neighbours, with
+          O(1) memory.
+
+        Example:
+        >>> LazyList([1, 2, 1, 3, 1]).unique(window=1).to_list()
+        [1, 2, 1, 3, 1]"""
+        mode = mode or ("window" if window is not None else "exact")
+        if mode == "exact":
+            values = dedup.exact(self, key)
+        elif mode == "window":
+            if window is None:
+                raise ValueError("`window` is needed for mode 'window'")
+            values = dedup.window(self, window, key)
+        elif mode == "bloom":
+            values = dedup.bloom(self, key, capacity, error_rate)
+        elif mode == "sorted":
+            values = dedup.adjacent(self, key)
+        else:
+            raise ValueError(f"`mode` must be one of exact, window, bloom, sorted, not {mode!r}")
+        memory = {"exact": explain.ON, "window": explain.OK}.get(mode, explain.O1)
+        return self._derive(values, memory=memory, detail=f"mode={mode}", name="unique")
 
     def is_distinct(self) -> bool:
-        """All values in sequence are distinct"""
-        return self.evaluate().is_distinct()
+        """All values in sequence are distinct.
+        Stops at the first duplicate, only keeping a set of the values seen so far."""
+        return itertoolz.isdistinct(iter(self))
+
+    def approx_n_unique(self, error: float = 0.01) -> int:
+        """Estimate the number of unique elements with a HyperLogLog sketch, using a fixed
+        amount of memory. The relative standard error of the estimate is about `error`; 1% takes
+        16 KiB. See `sketches.HyperLogLog` to merge sketches of chunks."""
+        return sketches.HyperLogLog(error).update(self).estimate()
+
+    def heavy_hitters(self, k: int, error: float | None = None) -> Dict[X, int]:
+        """Find up to `k` of the most frequent elements in a single pass with a fixed number of
+        counters (Misra-Gries summary), and return them with lower bounds of their counts, most
+        frequent first.
+
+        Every element occurring more than `n * error` times among `n` elements is found, and
+        counts are too small by at most `n * error`. `error` defaults to `1 / (k + 1)`.
+
+        Example:
+        >>> a = LazyList("abracadabra")
+        >>> a.heavy_hitters(1, error=0.1)
+        {'a': 5}"""
+        counters = k if error is None else max(k, math.ceil(1 / error) - 1)
+        summary = sketches.MisraGries(counters).update(self)
+        return dict(summary.most_common()[:k])
+
+    def approx_counts(self, error: float = 0.001, confidence: float = 0.99) -> sketches.CountMinSketch:
+        """Count the elements with a Count-Min sketch of fixed size, to estimate how often any
+        value occurs with `sketch[value]`. Estimates are never too small, and with probability
+        `confidence` they are too large by at most `n * error` for `n` elements."""
+        return sketches.CountMinSketch(error, confidence).update(self)
+
+    def approx_count(self, value: X, error: float = 0.001, confidence: float = 0.99) -> int:
+        """Estimate how often `value` occurs with a Count-Min sketch. See `approx_counts`, which
+        builds the sketch once to query many values."""
+        return self.approx_counts(error, confidence)[value]
 
     def take(self, n: int) -> "LazyList[X]":
         """The first n elements of a sequence"""
-        return LazyList(itertoolz.take(n, self))
+        return self.__slice(None, n, None, "take")
 
     def drop(self, n: int) -> "LazyList[X]":
         """The sequence following the first n elements"""
-        return LazyList(itertoolz.drop(n, self))
+        return self.__slice(n, None, None, "drop")
 
     def take_nth(self, n: int) -> "LazyList[X]":
         """Every nth item in seq"""
-        return LazyList(itertoolz.take_nth(n, self))
+        length = None if self.known_length is None else len(range(self.known_length)[::n])
+        return self._derive(itertoolz.take_nth(n, self), length, name="take_nth")
 
     def nth(self, n: int) -> X:
         """The nth element in a sequence. Similar to `LazyList.at(n)` and `LazyList[n]`
-        except `n` can only be a single index."""
-        return itertoolz.nth(n, self)
+        except `n` can only be a single index.
+        Lists backed by a sequence look the item up directly, and support negative indices. Items
+        computed by `map` are pulled into the replay buffer up to `n` instead, so they are only
+        computed once."""
+        view = self.__random_access()
+        if view is None:
+            return itertoolz.nth(n, self)
+        try:
+            return view[n]
+        except IndexError:
+            # the same error as when iterating the list
+            raise StopIteration from None
 
     def concat(self, iterables: Sequence[Iterable[X]]) -> "LazyList[X]":
         """Extend the list by appending items from other iterables.
         Similar to `LazyList.extend` except iterables are passed in as a sequence instead of arguments.
         """
-        return LazyList(itertoolz.concat([self, *iterables]))
+        length = _add(self.known_length, *map(_known_length, iterables))
+        return self._derive(itertoolz.concat([self, *iterables]), length, name="concat", inputs=iterables)
 
     def interpose(self, value: X) -> "LazyList[X]":
         """Introduce element between each pair of elements in seq
@@ -394,33 +1025,108 @@ class LazyList(Iterable[X]):
         >>> a = LazyList([1,2,3])
         >>> a.interpose(0)
         LazyList([1, 0, 2, 0, 3])"""
-        return LazyList(itertoolz.interpose(value, self))
+        length = None if self.known_length is None else max(2 * self.known_length - 1, 0)
+        return self._derive(itertoolz.interpose(value, self), length, name="interpose")
 
-    def frequencies(self) -> Dict[X, int]:
+    def frequencies(
+        self,
+        memory_limit: int | None = None,
+        workers: int | None = None,
+        executor: Literal["thread", "process"] = "process",
+        chunksize: int = 10_000,
+    ) -> Dict[X, int] | "LazyList[Tuple[X, int]]":
         """Count the frequency of occurrence for each unique item.
 
+        With `memory_limit`, the counts are kept in a table of about `memory_limit` bytes that
+        is spilled to temporary files when it grows bigger, and a `LazyList` of `(item, count)`
+        pairs is returned instead of a dict. See `group_by`.
+
+        With `workers`, chunks of `chunksize` items are counted in a pool of `workers` workers.
+        See `reduce_by`.
+
         Example:
         >>> a = LazyList("aaabbcc")
         >>> a.frequencies()
         {'a': 3, 'b': 2, 'c': 2}"""
+        _check_aggregation(memory_limit, workers)
+        if workers is not None:
+            return parallel.aggregate_chunks(self, None, aggregate.COUNT, workers, executor, chunksize)
+        if memory_limit is not None:
+            values = aggregate.hash_aggregate(self, _identity, aggregate.COUNT, memory_limit)
+            return self._derive(
+                values, memory=explain.OK, detail=f"memory_limit={memory_limit}, spills to disk", name="frequencies"
+            )
         return itertoolz.frequencies(self)
 
-    def group_by(self, key: Callable[[X], Y]) -> Dict[Y, LazyList[X]]:
+    def group_by(
+        self,
+        key: Callable[[X], Y],
+        memory_limit: int | None = None,
+        workers: int | None = None,
+        executor: Literal["thread", "process"] = "process",
+        chunksize: int = 10_000,
+    ) -> Dict[Y, EagerList[X]] | "LazyList[Tuple[Y, EagerList[X]]]":
         """Group a collection by a key function
 
+        With `memory_limit`, groups are collected in a table of about `memory_limit` bytes.
+        When the table grows bigger, it is partitioned by the hash of the keys to temporary
+        files, which are then grouped one at a time. A `LazyList` of `(key, group)` pairs is
+        returned instead of a dict; the pairs are in order of first appearance of the keys
+        unless the table was spilled. Items keep their order within each group.
+
+        With `workers`, chunks of `chunksize` items are grouped in a pool of `workers` workers.
+        See `reduce_by`.
+
         Example:
         >>> a = LazyList(range(6))
         >>> a.group_by(lambda x: x%2)
-        {0: LazyList([0, 2, 4]), 1: LazyList([1, 3, 5])}"""
-        return {k: EagerList(v) for k, v in itertoolz.groupby(key, self).items()}
-
-    def reduce_by(self, key: Callable[[X], Y], reducer: Callable[[X, X], X]) -> Dict[Y, X]:
+        {0: EagerList([0, 2, 4]), 1: EagerList([1, 3, 5])}
+        >>> a.group_by(lambda x: x%2, memory_limit=2**20).to_list()
+        [(0, EagerList([0, 2, 4])), (1, EagerList([1, 3, 5]))]"""
+        _check_aggregation(memory_limit, workers)
+        if workers is not None:
+            return parallel.aggregate_chunks(self, key, aggregate.grouping(EagerList), workers, executor, chunksize)
+        if memory_limit is not None:
+            values = aggregate.hash_aggregate(self, key, aggregate.grouping(EagerList), memory_limit)
+            return self._derive(
+                values, memory=explain.OK, detail=f"memory_limit={memory_limit}, spills to disk", name="group_by"
+            )
+        groups = itertoolz.groupby(key, memory.counted(self, memory.buffer("group_by")))
+        return {k: EagerList(v) for k, v in groups.items()}
+
+    def reduce_by(
+        self,
+        key: Callable[[X], Y],
+        reducer: Callable[[X, X], X],
+        memory_limit: int | None = None,
+        workers: int | None = None,
+        executor: Literal["thread", "process"] = "process",
+        chunksize: int = 10_000,
+    ) -> Dict[Y, X] | "LazyList[Tuple[Y, X]]":
         """Perform a simultaneous groupby (using key) and reduction (using reducer)
 
+        With `memory_limit`, a `LazyList` of `(key, result)` pairs is returned instead of a
+        dict, and the table of partial results is spilled to temporary files when it grows
+        over about `memory_limit` bytes. See `group_by`.
+
+        With `workers`, the list is read in chunks of `chunksize` items that are reduced in a
+        pool of `workers` workers (`executor="process"` or `"thread"`), so only one partial
+        result per key and chunk is sent back. Partial results are merged with `reducer` in
+        input order, so `reducer` must be associative. With processes, `key`, `reducer` and the
+        items must be picklable.
+
         Example:
         >>> a = LazyList(range(6))
         >>> a.reduce_by(lambda x: x % 2, max)
         {0: 4, 1: 5}"""
+        _check_aggregation(memory_limit, workers)
+        if workers is not None:
+            return parallel.aggregate_chunks(self, key, aggregate.reduction(reducer), workers, executor, chunksize)
+        if memory_limit is not None:
+            values = aggregate.hash_aggregate(self, key, aggregate.reduction(reducer), memory_limit)
+            return self._derive(
+                values, memory=explain.OK, detail=f"memory_limit={memory_limit}, spills to disk", name="reduce_by"
+            )
         return itertoolz.reduceby(key, reducer, self)
 
     def sliding_window(self, n: int) -> "LazyList[Tuple[X, ...]]":
@@ -430,7 +1136,8 @@ class LazyList(Iterable[X]):
         >>> a = LazyList(range(5))
         >>> a.sliding_window(2).evaluate()
         LazyList([(0, 1), (1, 2), (2, 3), (3, 4)])"""
-        return LazyList(itertoolz.sliding_window(n, self))
+        length = None if self.known_length is None else max(self.known_length - n + 1, 0)
+        return self._derive(itertoolz.sliding_window(n, self), length, name="sliding_window")
 
     def partition(self, n: int, pad: str | X = "__no__pad__") -> "LazyList[Tuple[X, ...]]":
         """Partition sequence into tuples of length n.
@@ -441,7 +1148,10 @@ class LazyList(Iterable[X]):
         LazyList([(0, 1), (2, 3)])  # Note `4` does not appear
         >>> a.partition(2, pad=None).evaluate()
         LazyList([(0, 1), (2, 3), (4, None)])"""
-        return LazyList(itertoolz.partition(n, self, pad=pad))
+        length = None
+        if self.known_length is not None:
+            length = self.known_length // n if pad == "__no__pad__" else -(-self.known_length // n)
+        return self._derive(itertoolz.partition(n, self, pad=pad), length, name="partition")
 
     def partition_all(self, n: int) -> "LazyList[Tuple[X, ...]]":
         """Partition all elements of sequence into tuples of length at most n
@@ -452,38 +1162,62 @@ class LazyList(Iterable[X]):
         >>> a.partition_all(2).evaluate()
         LazyList([(0, 1), (2, 3), (4,)])
         """
-        return LazyList(itertoolz.partition_all(n, self))
+        length = self.known_length
+        return self._derive(
+            itertoolz.partition_all(n, self), None if length is None else -(-length // n), name="partition_all"
+        )
 
     def tail(self, n: int) -> "LazyList[X]":
         """The last n elements of a sequence"""
-        return LazyList(itertoolz.tail(n, self))
+        if self.__view is not None:
+            return self.__slice(-n, None, None, "tail") if n > 0 else self.__slice(0, 0, None, "tail")
+        length = self.known_length
+        return self._derive(itertoolz.tail(n, self), None if length is None else min(length, n), name="tail")
 
     def top_k(self, k: int, key: None | Callable[[X], Any] = None) -> "LazyList[X]":
         """Find the k largest elements of a sequence"""
-        return LazyList(itertoolz.topk(k, self, key=key))
+        length = self.known_length
+        return self._derive(itertoolz.topk(k, self, key=key), None if length is None else min(length, k), name="top_k")
 
     def random_sample(
         self,
         k: int = 1,
         random_state: Any | None = None,
+        replace: bool = True,
+        weights: Iterable[int | float] | Callable[[X], int | float] | None = None,
     ) -> "LazyList[X]":
-        """Return a k sized LazyList of population elements chosen with replacement"""
-        random.seed(random_state)
-        population = list(self)
-        return LazyList(random.choice(population) for _ in range(k))
+        """Return a k sized LazyList of population elements chosen with replacement, or
+        without replacement if `replace` is `False`.
+
+        Sampling is deferred until the result is consumed and reads the list once, keeping only
+        O(k) items in memory. `weights` are relative weights of the items, either as an iterable
+        in the same order as the items or as a function of an item. `random_state` seeds a
+        `random.Random` instance used only by this call."""
+        rng = random.Random(random_state)
+        if weights is None:
+            if not replace:
+                return self._derive(sampling.sample(self, k, rng), k, name="random_sample")
+            pairs: Iterable[Tuple[X, int | float]] = zip(self, itertools.repeat(1))
+        elif callable(weights):
+            pairs = ((value, weights(value)) for value in self)
+        else:
+            pairs = zip(self, weights)
+        if replace:
+            return self._derive(sampling.choices(pairs, k, rng), k, name="random_sample")
+        return self._derive(sampling.weighted_sample(pairs, k, rng), k, name="random_sample")
 
     def get_item(self, item: Hashable) -> "LazyList[Any]":
         """Uses `itemgetter` to retrieve items
         item could be index of a sequence or key of dictionary. Equivalent to:
         `LazyList.map(lambda x: x[item])"""
         getter: Callable[[Hashable], Any] = itemgetter(item)
-        return self.map(getter)
+        return self._fuse("map", getter, "get_item")
 
     def get_attr(self, attribute: str) -> "LazyList[Any]":
         """Uses `attrgetter` to retrieve attributes. Equivalent to:
         `LazyList.map(lambda x: x.attribute)"""
         getter: Callable[[str], Any] = attrgetter(attribute)
-        return self.map(getter)
+        return self._fuse("map", getter, "get_attr")
 
     def find_first(self, predicate: Callable[[X], bool]) -> X:
         """Return the first item where predicate returns `True`"""
@@ -494,29 +1228,39 @@ class LazyList(Iterable[X]):
 
     def find_first_index(self, predicate: Callable[[X], bool]) -> int:
         """Return the index of first item where predicate returns `True`"""
-        value = self.find_first(predicate)
-        return self.index(value)
+        for index, value in enumerate(self):
+            if predicate(value):
+                return index
+        raise ValueError("No item found")
 
     def find_last(self, predicate: Callable[[X], bool]):
         """Return the last item where predicate returns `True`"""
-        for value in self.reverse():
+        found = _MISSING
+        for value in self:
             if predicate(value):
-                return value
-        raise ValueError("No item found")
+                found = value
+        if found is _MISSING:
+            raise ValueError("No item found")
+        return found
 
     def find_last_index(self, predicate: Callable[[X], bool]) -> int:
         """Return the index of last item where predicate returns `True`"""
-        for index, value in self.enumerate().reverse():
+        found = -1
+        for index, value in enumerate(self):
             if predicate(value):
-                return index
-        raise ValueError("No item found")
+                found = index
+        if found < 0:
+            raise ValueError("No item found")
+        return found
 
     def call_method(self, method: str, *args, **kwargs):
         function = methodcaller(method, *args, **kwargs)
-        return self.map(function)
+        return self._fuse("map", function, "call_method")
 
     @property
     def first(self) -> X:
+        if self.__parent is not None and self.__stages and self.__stages[-1].kind in BARRIERS:
+            return itertoolz.first(self.take(1))
         return itertoolz.first(self)
 
     @property
@@ -525,6 +1269,9 @@ class LazyList(Iterable[X]):
 
     @property
     def last(self) -> X:
+        view = self.__random_access()
+        if view is not None:
+            return view[-1]
         return itertoolz.last(self)
 
     def to_set(self) -> Set[X]:
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import contextvars
+import sys
+import warnings
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Sequence, TypeVar
+
+X = TypeVar("X")
+
+OnExceed = Literal["warn", "raise"]
+
+_ACTIVE: contextvars.ContextVar["MemoryTracker | None"] = contextvars.ContextVar("lazy_list_memory", default=None)
+
+
+def sizeof(value: Any) -> int:
+    """A rough size of `value` in bytes, as reported by `sys.getsizeof`.
+    Items referenced by containers are not included."""
+    return sys.getsizeof(value)
+
+
+class BufferStats:
+    """The items held by one buffer of a tracked pipeline, like the items collected by a `sort`.
+
+    `items` and `bytes` are what the buffer holds now, `peak_items` and `peak_bytes` the most it
+    held at once. Bytes are estimated with `sizeof` and are only counted when asked for."""
+
+    def __init__(
+        self,
+        index: int,
+        name: str,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+        on_exceed: OnExceed = "warn",
+        measure_bytes: bool = False,
+    ):
+        self.index = index
+        self.name = name
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.on_exceed = on_exceed
+        self.measure_bytes = measure_bytes or max_bytes is not None
+        self.items = self.bytes = 0
+        self.peak_items = self.peak_bytes = 0
+        self.exceeded = False
+
+    def add(self, value: Any):
+        """Record that the buffer now also holds `value`."""
+        self.items += 1
+        if self.items > self.peak_items:
+            self.peak_items = self.items
+        if self.measure_bytes:
+            self.bytes += sizeof(value)
+            if self.bytes > self.peak_bytes:
+                self.peak_bytes = self.bytes
+        if self._over_limit() and (self.on_exceed == "raise" or not self.exceeded):
+            self._exceed()
+
+    def release(self, values: Sequence[Any]):
+        """Record that the buffer no longer holds `values`."""
+        self.items -= len(values)
+        if self.measure_bytes:
+            self.bytes -= sum(map(sizeof, values))
+
+    def _over_limit(self) -> bool:
+        over_items = self.max_items is not None and self.items > self.max_items
+        return over_items or (self.max_bytes is not None and self.bytes > self.max_bytes)
+
+    def _exceed(self):
+        self.exceeded = True
+        held = f"{self.items} items" + (f" ({self.bytes} bytes)" if self.measure_bytes else "")
+        message = f"The {self.name} buffer holds {held}, over its limit of {self._limit()}"
+        if self.on_exceed == "raise":
+            raise MemoryError(message)
+        warnings.warn(message, RuntimeWarning, stacklevel=3)
+
+    def _limit(self) -> str:
+        limits = [f"{self.max_items} items"] if self.max_items is not None else []
+        limits += [f"{self.max_bytes} bytes"] if self.max_bytes is not None else []
+        return " or ".join(limits)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "buffer": self.name,
+            "peak_items": self.peak_items,
+            "peak_bytes": self.peak_bytes if self.measure_bytes else None,
+            "items": self.items,
+            "bytes": self.bytes if self.measure_bytes else None,
+            "max_items": self.max_items,
+            "max_bytes": self.max_bytes,
+            "exceeded": self.exceeded,
+        }
+
+
+class MemoryTracker:
+    """The buffers created while the tracker is active, in order of creation, with the limits
+    they are checked against."""
+
+    def __init__(
+        self,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+        on_exceed: OnExceed = "warn",
+        measure_bytes: bool = False,
+        limits: Dict[str, int] | None = None,
+    ):
+        if on_exceed not in ("warn", "raise"):
+            raise ValueError(f"`on_exceed` must be 'warn' or 'raise', not {on_exceed!r}")
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.on_exceed = on_exceed
+        self.measure_bytes = measure_bytes
+        self.limits = dict(limits or {})
+        self.buffers: List[BufferStats] = []
+
+    def add(self, name: str) -> BufferStats:
+        max_items = self.limits.get(name, self.max_items)
+        stats = BufferStats(len(self.buffers), name, max_items, self.max_bytes, self.on_exceed, self.measure_bytes)
+        self.buffers.append(stats)
+        return stats
+
+    def peak(self, name: str) -> int:
+        """The most items held at once by a buffer called `name`, 0 if there was none."""
+        return max((stats.peak_items for stats in self.buffers if stats.name == name), default=0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"buffers": [stats.to_dict() for stats in self.buffers]}
+
+    def report(self) -> str:
+        """The buffers as a table, one row per buffer."""
+        header = ("#", "buffer", "peak items", "peak bytes", "limit", "exceeded")
+        rows = [header]
+        for stats in self.buffers:
+            rows.append(
+                (
+                    str(stats.index),
+                    stats.name,
+                    str(stats.peak_items),
+                    str(stats.peak_bytes) if stats.measure_bytes else "",
+                    stats._limit(),
+                    "yes" if stats.exceeded else "",
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines = []
+        for row in rows:
+            # buffer names and limits are aligned to the left, numbers to the right
+            cells = [
+                cell.ljust(width) if i in (1, 4, 5) else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            ]
+            lines.append("  ".join(cells).rstrip())
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.report()
+
+
+@contextmanager
+def track_memory(
+    max_items: int | None = None,
+    max_bytes: int | None = None,
+    on_exceed: OnExceed = "warn",
+    measure_bytes: bool = False,
+    limits: Dict[str, int] | None = None,
+) -> Iterator[MemoryTracker]:
+    """Count the items held by the buffers of `LazyList` pipelines created inside the `with` block.
+
+    The buffers tracked are the replay buffer of an iterated list (`"replay"`), the items collected
+    by `sort` and `reverse` without a limit (`"sort"`, `"reverse"`), the runs of a sort with a
+    `memory_limit` (`"external_sort"`), the groups of `group_by` (`"group_by"`) and the chunks
+    held by `cache` (`"cache"`). Once a list is gone, the items of its replay buffer are released
+    as its remaining iterators move past them. A buffer holding more than `max_items` items, or
+    the limit in `limits` for its name, or more than `max_bytes` bytes warns with a
+    `RuntimeWarning`, once per buffer, or raises `MemoryError` if `on_exceed` is `"raise"`. Bytes
+    are estimated with `sys.getsizeof` for every buffered item, so they are only counted with
+    `measure_bytes` or `max_bytes`.
+
+    Example:
+    >>> with lazy_list.track_memory(limits={"sort": 10_000}, on_exceed="raise") as m:
+    ...     LazyList(range(1000)).sort(reverse=True).to_list()
+    >>> print(m.report())
+    >>> m.to_dict()"""
+    token = _ACTIVE.set(MemoryTracker(max_items, max_bytes, on_exceed, measure_bytes, limits))
+    try:
+        yield _ACTIVE.get()
+    finally:
+        _ACTIVE.reset(token)
+
+
+def buffer(name: str) -> BufferStats | None:
+    """A new buffer of the active tracker, `None` if memory is not tracked."""
+    tracker = _ACTIVE.get()
+    return tracker.add(name) if tracker is not None else None
+
+
+def counted(values: Iterable[X], stats: BufferStats | None) -> Iterable[X]:
+    """`values`, with each item recorded in `stats` as it is pulled into a buffer."""
+    if stats is None:
+        return values
+    return _counted(values, stats)
+
+
+def _counted(values: Iterable[X], stats: BufferStats) -> Iterator[X]:
+    for value in values:
+        stats.add(value)
+        yield value
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import itertools
 import math
 import operator
 import statistics
 from typing import Callable, List, Literal, Tuple, Union
 
+from lazy_list import rolling
 from lazy_list.eager_list import EagerList
 from lazy_list.wrappers import catch_exceptions, keep_type
 
@@ -231,19 +233,83 @@ class NumList(EagerList[Numeric]):
         >>> lst = NumList(range(10))
         >>> lst.window_reduce(4, lambda *x: sum(x)/len(x))
         # NumList([1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5])
+
+        For sums, means, variances, minimums and maximums, the `rolling_*` methods are much
+        faster, as they update the result in O(1) per step instead of building every window.
         """
-        return self.sliding_window(window).map(lambda x: function(*x))
+        return itertools.starmap(function, self.sliding_window(window))
+
+    @keep_type
+    def rolling_sum(self, window: int) -> NumList:
+        """Sum of every window of `window` consecutive elements, in O(1) per step.
+        >>> NumList([1, 2, 3, 4]).rolling_sum(2)
+        # NumList([3, 5, 7])"""
+        return rolling.rolling_sum(self, window)
+
+    @keep_type
+    def rolling_mean(self, window: int) -> NumList:
+        """Mean of every window of `window` consecutive elements, in O(1) per step."""
+        return rolling.rolling_mean(self, window)
 
     @keep_type
-    def diff(self):
+    def rolling_variance(self, window: int) -> NumList:
+        """Sample variance of every window of `window` consecutive elements, in O(1) per step
+        (Welford's algorithm)."""
+        return rolling.rolling_variance(self, window)
+
+    @keep_type
+    def rolling_std_dev(self, window: int) -> NumList:
+        """Sample standard deviation of every window of `window` consecutive elements."""
+        return map(math.sqrt, rolling.rolling_variance(self, window))
+
+    @keep_type
+    def rolling_min(self, window: int) -> NumList:
+        """Minimum of every window of `window` consecutive elements, in amortized O(1) per step."""
+        return rolling.rolling_min(self, window)
+
+    @keep_type
+    def rolling_max(self, window: int) -> NumList:
+        """Maximum of every window of `window` consecutive elements, in amortized O(1) per step."""
+        return rolling.rolling_max(self, window)
+
+    @keep_type
+    def rolling_count(self, window: int) -> NumList:
+        """Number of elements that are not NaN in every window of `window` consecutive elements."""
+        return rolling.rolling_count(self, window)
+
+    @keep_type
+    def shift(self, n: int = 1, fill: Numeric = math.nan) -> NumList:
+        """Shift the elements by `n` places, to the right if `n` is positive, filling the
+        emptied places with `fill`. The length of the list does not change.
+        >>> NumList([1, 2, 3]).shift(1)
+        # NumList([nan, 1, 2])"""
+        n = max(-len(self), min(n, len(self)))
+        if n >= 0:
+            return itertools.chain(itertools.repeat(fill, n), self[: len(self) - n])
+        return itertools.chain(self[-n:], itertools.repeat(fill, -n))
+
+    @keep_type
+    def diff(self, k: int = 1):
         """
-        Difference between consecutive elements.
+        Difference between each element and the element `k` places before it.
         >>> lst = NumList([1, 2, 4, 8])
         >>> diff = lst.diff()
         # NumList([1, 2, 4])"""
-        return self.window_reduce(2, lambda x, y: y - x)
+        if k < 1:
+            raise ValueError("`k` must be a positive value")
+        return map(operator.sub, itertools.islice(self, k, None), self)
+
+    @keep_type
+    def pct_change(self, k: int = 1) -> NumList:
+        """Relative change between each element and the element `k` places before it.
+        Raises `ZeroDivisionError` if one of these elements is 0.
+        >>> NumList([1, 2, 3]).pct_change()
+        # NumList([1.0, 0.5])"""
+        if k < 1:
+            raise ValueError("`k` must be a positive value")
+        return map(operator.truediv, self.diff(k), self)
 
     @keep_type
     def moving_average(self, window: int) -> NumList:
         """Moving average of the sequence"""
-        return self.window_reduce(window, lambda *x: sum(x) / len(x))
+        return self.rolling_mean(window)
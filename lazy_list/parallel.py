@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Literal, Set, Tuple, TypeVar
+
+from toolz import itertoolz
+
+from lazy_list import aggregate
+
+X = TypeVar("X")
+Y = TypeVar("Y")
+
+ExecutorKind = Literal["thread", "process"]
+
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+def check_pool(executor: ExecutorKind, workers: int | None, chunksize: int = 1):
+    """Raise `ValueError` if a pool cannot be created with these arguments."""
+    if executor not in EXECUTORS:
+        raise ValueError(f"`executor` must be one of {', '.join(EXECUTORS)}, not {executor!r}")
+    if workers is not None and workers < 1:
+        raise ValueError("`workers` must be a positive value")
+    if chunksize < 1:
+        raise ValueError("`chunksize` must be a positive value")
+
+
+def create_executor(executor: ExecutorKind, workers: int | None) -> Tuple[Executor, int]:
+    """Create a pool of `workers` workers (one per CPU by default) and return it with its size."""
+    check_pool(executor, workers)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return EXECUTORS[executor](max_workers=workers), workers
+
+
+def _map_chunk(function: Callable[[X], Y], chunk: Tuple[X, ...]) -> List[Y]:
+    return [function(value) for value in chunk]
+
+
+def map_chunks(
+    function: Callable[[X], Y],
+    values: Iterable[X],
+    workers: int | None = None,
+    executor: ExecutorKind = "thread",
+    chunksize: int = 1,
+    ordered: bool = True,
+) -> Iterator[Y]:
+    """Map `function` over `values` in a pool, `chunksize` items per task.
+
+    Input is read lazily: at most two chunks per worker are in flight. Each time the results of a
+    chunk are collected, the next chunk is read and submitted in its place, before the results
+    are handed to the consumer. Results are yielded in input order,
+    or in the order chunks complete if `ordered` is `False`. Exceptions raised by `function` are
+    raised to the consumer. If the consumer stops early, pending chunks are cancelled and the pool
+    is shut down once running chunks finish. With `executor="process"`, `function` and the items
+    must be picklable. The arguments are checked when `map_chunks` is called."""
+    check_pool(executor, workers, chunksize)
+    return _map_chunks(function, values, workers, executor, chunksize, ordered)
+
+
+def _map_chunks(
+    function: Callable[[X], Y],
+    values: Iterable[X],
+    workers: int | None,
+    executor: ExecutorKind,
+    chunksize: int,
+    ordered: bool,
+) -> Iterator[Y]:
+    chunks = iter(itertoolz.partition_all(chunksize, values))
+    pool, workers = create_executor(executor, workers)
+    max_in_flight = 2 * workers
+    pending: Deque[Future[List[Y]]] = deque()
+    running: Set[Future[List[Y]]] = set()
+
+    def submit(chunk: Tuple[X, ...]):
+        future = pool.submit(_map_chunk, function, chunk)
+        running.add(future)
+        if ordered:
+            pending.append(future)
+
+    try:
+        for chunk in itertoolz.take(max_in_flight, chunks):
+            submit(chunk)
+        while running:
+            done = [pending.popleft()] if ordered else wait(running, return_when=FIRST_COMPLETED).done
+            for future in done:
+                running.discard(future)
+                results = future.result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    submit(chunk)
+                yield from results
+    finally:
+        for future in running:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+def aggregate_chunks(
+    values: Iterable[X],
+    key: Callable[[X], Any] | None,
+    aggregation: aggregate.Aggregation,
+    workers: int | None = None,
+    executor: ExecutorKind = "process",
+    chunksize: int = 10_000,
+) -> Dict[Any, Any]:
+    """Aggregate the groups of `values` in a pool, `chunksize` items per task.
+
+    Each task combines the items of its chunk into one accumulator per key, so only the
+    partial results are sent back. They are merged in input order as they arrive, which keeps
+    the items of a group in order. See `aggregate.combine`."""
+    check_pool(executor, workers, chunksize)
+    chunks = itertoolz.partition_all(chunksize, values)
+    table: Dict[Any, Any] = {}
+    for partial_table in map_chunks(partial(aggregate.combine, key, aggregation), chunks, workers, executor):
+        aggregate.merge_into(table, partial_table, aggregation)
+    return {group: aggregation.finish(accumulator) for group, accumulator in table.items()}
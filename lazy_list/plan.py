@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+from lazy_list import memory
+
+
+class Stage(NamedTuple):
+    """A step of a `LazyList` pipeline, e.g. `Stage("map", str.upper)`.
+    `argument` is the function of the step, the `slice` of a `"slice"` step, the
+    `(key, reverse, limit)` of a `"sort"` step or the limit of a `"reverse"` step."""
+
+    kind: str
+    argument: Any = None
+
+
+def _islice(bounds: slice, values: Iterator[Any]) -> Iterator[Any]:
+    return itertools.islice(values, bounds.start, bounds.stop, bounds.step)
+
+
+def _enumerate(_: None, values: Iterator[Any]) -> Iterator[Any]:
+    return enumerate(values)
+
+
+_MISSING = object()
+
+
+def _sort(argument: Tuple[Any, bool, int | None], values: Iterator[Any]) -> Iterator[Any]:
+    """Sort the items. With a limit only the first `limit` items of the sorted result are
+    computed, with a heap, or a single `min`/`max` scan for a limit of 1."""
+    key, reverse, limit = argument
+    if limit is None:
+        return iter(sorted(memory.counted(values, memory.buffer("sort")), key=key, reverse=reverse))
+    if limit == 1:
+        best = (max if reverse else min)(values, key=key, default=_MISSING)
+        return iter(() if best is _MISSING else (best,))
+    if reverse:
+        return iter(heapq.nlargest(limit, values, key=key))
+    return iter(heapq.nsmallest(limit, values, key=key))
+
+
+def _reverse(limit: int | None, values: Iterator[Any]) -> Iterator[Any]:
+    """Reverse the items. With a limit only the last `limit` items are kept."""
+    if limit is None:
+        return reversed(list(memory.counted(values, memory.buffer("reverse"))))
+    return reversed(deque(values, maxlen=limit))
+
+
+STAGES: Dict[str, Callable[[Any, Iterator[Any]], Iterator[Any]]] = {
+    "map": map,
+    "filter": filter,
+    "filterfalse": itertools.filterfalse,
+    "takewhile": itertools.takewhile,
+    "dropwhile": itertools.dropwhile,
+    "slice": _islice,
+    "enumerate": _enumerate,
+    "sort": _sort,
+    "reverse": _reverse,
+}
+
+# Stages that consume their whole input before producing the first item
+BARRIERS = frozenset({"sort", "reverse"})
+
+
+def _is_islice(bounds: slice) -> bool:
+    """Whether `bounds` can be applied to an iterator with `itertools.islice`."""
+    start, stop, step = bounds.start, bounds.stop, bounds.step
+    return start is not None and start >= 0 and (stop is None or stop >= 0) and step > 0
+
+
+def runnable(stages: Tuple[Stage, ...]) -> bool:
+    """Whether a run of stages can be run over an iterator. Slices with negative bounds can only
+    be applied to sequences."""
+    return all(stage.kind != "slice" or _is_islice(stage.argument) for stage in stages)
+
+
+def _limit(stage: Stage, limit: int) -> Stage:
+    if stage.kind == "sort":
+        key, reverse, current = stage.argument
+        return Stage("sort", (key, reverse, limit if current is None else min(current, limit)))
+    return Stage("reverse", limit if stage.argument is None else min(stage.argument, limit))
+
+
+def extend(stages: Tuple[Stage, ...], new: Tuple[Stage, ...]) -> Tuple[Stage, ...]:
+    """Append `new` to a run of stages.
+
+    A `slice` with a stop that directly follows a barrier only needs the first items of the
+    barrier's output, so the limit is pushed into the barrier: `sort` keeps a bounded heap and
+    `reverse` keeps a bounded tail instead of the whole input."""
+    result = list(stages)
+    for stage in new:
+        is_limit = stage.kind == "slice" and stage.argument.stop is not None and _is_islice(stage.argument)
+        if is_limit and result and result[-1].kind in BARRIERS:
+            result[-1] = _limit(result[-1], max(stage.argument.start, stage.argument.stop))
+        result.append(stage)
+    return tuple(result)
+
+
+def output_length(stages: Tuple[Stage, ...], n: int | None) -> int | None:
+    """The number of items a run of stages produces from `n` items, if it can be known
+    without running it."""
+    for stage in stages:
+        if n is None:
+            return None
+        if stage.kind == "slice":
+            n = len(range(n)[stage.argument])
+        elif stage.kind == "sort" and stage.argument[2] is not None:
+            n = min(n, stage.argument[2])
+        elif stage.kind == "reverse" and stage.argument is not None:
+            n = min(n, stage.argument)
+        elif stage.kind not in ("map", "enumerate", "sort", "reverse"):
+            n = None
+    return n
+
+
+def run_stages(values: Iterator[Any], stages: Tuple[Stage, ...], compiled: bool = False) -> Iterator[Any]:
+    """Run a fused run of stages over `values`.
+
+    By default the stages are stacked directly on top of each other as C-level iterators, so an
+    item goes through the whole run without any intermediate buffer or generator frame.
+    With `compiled=True` the stages between barriers are executed by a single generated loop,
+    see `compile_stages`."""
+    if not compiled:
+        for stage in stages:
+            values = STAGES[stage.kind](stage.argument, values)
+        return values
+    run: List[Stage] = []
+    for stage in stages:
+        if stage.kind in BARRIERS:
+            values = STAGES[stage.kind](stage.argument, _run_compiled(values, run))
+            run = []
+        else:
+            run.append(stage)
+    return _run_compiled(values, run)
+
+
+def _run_compiled(values: Iterator[Any], stages: List[Stage]) -> Iterator[Any]:
+    if not stages:
+        return values
+    return compile_stages(shape(tuple(stages)))(values, *(stage.argument for stage in stages))
+
+
+def shape(stages: Tuple[Stage, ...]) -> Tuple[Tuple[str, ...], ...]:
+    """The part of a run of stages that its generated code depends on.
+    Runs with the same shape share the same compiled function."""
+    result = []
+    for stage in stages:
+        if stage.kind == "slice":
+            bounds = stage.argument
+            result.append(("slice", bounds.start != 0, bounds.stop is not None, bounds.step != 1))
+        elif stage.kind in ("filter", "filterfalse"):
+            result.append((stage.kind, stage.argument is not None))
+        else:
+            result.append((stage.kind,))
+    return tuple(result)
+
+
+class _Code:
+    """The lines of a generated pipeline function: `setup` runs once, `body` once per item."""
+
+    def __init__(self):
+        self.setup: List[str] = []
+        self.body: List[str] = []
+        self.indent = 2
+        # (indent, stage index) of the slices that end the loop once their stop is reached
+        self.stops: List[Tuple[int, int]] = []
+
+    def emit(self, line: str):
+        self.body.append("    " * self.indent + line)
+
+    def block(self, line: str):
+        """Emit an `if` statement and nest the rest of the loop body in it."""
+        self.emit(line)
+        self.indent += 1
+
+
+def _emit_map(code: _Code, i: int, argument: str, flags: Tuple[str, ...]):
+    code.emit(f"v = {argument}(v)")
+
+
+def _emit_filter(code: _Code, i: int, argument: str, flags: Tuple[str, ...]):
+    code.block(f"if {argument}(v):" if flags[0] else "if v:")
+
+
+def _emit_filterfalse(code: _Code, i: int, argument: str, flags: Tuple[str, ...]):
+    code.block(f"if not {argument}(v):" if flags[0] else "if not v:")
+
+
+def _emit_takewhile(code: _Code, i: int, argument: str, flags: Tuple[str, ...]):
+    code.emit(f"if not {argument}(v):")
+    code.emit("    return")
+
+
+def _emit_dropwhile(code: _Code, i: int, argument: str, flags: Tuple[str, ...]):
+    code.setup.append(f"d{i} = True")
+    code.block(f"if not (d{i} and {argument}(v)):")
+    code.emit(f"d{i} = False")
+
+
+def _emit_enumerate(code: _Code, i: int, argument: str, flags: Tuple[str, ...]):
+    code.setup.append(f"n{i} = 0")
+    code.emit(f"v = (n{i}, v)")
+    code.emit(f"n{i} += 1")
+
+
+def _emit_slice(code: _Code, i: int, argument: str, flags: Tuple[str, ...]):
+    has_start, has_stop, has_step = flags
+    code.setup.append(f"c{i} = 0")
+    code.setup.append(f"start{i}, stop{i}, step{i} = {argument}.start, {argument}.stop, {argument}.step")
+    if has_stop:
+        code.setup.append(f"stop{i} = max(start{i}, stop{i})")
+        code.setup.append(f"if stop{i} == 0:")
+        code.setup.append("    return")
+    code.emit(f"i{i} = c{i}")
+    code.emit(f"c{i} += 1")
+    if has_stop:
+        code.stops.append((code.indent, i))
+    if has_start and has_step:
+        code.block(f"if i{i} >= start{i} and not (i{i} - start{i}) % step{i}:")
+    elif has_start:
+        code.block(f"if i{i} >= start{i}:")
+    elif has_step:
+        code.block(f"if not i{i} % step{i}:")
+
+
+_EMITTERS: Dict[str, Callable[[_Code, int, str, Tuple[str, ...]], None]] = {
+    "map": _emit_map,
+    "filter": _emit_filter,
+    "filterfalse": _emit_filterfalse,
+    "takewhile": _emit_takewhile,
+    "dropwhile": _emit_dropwhile,
+    "enumerate": _emit_enumerate,
+    "slice": _emit_slice,
+}
+
+
+@lru_cache(maxsize=256)
+def compile_stages(stages_shape: Tuple[Tuple[str, ...], ...]) -> Callable[..., Iterator[Any]]:
+    """Generate a generator function running a run of stages with the given shape as one loop.
+
+    The function is called as `function(values, *arguments)` with one argument per stage.
+    Each stage is inlined as a few statements on local variables. Stages that drop items wrap
+    the rest of the loop body in an `if` block, so no `continue` can skip the checks that end
+    a `slice` early. A `slice` stops pulling items as soon as its last item is reached, just like
+    `itertools.islice`."""
+    arguments = [f"a{i}" for i in range(len(stages_shape))]
+    code = _Code()
+    for i, (kind, *flags) in enumerate(stages_shape):
+        if kind not in _EMITTERS:
+            raise ValueError(f"Unknown stage: {kind}")
+        _EMITTERS[kind](code, i, arguments[i], tuple(flags))
+    code.emit("yield v")
+    for level, i in reversed(code.stops):
+        code.body.append("    " * level + f"if c{i} >= stop{i}:")
+        code.body.append("    " * level + "    return")
+
+    lines = [f"def pipeline(values, {', '.join(arguments)}):" if arguments else "def pipeline(values):"]
+    lines += ["    " + line for line in code.setup]
+    lines.append("    for v in values:")
+    lines += code.body
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines), "<lazy_list pipeline>", "exec"), namespace)
+    return namespace["pipeline"]
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, TypeVar
+
+X = TypeVar("X")
+
+_ACTIVE: contextvars.ContextVar["Profile | None"] = contextvars.ContextVar("lazy_list_profile", default=None)
+
+# stages whose argument is a function called once per item
+_FUNCTION_STAGES = frozenset({"map", "filter", "filterfalse", "takewhile", "dropwhile"})
+
+
+class StageStats:
+    """What a stage of a profiled pipeline did. Times are in seconds.
+
+    `wall` is the time spent producing the items of the stage, including the time spent
+    waiting for the items of the stage before it (`upstream`)."""
+
+    def __init__(self, index: int, name: str, parent: "StageStats | None" = None):
+        self.index = index
+        self.name = name
+        self.parent = parent
+        self.items_out = 0
+        self.wall = 0.0
+        self.call_wall = 0.0
+        self.call_cpu = 0.0
+        self.calls = 0
+
+    @property
+    def items_in(self) -> int | None:
+        return self.parent.items_out if self.parent is not None else None
+
+    @property
+    def upstream(self) -> float:
+        return self.parent.wall if self.parent is not None else 0.0
+
+    @property
+    def self_wall(self) -> float:
+        return max(self.wall - self.upstream, 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "stage": self.name,
+            "upstream_stage": self.parent.index if self.parent is not None else None,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "wall": self.wall,
+            "self_wall": self.self_wall,
+            "upstream_wall": self.upstream,
+            "calls": self.calls,
+            "call_wall": self.call_wall,
+            "call_cpu": self.call_cpu,
+        }
+
+
+class Profile:
+    """The stages of the pipelines built while the profile is active, in order of creation."""
+
+    def __init__(self):
+        self.stages: List[StageStats] = []
+
+    def add(self, name: str) -> StageStats:
+        stats = StageStats(len(self.stages), name)
+        self.stages.append(stats)
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"stages": [stats.to_dict() for stats in self.stages]}
+
+    def report(self) -> str:
+        """The stages as a table, one row per stage."""
+        header = ("#", "stage", "from", "in", "out", "wall", "self", "upstream", "calls", "call wall", "call cpu")
+        rows = [header]
+        for stats in self.stages:
+            rows.append(
+                (
+                    str(stats.index),
+                    stats.name,
+                    "" if stats.parent is None else str(stats.parent.index),
+                    "" if stats.items_in is None else str(stats.items_in),
+                    str(stats.items_out),
+                    f"{stats.wall:.6f}",
+                    f"{stats.self_wall:.6f}",
+                    f"{stats.upstream:.6f}",
+                    str(stats.calls),
+                    f"{stats.call_wall:.6f}",
+                    f"{stats.call_cpu:.6f}",
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines = []
+        for row in rows:
+            # stage names are aligned to the left, numbers to the right
+            cells = [
+                cell.ljust(width) if i == 1 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths))
+            ]
+            lines.append("  ".join(cells).rstrip())
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.report()
+
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """Profile the `LazyList` pipelines built inside the `with` block.
+
+    Each stage records the items it produced, the time spent producing them and, for stages
+    running a function per item like `map` or `filter`, the time spent inside the function.
+    Items in and time blocked on upstream are those of the stage the stage reads from. Stages
+    are not fused while profiling, so every stage shows up on its own.
+
+    Example:
+    >>> with lazy_list.profile() as p:
+    ...     LazyList(range(1000)).map(str).filter(str.isdigit).to_list()
+    >>> print(p.report())
+    >>> p.to_dict()"""
+    token = _ACTIVE.set(Profile())
+    try:
+        yield _ACTIVE.get()
+    finally:
+        _ACTIVE.reset(token)
+
+
+def active() -> Profile | None:
+    return _ACTIVE.get()
+
+
+def observe(open_values: Callable[[], Iterator[X]], stats: StageStats) -> Iterator[X]:
+    """Yield the items of the iterator returned by `open_values`, recording their number and
+    the time spent producing them. Opening the iterator is timed too, as stages like `sort` do
+    their work there."""
+    clock = time.perf_counter
+    start = clock()
+    iterator = open_values()
+    stats.wall += clock() - start
+    while True:
+        start = clock()
+        try:
+            value = next(iterator)
+        except StopIteration:
+            stats.wall += clock() - start
+            return
+        stats.wall += clock() - start
+        stats.items_out += 1
+        yield value
+
+
+def time_calls(function: Callable[..., Any], stats: StageStats) -> Callable[..., Any]:
+    """Wrap `function` to record the wall and CPU time spent in it."""
+
+    def timed(*args, **kwargs):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.call_wall += time.perf_counter() - wall
+            stats.call_cpu += time.process_time() - cpu
+            stats.calls += 1
+
+    return timed
+
+
+def time_stage(kind: str, argument: Any, stats: StageStats) -> Any:
+    """The argument of a fused stage, with the functions it calls per item timed."""
+    if kind in _FUNCTION_STAGES and argument is not None:
+        return time_calls(argument, stats)
+    if kind == "sort" and argument[0] is not None:
+        return (time_calls(argument[0], stats), *argument[1:])
+    return argument
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import itertools
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, List, TypeVar
+
+from lazy_list import memory
+
+X = TypeVar("X")
+
+SEGMENT_SIZE = 256
+
+_second = itemgetter(1)
+
+
+class _Segment:
+    """A fixed-size block of buffered items, linked to the block that follows it. Its items are
+    released from the stats of the buffer when it is freed."""
+
+    __slots__ = ("items", "next", "stats")
+
+    def __init__(self, stats: memory.BufferStats | None) -> None:
+        self.items: List[Any] = []
+        self.next: _Segment | None = None
+        self.stats = stats
+
+    def __del__(self):
+        if self.stats is not None:
+            self.stats.release(self.items)
+
+
+class _Claim:
+    """The right to pull items from the source into the tail segment, held by one cursor at a time.
+
+    `items` pulls an item, appends it to the segment and yields it, with C-level iterators only.
+    It is bounded by a list of tokens, one per free place in the segment: `zip` takes a token
+    before pulling an item, so clearing the tokens stops `items` before it pulls another item.
+    Another cursor that needs to pull revokes the claim this way, and the cursor holding it
+    then reads the items pulled by others from the segment."""
+
+    __slots__ = ("segment", "items", "stop", "_tokens")
+
+    def __init__(self, source: Iterator[Any], segment: _Segment, segment_size: int) -> None:
+        self.segment = segment
+        self._tokens = [None] * (segment_size - len(segment.items))
+        # `filterfalse` yields every item, as `list.append` returns `None`
+        self.items = map(_second, zip(self._tokens, itertools.filterfalse(segment.items.append, source)))
+        # the number of items in the segment when the claim was revoked
+        self.stop: int | None = None
+
+    def revoke(self) -> None:
+        self.stop = len(self.segment.items)
+        self._tokens.clear()
+
+
+class _Feed:
+    """Pulls items from the source into the tail segment.
+
+    The feed is shared by all cursors of a buffer. It only references the tail, so segments
+    behind the slowest live cursor are released as soon as nothing else points at them."""
+
+    __slots__ = ("source", "tail", "segment_size", "claim")
+
+    def __init__(self, source: Iterator[Any], tail: _Segment, segment_size: int) -> None:
+        self.source: Iterator[Any] | None = source
+        self.tail = tail
+        self.segment_size = segment_size
+        self.claim: _Claim | None = None
+
+    def _revoke(self) -> None:
+        if self.claim is not None:
+            self.claim.revoke()
+            self.claim = None
+
+    def pull(self) -> bool:
+        """Buffer one more item from the source. Return `False` once the source is exhausted."""
+        self._revoke()
+        if self.source is None:
+            return False
+        try:
+            value = next(self.source)
+        except StopIteration:
+            self.source = None
+            return False
+        self.grow()
+        self.tail.items.append(value)
+        return True
+
+    def grow(self) -> bool:
+        """Start a new tail segment if the tail is full. Return `False` if the source is exhausted."""
+        if self.source is None:
+            return False
+        if len(self.tail.items) == self.segment_size:
+            self.tail.next = _Segment(self.tail.stats)
+            self.tail = self.tail.next
+        return True
+
+    def take_claim(self) -> _Claim | None:
+        """Claim the source for a cursor at the end of the tail segment, which must not be full.
+        `None` if the source is exhausted."""
+        self._revoke()
+        if self.source is None:
+            return None
+        self.claim = _Claim(self.source, self.tail, self.segment_size)
+        return self.claim
+
+    def release(self, claim: _Claim) -> int:
+        """The number of items of the segment of `claim` read through it, once its items stop."""
+        if claim.stop is not None:
+            return claim.stop
+        count = len(claim.segment.items)
+        if count < self.segment_size:
+            # the items stopped before the tokens ran out, so the source is exhausted
+            self.source = None
+        return count
+
+
+def _pieces(feed: _Feed, segment: _Segment) -> Iterator[Iterable[Any]]:
+    """The items from the start of `segment` onwards, as iterables to be chained: the items
+    already buffered, and claims on the source at the end of the buffer."""
+    index = 0
+    while True:
+        items = segment.items
+        if index < len(items):
+            # a list iterator follows the list as it grows, up to the end
+            yield itertools.islice(items, index, None) if index else items
+            index = len(items)
+        elif index == feed.segment_size:
+            if segment.next is None and not feed.grow():
+                return
+            segment, index = segment.next, 0
+        else:
+            claim = feed.take_claim()
+            if claim is None:
+                return
+            yield claim.items
+            index = feed.release(claim)
+
+
+class ReplayBuffer(Iterable[X]):
+    """Buffer the items of an iterator so they can be iterated any number of times.
+
+    Items are stored in linked segments of `segment_size` items that are shared by every
+    cursor. The buffer itself holds the first segment, so the whole source stays replayable
+    while it is alive. Once the buffer is dropped, segments are freed as the remaining cursors
+    move past them. Cursors chain the buffered segments, and pull new items through a claim on
+    the source, so iterating does not run Python code per item.
+
+    With `stats`, items are counted as they are pulled and released as their segments are freed.
+
+    >>> buffer = ReplayBuffer(iter(range(3)))
+    >>> list(buffer), list(buffer)
+    ([0, 1, 2], [0, 1, 2])
+    """
+
+    def __init__(self, values: Iterable[X], segment_size: int = SEGMENT_SIZE, stats: memory.BufferStats | None = None):
+        if segment_size < 1:
+            raise ValueError("`segment_size` must be a positive value")
+        self._head = _Segment(stats)
+        self._feed = _Feed(iter(memory.counted(values, stats)), self._head, segment_size)
+
+    def __iter__(self) -> Iterator[X]:
+        """A new cursor, from the first item."""
+        return itertools.chain.from_iterable(_pieces(self._feed, self._head))
+
+    def item(self, index: int) -> X:
+        """The item at a non-negative `index`, pulling items from the source up to it.
+        Raises `IndexError` if the source has fewer items."""
+        feed = self._feed
+        segment = self._head
+        for _ in range(index // feed.segment_size):
+            while segment.next is None:
+                if not feed.pull():
+                    raise IndexError("ReplayBuffer index out of range")
+            segment = segment.next
+        offset = index % feed.segment_size
+        while len(segment.items) <= offset:
+            if not feed.pull():
+                raise IndexError("ReplayBuffer index out of range")
+        return segment.items[offset]
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import itertools
+import math
+import operator
+from collections import deque
+from typing import Callable, Counter, Deque, Iterable, Iterator, List, Sequence, Tuple, TypeVar, Union
+
+Numeric = Union[int, float, bool]
+N = TypeVar("N", int, float)
+
+# the most steps between two exact recomputations of a rolling float sum or variance
+RESUM_INTERVAL = 256
+# a variance is recomputed when an item leaving the window took all but this part of it away
+_CANCELLATION = 2**-10
+
+
+def _check(values: Sequence[Numeric], window: int) -> bool:
+    """Whether there is at least one full window."""
+    if window < 1:
+        raise ValueError("`window` must be a positive value")
+    return len(values) >= window
+
+
+def rolling_sum(values: Sequence[N], window: int) -> Iterator[N]:
+    """Sums of every full window of `window` items, updated in O(1) per step.
+
+    Sums of `int`s are exact, and each step adds the difference between the item entering and
+    the item leaving the window with C-level iterators. Other sums are compensated, see
+    `_rolling_fsum`."""
+    if not _check(values, window):
+        return iter(())
+    if set(map(type, values)) <= {int, bool}:
+        steps = map(operator.sub, itertools.islice(values, window, None), values)
+        return itertools.accumulate(steps, initial=sum(itertools.islice(values, window)))
+    return _rolling_fsum(values, window)
+
+
+def _finite(values: Iterable[Numeric]) -> List[Numeric]:
+    return [value for value in values if math.isfinite(value)]
+
+
+def _fsum(values: Iterable[Numeric]) -> Tuple[float, float]:
+    """The sum of the finite items of `values` as the correctly rounded sum and what rounding it
+    left out, so the two add up to the exact sum more closely than any single float."""
+    finite = _finite(values)
+    try:
+        total = math.fsum(finite)
+        return total, math.fsum(finite + [-total])
+    except OverflowError:
+        return sum(finite), 0.0
+
+
+def _nonfinite_sum(counts: Counter[float]) -> float:
+    """The sum of a window holding the NaN and infinite items counted in `counts`."""
+    if counts[math.nan] or (counts[math.inf] and counts[-math.inf]):
+        return math.nan
+    return math.inf if counts[math.inf] else -math.inf
+
+
+def _count(counts: Counter[float], value: float, n: int):
+    counts[math.nan if math.isnan(value) else value] += n
+
+
+def _rolling_fsum(values: Sequence[Numeric], window: int) -> Iterator[float]:
+    """Float sums of every full window, with a running sum compensated by Neumaier's algorithm,
+    so a large item leaving the window does not wipe out the small ones. The sum is recomputed
+    exactly with `math.fsum` every `RESUM_INTERVAL` steps, or every `window` steps for larger
+    windows, which is still O(1) per step on average.
+
+    NaN and infinite items are counted instead of being added, so they only make the sums of
+    the windows holding them non-finite."""
+    items = iter(values)
+    current: Deque[Numeric] = deque(itertools.islice(items, window), maxlen=window)
+    counts: Counter[float] = Counter()
+    for value in current:
+        if not math.isfinite(value):
+            _count(counts, value, 1)
+    nonfinite = sum(counts.values())
+    total, compensation = _fsum(current)
+    yield total + compensation if not nonfinite else _nonfinite_sum(counts)
+    interval = max(window, RESUM_INTERVAL)
+    isfinite = math.isfinite
+    for step, new in enumerate(items, 1):
+        old = current[0]
+        current.append(new)
+        if not isfinite(new):
+            _count(counts, new, 1)
+            nonfinite += 1
+        if not isfinite(old):
+            _count(counts, old, -1)
+            nonfinite -= 1
+            old = 0.0
+        if step % interval == 0:
+            total, compensation = _fsum(current)
+        else:
+            if isfinite(new):
+                t = total + new
+                if abs(total) >= abs(new):
+                    compensation += (total - t) + new
+                else:
+                    compensation += (new - t) + total
+                total = t
+            t = total - old
+            if abs(total) >= abs(old):
+                compensation += (total - t) - old
+            else:
+                compensation += (-old - t) + total
+            total = t
+        yield total + compensation if not nonfinite else _nonfinite_sum(counts)
+
+
+def rolling_mean(values: Sequence[Numeric], window: int) -> Iterator[float]:
+    return map(operator.truediv, rolling_sum(values, window), itertools.repeat(window))
+
+
+def rolling_count(values: Sequence[Numeric], window: int) -> Iterator[int]:
+    """The number of items of every full window that are not NaN."""
+    return rolling_sum([not math.isnan(value) for value in values], window)
+
+
+def _moments(values: Iterable[Numeric]) -> Tuple[int, float, float]:
+    """The number, mean and sum of squared deviations of the finite items, computed exactly in
+    two passes."""
+    finite = _finite(values)
+    if not finite:
+        return 0, 0.0, 0.0
+    mean = sum(_fsum(finite)) / len(finite)
+    return len(finite), mean, sum(_fsum([(value - mean) * (value - mean) for value in finite]))
+
+
+def rolling_variance(values: Sequence[Numeric], window: int) -> Iterator[float]:
+    """Sample variances of every full window, updated in O(1) per step by Welford's algorithm,
+    adding the item entering and removing the item leaving the window.
+
+    The window is recomputed exactly every `RESUM_INTERVAL` steps (or `window` steps for larger
+    windows), and whenever an item leaving the window held almost all of its squared deviations,
+    e.g. a large item, as the update would then lose the precision of what is left. Windows
+    holding a NaN or infinite item have a variance of NaN, without affecting the other windows."""
+    full = _check(values, window)
+    if window < 2:
+        raise ValueError("The variance needs a window of at least two items")
+    return _rolling_variance(values, window) if full else iter(())
+
+
+def _rolling_variance(values: Sequence[Numeric], window: int) -> Iterator[float]:
+    items = iter(values)
+    current: Deque[Numeric] = deque(itertools.islice(items, window), maxlen=window)
+    nonfinite = len(current) - len(_finite(current))
+    n, mean, m2 = _moments(current)
+    yield math.nan if nonfinite else max(m2, 0.0) / (window - 1)
+    interval = max(window, RESUM_INTERVAL)
+    isfinite = math.isfinite
+    for step, new in enumerate(items, 1):
+        old = current[0]
+        current.append(new)
+        recompute = step % interval == 0
+        if not isfinite(old):
+            nonfinite -= 1
+        elif n == 1:
+            n, mean, m2 = 0, 0.0, 0.0
+        else:
+            n -= 1
+            delta = old - mean
+            mean -= delta / n
+            removed = delta * (old - mean)
+            m2 -= removed
+            recompute = recompute or m2 < removed * _CANCELLATION
+        if not isfinite(new):
+            nonfinite += 1
+        else:
+            n += 1
+            delta = new - mean
+            mean += delta / n
+            m2 += delta * (new - mean)
+        if recompute:
+            n, mean, m2 = _moments(current)
+        yield math.nan if nonfinite else max(m2, 0.0) / (window - 1)
+
+
+def _rolling_extreme(values: Sequence[N], window: int, before: Callable[[N, N], bool]) -> Iterator[N]:
+    """The extreme of every full window, keeping a deque of the candidates: the items that are
+    not dominated by a later item of the window, so each item is pushed and popped once."""
+    candidates: Deque[Tuple[int, N]] = deque()
+    for i, value in enumerate(values):
+        while candidates and not before(candidates[-1][1], value):
+            candidates.pop()
+        candidates.append((i, value))
+        if candidates[0][0] <= i - window:
+            candidates.popleft()
+        if i >= window - 1:
+            yield candidates[0][1]
+
+
+def rolling_min(values: Sequence[N], window: int) -> Iterator[N]:
+    return _rolling_extreme(values, window, operator.lt) if _check(values, window) else iter(())
+
+
+def rolling_max(values: Sequence[N], window: int) -> Iterator[N]:
+    return _rolling_extreme(values, window, operator.gt) if _check(values, window) else iter(())
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import random
+from typing import Iterable, Iterator, List, Tuple, TypeVar
+
+X = TypeVar("X")
+
+_MISSING = object()
+
+
+def _skip(rng: random.Random, p: float) -> int:
+    """The number of failed trials before the first success, with success probability `p`."""
+    return int(math.log(1.0 - rng.random()) / math.log1p(-p))
+
+
+def choices(values: Iterable[Tuple[X, float]], k: int, rng: random.Random) -> Iterator[X]:
+    """Choose `k` items with replacement from `(item, weight)` pairs, in one pass with O(k) memory.
+
+    Each of the `k` slots is an independent weighted reservoir of size one: the item `i` replaces
+    the content of a slot with probability `weight_i / sum(weights up to i)`. The slots replaced by
+    an item are found by skipping over them geometrically, so an item costs O(1) random numbers
+    on average instead of O(k)."""
+    slots: List[X] = []
+    total = 0.0
+    for value, weight in values:
+        if weight < 0:
+            raise ValueError("Weights must be non-negative")
+        if weight == 0:
+            continue
+        total += weight
+        p = weight / total
+        if p >= 1.0:
+            slots = [value] * k
+            continue
+        index = _skip(rng, p)
+        while index < k:
+            slots[index] = value
+            index += 1 + _skip(rng, p)
+    if k > 0 and not slots:
+        raise IndexError("Cannot choose from an empty population or a population with zero total weight")
+    yield from slots
+
+
+def sample(values: Iterable[X], k: int, rng: random.Random) -> Iterator[X]:
+    """Choose `k` unique items without replacement, in one pass with O(k) memory.
+
+    Uses reservoir sampling with geometric skips (Li's Algorithm L), so only O(k log(n/k))
+    random numbers are drawn for `n` items. The items are returned in random order."""
+    if k < 0:
+        raise ValueError("Sample size must be non-negative")
+    iterator = iter(values)
+    reservoir = list(itertools.islice(iterator, k))
+    if len(reservoir) < k:
+        raise ValueError("Sample larger than population")
+    if k > 0:
+        w = math.exp(math.log(1.0 - rng.random()) / k)
+        while w < 1.0:
+            skip = int(math.log(1.0 - rng.random()) / math.log1p(-w))
+            value = next(itertools.islice(iterator, skip, None), _MISSING)
+            if value is _MISSING:
+                break
+            reservoir[rng.randrange(k)] = value
+            w *= math.exp(math.log(1.0 - rng.random()) / k)
+    rng.shuffle(reservoir)
+    yield from reservoir
+
+
+def weighted_sample(values: Iterable[Tuple[X, float]], k: int, rng: random.Random) -> Iterator[X]:
+    """Choose `k` unique items without replacement from `(item, weight)` pairs, with the
+    probability of each item proportional to its weight, in one pass with O(k) memory.
+
+    Each item gets the random key `u ** (1 / weight)` and the `k` items with the largest keys
+    are kept in a heap (Efraimidis and Spirakis' A-Res). Keys are compared as `log(u) / weight`
+    to avoid underflow. The items are returned in decreasing order of their keys."""
+    if k < 0:
+        raise ValueError("Sample size must be non-negative")
+    heap: List[Tuple[float, int, X]] = []
+    for order, (value, weight) in enumerate(values):
+        if weight < 0:
+            raise ValueError("Weights must be non-negative")
+        if weight == 0 or k == 0:
+            continue
+        key = math.log(1.0 - rng.random()) / weight
+        if len(heap) < k:
+            heapq.heappush(heap, (key, order, value))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, order, value))
+    if len(heap) < k:
+        raise ValueError("Sample larger than population with non-zero weights")
+    for _, _, value in sorted(heap, reverse=True):
+        yield value
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import math
+import operator
+from typing import Any, Dict, Generic, Hashable, Iterable, List, Tuple, TypeVar
+
+X = TypeVar("X", bound=Hashable)
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(h: int) -> int:
+    """Spread the bits of a builtin hash over 64 bits (the MurmurHash3 finalizer), as the hash
+    of a small `int` is the `int` itself."""
+    h &= _MASK64
+    h ^= h >> 33
+    h = h * 0xFF51AFD7ED558CCD & _MASK64
+    h ^= h >> 33
+    h = h * 0xC4CEB9FE1A85EC53 & _MASK64
+    return h ^ h >> 33
+
+
+def item_hash(value: Any) -> int:
+    """The 64-bit hash of an item used by every sketch, from the builtin `hash`.
+
+    Like in a `set`, equal items such as `1`, `1.0` and `True` are the same item, and items must
+    be hashable. The hash of a `str` differs between processes unless `PYTHONHASHSEED` is set,
+    so sketches built in different processes can only be merged with a fixed `PYTHONHASHSEED`."""
+    return _mix(hash(value))
+
+
+class HyperLogLog:
+    """Estimates the number of distinct items with `2 ** precision` bytes of memory.
+
+    The relative standard error of the estimate is about `1.04 / sqrt(2 ** precision)`. Sketches
+    with the same precision can be merged, e.g. to combine sketches of chunks computed in
+    parallel. Items are hashed with `item_hash`."""
+
+    def __init__(self, error: float = 0.01, precision: int | None = None):
+        """Create a sketch with a relative standard error of about `error`, or with the given
+        `precision` between 4 and 18."""
+        if precision is None:
+            if not 0 < error < 1:
+                raise ValueError("`error` must be between 0 and 1")
+            precision = math.ceil(math.log2((1.04 / error) ** 2))
+        self.precision = min(max(precision, 4), 18)
+        self._registers = bytearray(1 << self.precision)
+
+    def add(self, value: Any):
+        h = item_hash(value)
+        rest = 64 - self.precision
+        index = h >> rest
+        rank = rest - (h & ((1 << rest) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, values: Iterable[Any]) -> "HyperLogLog":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Add the items counted by `other` to this sketch."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precisions")
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+    def estimate(self) -> int:
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / math.fsum(2.0 ** -register for register in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+
+class MisraGries(Generic[X]):
+    """Finds the items that occur more than `n / (k + 1)` times among `n` items with `k`
+    counters (Misra-Gries summary).
+
+    The count of an item is underestimated by at most `error()`, which is at most
+    `n / (k + 1)`. Summaries with the same `k` can be merged."""
+
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError("`k` must be a positive value")
+        self.k = k
+        self.n = 0
+        self._counters: Dict[X, int] = {}
+
+    def add(self, value: X):
+        self.n += 1
+        counters = self._counters
+        if value in counters:
+            counters[value] += 1
+        elif len(counters) < self.k:
+            counters[value] = 1
+        else:
+            # each decrement removes k + 1 occurrences, so it happens at most n / (k + 1) times
+            for item, count in list(counters.items()):
+                if count == 1:
+                    del counters[item]
+                else:
+                    counters[item] = count - 1
+
+    def update(self, values: Iterable[X]) -> "MisraGries[X]":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "MisraGries[X]") -> "MisraGries[X]":
+        """Add the items counted by `other` to this summary."""
+        if other.k != self.k:
+            raise ValueError("Cannot merge Misra-Gries summaries with different sizes")
+        counters = dict(self._counters)
+        for item, count in other._counters.items():
+            counters[item] = counters.get(item, 0) + count
+        if len(counters) > self.k:
+            cut = sorted(counters.values(), reverse=True)[self.k]
+            counters = {item: count - cut for item, count in counters.items() if count > cut}
+        self._counters = counters
+        self.n += other.n
+        return self
+
+    def error(self) -> int:
+        """The most by which the count of an item is underestimated."""
+        return (self.n - sum(self._counters.values())) // (self.k + 1)
+
+    def most_common(self) -> List[Tuple[X, int]]:
+        """The candidate heavy hitters with lower bounds of their counts, most frequent first."""
+        return sorted(self._counters.items(), key=lambda item: item[1], reverse=True)
+
+
+class CountMinSketch:
+    """Estimates how often items occur with a fixed table of `depth x width` counters.
+
+    Estimates are never too small, and with probability `confidence` they are too large by at
+    most `error` times the number of items. Sketches with the same shape can be merged. Items
+    are hashed with `item_hash`."""
+
+    def __init__(self, error: float = 0.001, confidence: float = 0.99):
+        if not 0 < error < 1 or not 0 < confidence < 1:
+            raise ValueError("`error` and `confidence` must be between 0 and 1")
+        self.width = math.ceil(math.e / error)
+        self.depth = math.ceil(math.log(1 / (1 - confidence)))
+        self.n = 0
+        self._rows = [[0] * self.width for _ in range(self.depth)]
+
+    def _columns(self, value: Any) -> Iterable[int]:
+        # double hashing: the columns of the rows are h1 + i * h2
+        h = item_hash(value)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return ((h1 + i * h2) % self.width for i in range(self.depth))
+
+    def add(self, value: Any, count: int = 1):
+        self.n += count
+        for row, column in zip(self._rows, self._columns(value)):
+            row[column] += count
+
+    def update(self, values: Iterable[Any]) -> "CountMinSketch":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """Add the items counted by `other` to this sketch."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge Count-Min sketches with different shapes")
+        self._rows = [list(map(sum, zip(row, other_row))) for row, other_row in zip(self._rows, other._rows)]
+        self.n += other.n
+        return self
+
+    def count(self, value: Any) -> int:
+        return min(row[column] for row, column in zip(self._rows, self._columns(value)))
+
+    def __getitem__(self, value: Any) -> int:
+        return self.count(value)
+
+
+class BloomFilter:
+    """A set that uses a fixed amount of memory and may report items that were never added.
+
+    Sized for `capacity` items with a false positive rate of about `error_rate`; the rate grows
+    beyond that as more items are added. Items are hashed with `item_hash`. Filters with the
+    same shape can be merged."""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        if capacity < 1:
+            raise ValueError("`capacity` must be a positive value")
+        if not 0 < error_rate < 1:
+            raise ValueError("`error_rate` must be between 0 and 1")
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: Any) -> Iterable[int]:
+        h = item_hash(value)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value: Any) -> bool:
+        """Add `value` and return whether it was probably added before."""
+        bits = self._bits
+        present = True
+        for position in self._positions(value):
+            byte, bit = divmod(position, 8)
+            if not bits[byte] >> bit & 1:
+                present = False
+                bits[byte] |= 1 << bit
+        return present
+
+    def __contains__(self, value: Any) -> bool:
+        return all(self._bits[position // 8] >> (position % 8) & 1 for position in self._positions(value))
+
+    def merge(self, other: "BloomFilter") -> "BloomFilter":
+        """Add the items of `other` to this filter."""
+        if (other.size, other.hashes) != (self.size, self.hashes):
+            raise ValueError("Cannot merge Bloom filters with different shapes")
+        self._bits = bytearray(map(operator.or_, self._bits, other._bits))
+        return self
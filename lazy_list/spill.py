@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import pickle
+import tempfile
+from typing import IO, Any, Callable, Iterable, Iterator, List, TypeVar
+
+from lazy_list import memory
+from lazy_list.memory import sizeof
+
+X = TypeVar("X")
+
+# items pickled together in one frame of a spill file
+FRAME_SIZE = 1024
+# the most spill files merged at once; more runs are merged in several passes
+MAX_MERGE = 64
+
+
+class SpillFile:
+    """A temporary file of pickled items, written once and then read any number of times.
+    Items are pickled in frames of `FRAME_SIZE` items. The file is deleted when it is closed."""
+
+    def __init__(self, directory: str | None = None):
+        self._file: IO[bytes] = tempfile.TemporaryFile(dir=directory)
+        self._frame: List[Any] = []
+        self.count = 0
+
+    def write(self, value: Any):
+        self._frame.append(value)
+        self.count += 1
+        if len(self._frame) >= FRAME_SIZE:
+            self._flush()
+
+    def write_all(self, values: Iterable[Any]):
+        for value in values:
+            self.write(value)
+
+    def _flush(self):
+        if self._frame:
+            pickle.dump(self._frame, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+            self._frame = []
+
+    def __iter__(self) -> Iterator[Any]:
+        self._flush()
+        position = 0
+        while True:
+            # each reader keeps its own position, so several readers can be interleaved
+            self._file.seek(position)
+            try:
+                frame = pickle.load(self._file)
+            except EOFError:
+                return
+            position = self._file.tell()
+            yield from frame
+
+    def close(self):
+        self._file.close()
+
+
+def runs(values: Iterable[X], memory_limit: int) -> Iterator[List[X]]:
+    """Split `values` into consecutive lists of items whose estimated size is at most
+    `memory_limit` bytes. Every list has at least one item."""
+    if memory_limit < 1:
+        raise ValueError("`memory_limit` must be a positive value")
+    run: List[X] = []
+    size = 0
+    for value in values:
+        # the size of the item and of its slot in the list
+        value_size = sizeof(value) + 8
+        if run and size + value_size > memory_limit:
+            yield run
+            run, size = [], 0
+        run.append(value)
+        size += value_size
+    if run:
+        yield run
+
+
+def _merge_files(
+    files: List[SpillFile],
+    key: Callable[[X], Any] | None,
+    reverse: bool,
+    directory: str | None,
+) -> List[SpillFile]:
+    """Merge groups of `MAX_MERGE` sorted files until at most `MAX_MERGE` are left."""
+    while len(files) > MAX_MERGE:
+        merged = []
+        for i in range(0, len(files), MAX_MERGE):
+            group = files[i:i + MAX_MERGE]
+            output = SpillFile(directory)
+            output.write_all(heapq.merge(*group, key=key, reverse=reverse))
+            for file in group:
+                file.close()
+            merged.append(output)
+        files = merged
+    return files
+
+
+def external_sort(
+    values: Iterable[X],
+    key: Callable[[X], Any] | None = None,
+    reverse: bool = False,
+    memory_limit: int = 2 ** 28,
+    directory: str | None = None,
+) -> Iterator[X]:
+    """Sort `values` holding about `memory_limit` bytes of items in memory at a time.
+
+    Runs of items that fit in `memory_limit` are sorted and spilled to temporary files in
+    `directory`, and the sorted runs are streamed back through a k-way merge. If the items
+    fit in a single run, nothing is written to disk. The sort is stable, like `sorted`."""
+    stats = memory.buffer("external_sort")
+    chunks = runs(memory.counted(values, stats), memory_limit)
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if second is None:
+        first.sort(key=key, reverse=reverse)
+        yield from first
+        return
+    files: List[SpillFile] = []
+    try:
+        for run in itertools.chain((first, second), chunks):
+            run.sort(key=key, reverse=reverse)
+            file = SpillFile(directory)
+            file.write_all(run)
+            files.append(file)
+            if stats is not None:
+                stats.release(run)
+            del run[:]
+        del first, second
+        files = _merge_files(files, key, reverse, directory)
+        # ties between runs go to the earlier run, which keeps the sort stable
+        yield from heapq.merge(*files, key=key, reverse=reverse)
+    finally:
+        for file in files:
+            file.close()
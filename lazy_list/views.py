@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterator, Sequence, Tuple, TypeVar, overload
+
+from lazy_list.plan import Stage
+from lazy_list.replay import ReplayBuffer
+
+X = TypeVar("X")
+Y = TypeVar("Y")
+
+
+class View(Sequence[X]):
+    """A read-only random-access view of a sequence, computed on access.
+    Views follow changes to the underlying sequence."""
+
+    _calls_function = False
+
+    def __init__(self, base: Sequence[Any]):
+        self._base = base
+        # `True` if items are computed by calling user functions, so they are worth buffering
+        self.computed = self._calls_function or is_computed(base)
+
+    def __len__(self) -> int:
+        return len(self._base)
+
+    @overload
+    def __getitem__(self, index: int) -> X:
+        pass
+
+    @overload
+    def __getitem__(self, index: slice) -> "View[X]":
+        pass
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SliceView(self, index)
+        return self._item(index)
+
+    def _item(self, index: int) -> X:
+        raise NotImplementedError
+
+
+class MappedView(View[Y]):
+    """`map(function, base)` with random access."""
+
+    _calls_function = True
+
+    def __init__(self, base: Sequence[X], function: Callable[[X], Y]):
+        super().__init__(base)
+        self._function = function
+
+    def __iter__(self) -> Iterator[Y]:
+        return map(self._function, self._base)
+
+    def _item(self, index: int) -> Y:
+        return self._function(self._base[index])
+
+
+class EnumeratedView(View[Tuple[int, X]]):
+    """`enumerate(base)` with random access."""
+
+    def __iter__(self) -> Iterator[Tuple[int, X]]:
+        return enumerate(self._base)
+
+    def _item(self, index: int) -> Tuple[int, X]:
+        value = self._base[index]
+        return (index if index >= 0 else index + len(self._base)), value
+
+
+class SliceView(View[X]):
+    """`base[bounds]` without copying. Any bounds are supported, including negative ones."""
+
+    def __init__(self, base: Sequence[X], bounds: slice):
+        super().__init__(base)
+        self._bounds = bounds
+
+    @property
+    def indices(self) -> range:
+        return range(len(self._base))[self._bounds]
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[X]:
+        return map(self._base.__getitem__, self.indices)
+
+    def _item(self, index: int) -> X:
+        return self._base[self.indices[index]]
+
+
+class BufferedView(Sequence[X]):
+    """The first `length` items of a replay buffer with random access. Unlike views, it does not
+    follow changes to the sequence the items were computed from: each item is computed once,
+    when it is pulled into the buffer."""
+
+    def __init__(self, buffer: ReplayBuffer[X], length: int):
+        self._buffer = buffer
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[X]:
+        return iter(self._buffer)
+
+    @overload
+    def __getitem__(self, index: int) -> X:
+        pass
+
+    @overload
+    def __getitem__(self, index: slice) -> "View[X]":
+        pass
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SliceView(self, index)
+        return self._buffer.item(range(self._length)[index])
+
+
+def is_computed(values: Sequence[Any]) -> bool:
+    """Whether accessing items of `values` calls user functions."""
+    return isinstance(values, View) and values.computed
+
+
+def apply(view: Sequence[Any] | None, stages: Tuple[Stage, ...]) -> Sequence[Any] | None:
+    """The view of the output of a run of stages over `view`, or `None` if one of the stages
+    does not preserve random access."""
+    for stage in stages:
+        if view is None:
+            return None
+        if stage.kind == "map":
+            view = MappedView(view, stage.argument)
+        elif stage.kind == "enumerate":
+            view = EnumeratedView(view)
+        elif stage.kind == "slice":
+            view = SliceView(view, stage.argument)
+        elif stage.kind == "reverse":
+            view = SliceView(view, slice(None, None, -1))
+            if stage.argument is not None:
+                view = SliceView(view, slice(0, stage.argument))
+        else:
+            view = None
+    return view
@@ -0,0 +1,40 @@
+import random
+from collections import Counter
+
+import pytest
+
+from lazy_list import aggregate
+
+
+def test_hash_aggregate_in_memory():
+    result = list(aggregate.hash_aggregate("abcab", lambda x: x, aggregate.COUNT, memory_limit=2 ** 20))
+    assert result == [("a", 2), ("b", 2), ("c", 1)]
+
+
+def test_hash_aggregate_spills():
+    values = [random.Random(i).randrange(500) for i in range(5000)]
+    result = dict(aggregate.hash_aggregate(values, lambda x: x, aggregate.COUNT, memory_limit=5000))
+    assert result == Counter(values)
+
+
+def test_hash_aggregate_keeps_order_of_reduction():
+    # subtraction is not associative, so items must be folded from left to right
+    values = list(range(3000))
+    aggregation = aggregate.reduction(lambda a, b: a - b)
+    result = dict(aggregate.hash_aggregate(values, lambda x: x % 100, aggregation, memory_limit=3000))
+    expected = {}
+    for value in values:
+        expected[value % 100] = expected[value % 100] - value if value % 100 in expected else value
+    assert result == expected
+
+
+def test_hash_aggregate_groups(monkeypatch):
+    monkeypatch.setattr(aggregate, "MAX_DEPTH", 2)
+    values = list(range(2000))
+    result = dict(aggregate.hash_aggregate(values, lambda x: x % 3, aggregate.grouping(tuple), memory_limit=1000))
+    assert result == {k: tuple(range(k, 2000, 3)) for k in range(3)}
+
+
+def test_hash_aggregate_memory_limit():
+    with pytest.raises(ValueError):
+        aggregate.hash_aggregate([], lambda x: x, aggregate.COUNT, memory_limit=0)
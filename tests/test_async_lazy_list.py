@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+
+from lazy_list import AsyncLazyList, LazyList
+
+
+async def agen(n):
+    for i in range(n):
+        await asyncio.sleep(0)
+        yield i
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_async_lazy_list_str():
+    _list = AsyncLazyList(agen(3))
+    assert str(_list) == "AsyncLazyList(...)"
+    assert repr(_list) == "AsyncLazyList(...)"
+
+
+def test_async_lazy_list_to_list():
+    assert run(AsyncLazyList(agen(4)).to_list()) == [0, 1, 2, 3]
+    assert run(AsyncLazyList([1, 2]).to_list()) == [1, 2]
+
+
+def test_async_lazy_list_map_filter():
+    async def double(x):
+        await asyncio.sleep(0)
+        return x * 2
+
+    result = AsyncLazyList(agen(10)).map(double).filter(lambda x: x % 3).map(str)
+    assert run(result.to_list()) == ["2", "4", "8", "10", "14", "16"]
+
+
+def test_async_lazy_list_filter_none():
+    assert run(AsyncLazyList([0, 1, None, 2]).filter().to_list()) == [1, 2]
+
+
+def test_async_lazy_list_take_partition_unique():
+    result = AsyncLazyList([1, 1, 2, 3, 2, 4, 5]).unique().take(4).partition_all(3)
+    assert run(result.to_list()) == [(1, 2, 3), (4,)]
+
+
+def test_async_lazy_list_amap_concurrency():
+    running = 0
+    peak = 0
+
+    async def work(x):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 * (5 - x % 5))
+        running -= 1
+        return x
+
+    result = run(AsyncLazyList(agen(20)).amap(work, concurrency=4).to_list())
+    assert result == list(range(20))
+    assert peak == 4
+
+
+def test_async_lazy_list_iterated_once():
+    _list = AsyncLazyList(agen(3))
+    run(_list.to_list())
+    with pytest.raises(RuntimeError):
+        run(_list.to_list())
+
+
+def test_async_lazy_list_from_sync():
+    def slow():
+        for i in range(5):
+            time.sleep(0.001)
+            yield i
+
+    assert run(AsyncLazyList.from_sync(slow(), chunksize=2).map(lambda x: x + 1).to_list()) == [1, 2, 3, 4, 5]
+    assert run(LazyList(range(3)).to_async().to_list()) == [0, 1, 2]
+
+
+def test_async_lazy_list_to_lazy():
+    result = AsyncLazyList(agen(100)).map(lambda x: x * 2).to_lazy(buffer_size=4)
+    assert isinstance(result, LazyList)
+    assert result.take(3).to_list() == [0, 2, 4]
+
+
+def test_async_lazy_list_to_lazy_raises():
+    async def failing():
+        yield 1
+        raise ZeroDivisionError()
+
+    result = AsyncLazyList(failing()).to_lazy()
+    with pytest.raises(ZeroDivisionError):
+        result.to_list()
@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+from lazy_list.background import iterate_in_thread
+
+
+def test_iterate_in_thread():
+    def produce(emit):
+        for i in range(10):
+            if not emit(i):
+                return
+
+    assert list(iterate_in_thread(produce, maxsize=2)) == list(range(10))
+
+
+def test_iterate_in_thread_raises():
+    def produce(emit):
+        emit(1)
+        raise KeyError("boom")
+
+    items = iterate_in_thread(produce)
+    assert next(items) == 1
+    with pytest.raises(KeyError):
+        next(items)
+
+
+def test_iterate_in_thread_stops_producer():
+    stopped = threading.Event()
+
+    def produce(emit):
+        i = 0
+        while emit(i):
+            i += 1
+        stopped.set()
+
+    items = iterate_in_thread(produce, maxsize=3)
+    assert next(items) == 0
+    items.close()
+    assert stopped.is_set()
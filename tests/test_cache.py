@@ -0,0 +1,55 @@
+import pytest
+
+from lazy_list.cache import CacheInfo, ChunkCache
+
+
+def test_chunk_cache_replays():
+    opened = []
+
+    def upstream():
+        opened.append(1)
+        return iter(range(10))
+
+    store = ChunkCache(upstream, chunksize=3)
+    assert list(store) == list(range(10))
+    assert list(store) == list(range(10))
+    assert len(opened) == 1
+    assert store.info() == CacheInfo(hits=4, misses=4, evictions=0, items=10, bytes=0)
+
+
+def test_chunk_cache_evicts_least_recently_used():
+    store = ChunkCache(lambda: iter(range(10)), chunksize=2, max_items=4)
+    assert list(store) == list(range(10))
+    info = store.info()
+    assert info.items == 4
+    assert info.evictions == 3
+    assert list(store) == list(range(10))
+    assert store.info().items == 4
+
+
+def test_chunk_cache_recomputes_from_upstream():
+    calls = []
+
+    def upstream():
+        return map(lambda x: calls.append(x) or x, range(6))
+
+    store = ChunkCache(upstream, chunksize=2, max_items=2)
+    assert list(store) == list(range(6))
+    assert calls == list(range(6))
+    calls.clear()
+    assert list(store) == list(range(6))
+    # the evicted chunks are read again in a single pass over the upstream
+    assert calls == list(range(6))
+
+
+def test_chunk_cache_max_bytes():
+    store = ChunkCache(lambda: iter(["x" * 1000] * 10), chunksize=1, max_bytes=2500)
+    assert len(list(store)) == 10
+    info = store.info()
+    assert info.items == 2
+    assert 2000 <= info.bytes <= 2500
+
+
+def test_chunk_cache_chunksize():
+    with pytest.raises(ValueError):
+        ChunkCache(lambda: iter(()), chunksize=0)
@@ -0,0 +1,33 @@
+import pytest
+
+from lazy_list import dedup
+
+
+def test_exact():
+    assert list(dedup.exact([3, 1, 3, 2, 1])) == [3, 1, 2]
+    assert list(dedup.exact(["a", "B", "A"], key=str.lower)) == ["a", "B"]
+
+
+def test_window():
+    assert list(dedup.window([1, 2, 1, 3, 4, 1, 2], 2)) == [1, 2, 3, 4, 1, 2]
+    # a key that keeps occurring stays in the window
+    assert list(dedup.window([1, 2, 1, 3, 1, 4, 1], 2)) == [1, 2, 3, 4]
+    assert list(dedup.window(["a", "A", "b"], 1, key=str.lower)) == ["a", "b"]
+    with pytest.raises(ValueError):
+        dedup.window([], 0)
+
+
+def test_bloom():
+    values = list(range(10_000)) * 2
+    result = list(dedup.bloom(values, capacity=10_000, error_rate=0.01))
+    assert len(set(result)) == len(result)
+    assert len(result) > 10_000 * 0.97
+    with pytest.raises(ValueError):
+        dedup.bloom([], error_rate=0)
+    # keys are compared like in `exact`: equal keys are duplicates whatever their type
+    assert list(dedup.bloom([1, 1.0, True, frozenset("ab"), frozenset("ba")], capacity=100)) == [1, frozenset("ab")]
+
+
+def test_adjacent():
+    assert list(dedup.adjacent([1, 1, 2, 3, 3, 1])) == [1, 2, 3, 1]
+    assert list(dedup.adjacent(["a", "A", "b"], key=str.lower)) == ["a", "b"]
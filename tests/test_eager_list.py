@@ -60,6 +60,14 @@ def test_eager_list_sort():
         assert i <= j
 
 
+def test_eager_list_sort_memory_limit():
+    random.seed(12)
+    _list: EagerList[int] = EagerList(random.choices(range(20), k=500))
+    result = _list.sort(reverse=True, memory_limit=500)
+    assert isinstance(result, LazyList)
+    assert result.to_list() == sorted(_list, reverse=True)
+
+
 def test_eager_list_append():
     _list: EagerList[int] = EagerList(range(10))
     result = _list.append(100)
@@ -611,3 +619,18 @@ def test_eager_list_contains():
     for element in elements:
         assert element in _list
     assert not _list.contains(8)
+
+
+def test_eager_list_sketches():
+    _list = EagerList(range(1000)).map(lambda x: x % 10)
+    assert _list.approx_n_unique() == 10
+    assert _list.heavy_hitters(3, error=0.01) == {0: 100, 1: 100, 2: 100}
+    assert _list.approx_count(3) == 100
+
+
+def test_eager_list_joins():
+    _list = EagerList([1, 2, 3])
+    result = _list.hash_join([2, 3, 4], lambda x: x)
+    assert isinstance(result, LazyList)
+    assert result.to_list() == [(2, 2), (3, 3)]
+    assert _list.merge_join([2, 3, 4], lambda x: x, how="outer").to_list() == [(1, None), (2, 2), (3, 3), (None, 4)]
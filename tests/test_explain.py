@@ -0,0 +1,32 @@
+import itertools
+
+from lazy_list import explain
+from lazy_list.plan import Stage
+
+
+def test_source():
+    assert explain.source([1, 2]).bounded
+    assert explain.source(iter([1, 2])).detail == "list_iterator, about 2 items"
+    assert explain.source(itertools.count()).detail == "count, infinite"
+    assert explain.source(itertools.repeat(1)).detail == "repeat, infinite"
+    assert not explain.source(x for x in []).bounded
+
+
+def test_stages():
+    source = explain.source(itertools.count())
+    node = explain.stages(source, (Stage("map", str), Stage("sort", (len, False, 5))))
+    assert (node.name, node.detail, node.memory, node.bounded) == ("sort", "key=len, limit=5", explain.OK, True)
+    assert node.inputs[0].name == "map"
+    assert explain.stages(source, (Stage("slice", slice(0, 3, 1)),)).bounded
+    assert explain.stages(source, (Stage("reverse", None),)).memory == explain.ON
+
+
+def test_render_warns_on_unbounded_barriers():
+    source = explain.source(itertools.count())
+    text = explain.render(explain.stages(source, (Stage("sort", (None, True, None)),)))
+    assert text.splitlines()[0].startswith("sort(reverse=True)")
+    assert "! holds every item" in text
+    bounded = explain.stages(explain.source(range(3)), (Stage("sort", (None, False, None)),))
+    assert "!" not in explain.render(bounded)
+    assert explain.render(bounded, terminal="to_list").splitlines()[0].split() == ["to_list", "O(n)"]
+    assert "replay buffer" in explain.render(bounded, buffered=True)
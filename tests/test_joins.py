@@ -0,0 +1,46 @@
+import pytest
+
+from lazy_list import joins
+
+LEFT = [(1, "a"), (2, "b"), (2, "c"), (4, "d")]
+RIGHT = [(0, "w"), (2, "x"), (2, "y"), (4, "z")]
+
+
+def first(pair):
+    return pair[0]
+
+
+@pytest.mark.parametrize("build_left", [False, True])
+def test_hash_join(build_left):
+    def join(how):
+        return sorted(joins.hash_join(LEFT, RIGHT, first, first, how, build_left), key=repr)
+
+    inner = [(x, y) for x in LEFT for y in RIGHT if x[0] == y[0]]
+    assert join("inner") == sorted(inner, key=repr)
+    assert join("left") == sorted(inner + [((1, "a"), None)], key=repr)
+    assert join("outer") == sorted(inner + [((1, "a"), None), (None, (0, "w"))], key=repr)
+
+
+def test_hash_join_order():
+    pairs = list(joins.hash_join(LEFT, RIGHT, first, first, "left"))
+    assert [x for x, _ in pairs] == [(1, "a"), (2, "b"), (2, "b"), (2, "c"), (2, "c"), (4, "d")]
+    with pytest.raises(ValueError):
+        list(joins.hash_join(LEFT, RIGHT, first, first, "cross"))
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "outer"])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_merge_join(how, reverse):
+    left, right = sorted(LEFT, reverse=reverse), sorted(RIGHT, reverse=reverse)
+    expected = sorted(joins.hash_join(left, right, first, first, how), key=repr)
+    result = list(joins.merge_join(left, right, first, first, how, reverse))
+    assert sorted(result, key=repr) == expected
+    keys = [(x or y)[0] for x, y in result]
+    assert keys == sorted(keys, reverse=reverse)
+
+
+def test_merge_join_unsorted():
+    with pytest.raises(ValueError):
+        list(joins.merge_join([1, 3, 2], [1, 2, 3], int, int))
+    with pytest.raises(ValueError):
+        list(joins.merge_join([1, 2, 3], [3, 2], int, int, "outer"))
@@ -1,8 +1,14 @@
+import io
+import itertools
+import operator
 import random
+import threading
 from collections import deque, namedtuple
+from operator import itemgetter
 
 import pytest
 
+import lazy_list
 from lazy_list import EagerList, LazyList
 
 
@@ -143,6 +149,9 @@ def test_lazy_list_insert():
     assert result.at(5) == 111
     c.pop(5)
     assert c == _list
+    assert LazyList(iter(range(3))).insert(10, 111).to_list() == [0, 1, 2, 111]
+    with pytest.raises(ValueError):
+        _list.insert(-1, 111)
 
 
 def test_lazy_list_pop():
@@ -571,3 +580,575 @@ def test_lazy_list_to_set():
 def test_lazy_list_to_deque():
     _list = LazyList([1, 2, 3, 4, 5])
     assert _list.to_deque() == deque([1, 2, 3, 4, 5])
+
+
+def test_lazy_list_repeated_iteration():
+    _list = LazyList(iter(range(1000)))
+    for _ in range(100):
+        assert sum(_list) == sum(range(1000))
+    iterators = [iter(_list) for _ in range(3)]
+    assert [next(it) for it in iterators] == [0, 0, 0]
+
+
+def test_lazy_list_once():
+    _list = LazyList.once(iter(range(5)))
+    result = _list.map(lambda x: x * 2).filter(lambda x: x > 2)
+    assert not result.replayable
+    assert result.to_list() == [4, 6, 8]
+
+
+def test_lazy_list_once_second_iteration():
+    _list = LazyList(range(5), replayable=False)
+    assert _list.to_list() == [0, 1, 2, 3, 4]
+    with pytest.raises(RuntimeError):
+        _list.to_list()
+
+
+def test_lazy_list_fused_stages():
+    Row = namedtuple("Row", ["x"])
+    _list = LazyList(iter([{"x": i} for i in range(10)]))
+    result = (
+        _list.get_item("x")
+        .filter(lambda x: x % 2 == 0)
+        .map(Row)
+        .get_attr("x")
+        .filterfalse(lambda x: x == 4)
+        .dropwhile(lambda x: x < 2)
+        .takewhile(lambda x: x < 8)
+    )
+    assert result.to_list() == [2, 6]
+    assert result.to_list() == [2, 6]
+
+
+def test_lazy_list_fused_stages_branch():
+    calls = []
+
+    def record(x):
+        calls.append(x)
+        return x
+
+    _list = LazyList(range(3))
+    mapped = _list.map(record)
+    assert mapped.to_list() == [0, 1, 2]
+    assert mapped.map(lambda x: x + 1).to_list() == [1, 2, 3]
+    assert mapped.filter(lambda x: x > 0).to_list() == [1, 2]
+    assert calls == [0, 1, 2]
+
+
+def test_lazy_list_fused_stages_branch_derived_first():
+    calls = []
+
+    def record(x):
+        calls.append(x)
+        return x
+
+    mapped = LazyList(iter(range(5))).map(record)
+    branch = mapped.filter(lambda x: x % 2)
+    assert mapped.to_list() == [0, 1, 2, 3, 4]
+    assert branch.to_list() == [1, 3]
+    assert calls == [0, 1, 2, 3, 4]
+
+    mapped = LazyList(iter(range(5))).map(lambda _: random.random())
+    branch = mapped.filter(lambda x: True)
+    values = branch.to_list()
+    assert mapped.to_list() == values
+
+
+def test_lazy_list_fused_stages_skip_unreferenced_lists():
+    calls = []
+
+    def record(x):
+        calls.append(x)
+        return x
+
+    with lazy_list.track_memory() as m:
+        values = LazyList(iter(range(5))).map(record).filter(lambda x: x % 2).map(str).to_list()
+    assert values == ["1", "3"]
+    assert calls == [0, 1, 2, 3, 4]
+    # only the last list buffers its items
+    assert [stats.peak_items for stats in m.buffers] == [2]
+
+
+def test_lazy_list_referenced_parent_keeps_its_buffer():
+    with lazy_list.track_memory() as m:
+        source = LazyList(iter(range(5)))
+        assert source.map(str).to_list() == ["0", "1", "2", "3", "4"]
+        assert source.to_list() == [0, 1, 2, 3, 4]
+    assert [stats.peak_items for stats in m.buffers] == [5, 5]
+
+
+def test_lazy_list_parent_shared_by_children_stays_replayable():
+    source = LazyList(iter(range(3)))
+    strings = source.map(str)
+    doubles = source.map(lambda x: x * 2)
+    del source
+    assert strings.to_list() == ["0", "1", "2"]
+    assert doubles.to_list() == [0, 2, 4]
+
+
+def test_lazy_list_compiled():
+    _list = LazyList(iter(range(20))).compiled()
+    result = _list.map(lambda x: x * 3).filter(lambda x: x % 2).enumerate().slice(1, 6, 2).get_item(1)
+    assert result.to_list() == [9, 21, 33]
+    assert result.take(1).to_list() == [9]
+
+
+def test_lazy_list_sort_is_deferred():
+    pulled = []
+
+    def source():
+        for i in [3, 1, 2]:
+            pulled.append(i)
+            yield i
+
+    result = LazyList(source()).sort()
+    assert pulled == []
+    assert result.to_list() == [1, 2, 3]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_lazy_list_sort_take(reverse):
+    values = [(i % 7, i) for i in range(50)]
+    _list = LazyList(values)
+    key = itemgetter(0)
+    expected = sorted(values, key=key, reverse=reverse)
+    assert _list.sort(key=key, reverse=reverse).take(10).to_list() == expected[:10]
+    assert _list.sort(key=key, reverse=reverse).slice(2, 5).to_list() == expected[2:5]
+    assert _list.sort(key=key, reverse=reverse).first == expected[0]
+
+
+def test_lazy_list_sort_limit_of_referenced_sort(monkeypatch):
+    calls = []
+    nsmallest = lazy_list.plan.heapq.nsmallest
+
+    def spy(n, *args, **kwargs):
+        calls.append(n)
+        return nsmallest(n, *args, **kwargs)
+
+    monkeypatch.setattr(lazy_list.plan.heapq, "nsmallest", spy)
+    with lazy_list.track_memory() as m:
+        assert LazyList(iter(range(1000))).sort(reverse=True).first == 999
+        ordered = LazyList(iter(range(1000, 0, -1))).sort()
+        assert ordered.take(3).to_list() == [1, 2, 3]
+        assert m.peak("sort") == 0
+        assert ordered.to_list() == list(range(1, 1001))
+        # once the sorted items are buffered, they are read from the buffer
+        assert ordered.take(2).to_list() == [1, 2]
+    assert calls == [3]
+    assert [stats.peak_items for stats in m.buffers if stats.name == "sort"] == [1000]
+
+
+def test_lazy_list_sort_first_empty():
+    with pytest.raises(StopIteration):
+        LazyList([]).sort().first
+
+
+def test_lazy_list_reverse_take():
+    _list = LazyList(iter(range(10)))
+    assert _list.reverse().take(3).to_list() == [9, 8, 7]
+    assert _list.reverse().first == 9
+    assert _list.reverse().to_list() == list(range(9, -1, -1))
+
+
+def test_lazy_list_known_length():
+    _list = LazyList([1, 2, 3, 4, 5])
+    assert _list.known_length == 5
+    assert _list.map(str).enumerate().sort().known_length == 5
+    assert _list.slice(1, None, 2).known_length == 2
+    assert _list.take(10).known_length == 5
+    assert _list.append(6).zip(range(10)).known_length == 6
+    assert _list.fixed(0).extend([1, 2]).known_length == 7
+    assert _list.partition_all(2).known_length == 3
+    assert _list.filter(lambda x: x > 2).known_length is None
+    assert LazyList(iter([1, 2])).known_length is None
+
+
+def test_lazy_list_length_hint():
+    assert operator.length_hint(LazyList(range(5)).map(str)) == 5
+    assert operator.length_hint(LazyList(iter(range(5)))) == 5
+    assert operator.length_hint(LazyList(x for x in range(5))) == 0
+
+
+def test_lazy_list_get_length_eagerly_counts_once():
+    _list = LazyList(x for x in range(5))
+    assert _list.get_length_eagerly() == 5
+    assert _list.known_length == 5
+    assert LazyList.once(x for x in range(5)).get_length_eagerly() == 5
+
+
+def test_lazy_list_terminals_single_pass():
+    def source():
+        yield from [1, 2, 4, 8, 2, 16]
+
+    assert LazyList.once(source()).count(2) == 2
+    assert LazyList.once(source()).find_first_index(lambda x: x > 3) == 2
+    assert LazyList.once(source()).find_last(lambda x: x < 10) == 2
+    assert LazyList.once(source()).find_last_index(lambda x: x < 10) == 4
+    assert not LazyList.once(source()).is_distinct()
+    assert LazyList.once(iter(range(5))).is_distinct()
+
+
+def test_lazy_list_is_distinct_stops_early():
+    _list = LazyList.once(itertools.chain([1, 1], itertools.count()))
+    assert not _list.is_distinct()
+
+
+def test_lazy_list_sequence_random_access():
+    calls = []
+
+    def record(x):
+        calls.append(x)
+        return x * 2
+
+    _list = LazyList(range(1000)).map(record)
+    assert _list.nth(500) == 1000
+    assert _list.at(-1) == 1998
+    assert _list.last == 1998
+    assert _list.tail(2).to_list() == [1996, 1998]
+    assert _list.reverse().take(2).to_list() == [1998, 1996]
+    assert _list.slice(10, 0, -4).to_list() == [20, 12, 4]
+    assert _list.get_length_eagerly() == 1000
+    # mapped items are computed once, in order, into the replay buffer
+    assert calls == list(range(1000))
+    assert LazyList(range(10**12)).enumerate().slice(None, None, -2).nth(1) == (10**12 - 3, 10**12 - 3)
+
+
+def test_lazy_list_sequence_random_access_is_consistent():
+    rng = random.Random(0)
+    mapped = LazyList(range(5)).map(lambda _: rng.random())
+    assert mapped.nth(0) == mapped.nth(0)
+    assert mapped.take(2).to_list() == mapped.to_list()[:2]
+    assert mapped.last == mapped.to_list()[-1]
+    with pytest.raises(StopIteration):
+        mapped.nth(5)
+    with pytest.raises(StopIteration):
+        LazyList(range(5)).nth(5)
+
+
+def test_lazy_list_sequence_branches_call_once():
+    calls = []
+
+    def record(x):
+        calls.append(x)
+        return x
+
+    mapped = LazyList(range(10)).map(record)
+    assert mapped.pop(1).last == 9
+    assert mapped.to_list() == list(range(10))
+    assert mapped.enumerate().nth(3) == (3, 3)
+    assert calls == list(range(10))
+
+
+def test_lazy_list_sequence_follows_source():
+    values = [1, 2, 3]
+    _list = EagerList(values).lazy
+    assert _list.known_length == 3
+    assert _list.reverse().to_list() == [3, 2, 1]
+    _list = LazyList(values)
+    values.append(4)
+    assert _list.known_length == 4
+    assert _list.to_list() == [1, 2, 3, 4]
+
+
+def test_lazy_list_buffered_view_is_frozen():
+    calls = []
+
+    def record(x):
+        calls.append(x)
+        return x * 10
+
+    values = [1, 2, 3]
+    _list = LazyList(values).map(record)
+    assert _list.to_list() == [10, 20, 30]
+    values.append(4)
+    values[0] = 5
+    assert _list.to_list() == [10, 20, 30]
+    assert _list.known_length == _list.get_length_eagerly() == 3
+    assert (_list.nth(0), _list.last, _list.at(-2)) == (10, 30, 20)
+    assert _list.slice(-2).to_list() == [20, 30]
+    assert calls == [1, 2, 3]
+
+
+def test_lazy_list_negative_slice_requires_sequence():
+    with pytest.raises(ValueError):
+        LazyList(iter(range(5))).slice(None, None, -1)
+    assert LazyList(range(5)).slice(None, None, -1).filter(lambda x: x % 2).to_list() == [3, 1]
+
+
+def test_lazy_list_random_sample_without_replacement():
+    _list = LazyList(iter(range(1000)))
+    result = _list.random_sample(10, random_state=1, replace=False)
+    assert len(result.to_set()) == 10
+    assert result.to_list() == result.to_list()
+    assert result.to_list() == _list.random_sample(10, random_state=1, replace=False).to_list()
+
+
+def test_lazy_list_random_sample_weights():
+    _list = LazyList(["a", "b", "c"])
+    assert _list.random_sample(5, weights=[0, 1, 0]).to_list() == ["b"] * 5
+    assert _list.random_sample(1, weights=lambda x: x == "c", replace=False).to_list() == ["c"]
+
+
+def test_lazy_list_random_sample_keeps_global_state():
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+    LazyList(range(10)).random_sample(3, random_state=1).to_list()
+    assert random.random() == expected
+
+
+def test_lazy_list_par_map():
+    _list = LazyList(iter(range(50)))
+    result = _list.par_map(lambda x: x + 1, workers=3, chunksize=4)
+    assert result.to_list() == list(range(1, 51))
+    assert LazyList(range(10)).par_map(str, workers=2).known_length == 10
+    unordered = _list.par_map(lambda x: x + 1, workers=3, ordered=False)
+    assert sorted(unordered.to_list()) == list(range(1, 51))
+    with pytest.raises(ValueError):
+        _list.par_map(str, executor="bogus")
+    with pytest.raises(ValueError):
+        _list.par_map(str, chunksize=0)
+
+
+def test_lazy_list_map_batches():
+    sizes = []
+
+    def double(batch):
+        sizes.append(len(batch))
+        return [x * 2 for x in batch]
+
+    result = LazyList(range(10)).map_batches(double, 4)
+    assert result.known_length == 10
+    assert result.to_list() == [x * 2 for x in range(10)]
+    assert sizes == [4, 4, 2]
+
+
+def test_lazy_list_map_batches_batch_type():
+    from lazy_list.num_list import NumList
+
+    def scale(batch):
+        assert isinstance(batch, NumList)
+        return batch.div(batch.max())
+
+    result = LazyList([1, 2, 4, 10, 5]).map_batches(scale, 3, batch_type=NumList)
+    assert result.to_list() == [0.25, 0.5, 1.0, 1.0, 0.5]
+
+
+def test_lazy_list_map_batches_wrong_length():
+    with pytest.raises(ValueError):
+        LazyList(range(5)).map_batches(lambda batch: batch[:1], 2).to_list()
+
+
+def test_lazy_list_prefetch():
+    _list = LazyList(iter(range(100)))
+    assert _list.prefetch(4).to_list() == list(range(100))
+    result = _list.prefetch(2, chunksize=8)
+    assert result.known_length is None
+    assert result.to_list() == list(range(100))
+    assert LazyList(range(5)).prefetch(1).known_length == 5
+
+
+def test_lazy_list_prefetch_raises():
+    def source():
+        yield 1
+        raise KeyError("boom")
+
+    with pytest.raises(KeyError):
+        LazyList(source()).prefetch(2).to_list()
+
+
+def test_lazy_list_prefetch_stops_early():
+    pulled = []
+
+    def source():
+        for i in itertools.count():
+            pulled.append(i)
+            yield i
+
+    assert LazyList(source()).prefetch(3).take(2).to_list() == [0, 1]
+    count = len(pulled)
+    assert count < 10
+    assert not any(thread.name == "lazy_list-producer" for thread in threading.enumerate())
+
+
+def test_lazy_list_cache():
+    calls = []
+
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    _list = LazyList(range(10)).map(square).cache()
+    assert _list.known_length == 10
+    assert _list.to_list() == [x * x for x in range(10)]
+    assert _list.filter(lambda x: x % 2).to_list() == [1, 9, 25, 49, 81]
+    assert len(calls) == 10
+    assert _list.cache_info().misses == 1
+    assert LazyList(range(3)).cache_info() is None
+
+
+def test_lazy_list_cache_evicts():
+    calls = []
+
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    _list = LazyList(iter(range(100))).map(square).cache(max_items=20, chunksize=10)
+    assert _list.to_list() == [x * x for x in range(100)]
+    assert _list.take(5).to_list() == [0, 1, 4, 9, 16]
+    info = _list.cache_info()
+    assert info.items <= 20
+    assert info.evictions > 0
+    assert len(calls) == 110
+    assert _list.take(5).to_list() == [0, 1, 4, 9, 16]
+    assert len(calls) == 110
+
+
+def test_lazy_list_cache_one_shot():
+    with pytest.raises(ValueError):
+        LazyList.once(range(3)).cache()
+
+
+def test_lazy_list_sort_memory_limit():
+    values = [random.Random(i).randrange(100) for i in range(1000)]
+    _list = LazyList(iter(values)).sort(memory_limit=1000)
+    assert _list.to_list() == sorted(values)
+    assert _list.to_list() == sorted(values)
+    assert LazyList(values).sort(key=lambda x: -x, reverse=True, memory_limit=1000).to_list() == sorted(values)
+    assert LazyList(values).sort(memory_limit=1000).known_length == 1000
+
+
+def test_lazy_list_aggregate_memory_limit():
+    values = [random.Random(i).randrange(300) for i in range(3000)]
+    _list = LazyList(iter(values))
+    assert dict(_list.frequencies(memory_limit=3000)) == _list.frequencies()
+    assert dict(_list.reduce_by(lambda x: x % 50, max, memory_limit=2000)) == _list.reduce_by(lambda x: x % 50, max)
+    groups = _list.group_by(lambda x: x % 50, memory_limit=2000)
+    assert isinstance(groups, LazyList)
+    assert dict(groups) == _list.group_by(lambda x: x % 50)
+    assert LazyList(range(6)).group_by(lambda x: x % 2, memory_limit=2 ** 20).to_list() == [
+        (0, EagerList([0, 2, 4])),
+        (1, EagerList([1, 3, 5])),
+    ]
+
+
+def test_lazy_list_aggregate_workers():
+    values = [random.Random(i).randrange(30) for i in range(1000)]
+    _list = LazyList(iter(values))
+    assert _list.frequencies(workers=2, chunksize=100) == _list.frequencies()
+    assert _list.reduce_by(abs, operator.add, workers=2, chunksize=64) == _list.reduce_by(abs, operator.add)
+    groups = _list.group_by(lambda x: x % 7, workers=2, executor="thread", chunksize=50)
+    assert groups == _list.group_by(lambda x: x % 7)
+    with pytest.raises(ValueError):
+        _list.frequencies(memory_limit=100, workers=2)
+
+
+def test_lazy_list_sketches():
+    _list = LazyList(iter("abracadabra"))
+    assert _list.approx_n_unique() == 5
+    assert _list.heavy_hitters(1, error=0.1) == {"a": 5}
+    assert list(_list.heavy_hitters(2, error=0.1)) == ["a", "b"]
+    assert _list.approx_count("r") == 2
+    assert _list.approx_counts()["z"] == 0
+
+
+def test_lazy_list_unique_modes():
+    _list = LazyList([1, 2, 1, 3, 3, 1])
+    assert _list.unique().to_list() == [1, 2, 3]
+    assert _list.unique(window=1).to_list() == [1, 2, 1, 3, 1]
+    assert _list.unique(mode="window", window=2).to_list() == [1, 2, 3]
+    assert _list.unique(mode="bloom", capacity=100).to_list() == [1, 2, 3]
+    assert _list.unique(mode="sorted").to_list() == [1, 2, 1, 3, 1]
+    assert LazyList(["a", "A", "b"]).unique(key=str.lower).to_list() == ["a", "b"]
+    with pytest.raises(ValueError):
+        _list.unique(mode="window")
+    with pytest.raises(ValueError):
+        _list.unique(mode="fuzzy")
+
+
+def test_lazy_list_hash_join():
+    users = LazyList([(1, "ann"), (2, "bob"), (3, "cy")])
+    roles = [("admin", 1), ("dev", 1), ("ops", 4)]
+    assert users.hash_join(roles, itemgetter(0), itemgetter(1)).to_list() == [
+        ((1, "ann"), ("admin", 1)),
+        ((1, "ann"), ("dev", 1)),
+    ]
+    outer = users.hash_join(iter(roles), itemgetter(0), itemgetter(1), how="outer").to_list()
+    assert outer[-1] == (None, ("ops", 4))
+    assert ((3, "cy"), None) in outer
+    # the smaller side is built, and the larger one streamed
+    small = LazyList([(1, "ann")])
+    assert small.hash_join(roles, itemgetter(0), itemgetter(1)).map(itemgetter(1)).to_list() == roles[:2]
+    with pytest.raises(ValueError):
+        users.hash_join(roles, itemgetter(0), how="cross")
+
+
+def test_lazy_list_merge_join():
+    left = LazyList(iter(range(0, 10, 2)))
+    assert left.merge_join(range(0, 10, 3), lambda x: x).to_list() == [(0, 0), (6, 6)]
+    assert left.merge_join(range(0, 10, 3), lambda x: x, how="left").map(itemgetter(1)).to_list() == [
+        0,
+        None,
+        None,
+        6,
+        None,
+    ]
+
+
+def test_lazy_list_merge_sorted():
+    result = LazyList([1, 4, 7]).merge_sorted([2, 5], iter([3, 6]))
+    assert result.known_length is None
+    assert result.to_list() == [1, 2, 3, 4, 5, 6, 7]
+    shards = [LazyList.once(sorted(random.Random(i).sample(range(100), 10), reverse=True)) for i in range(5)]
+    merged = shards[0].merge_sorted(*shards[1:], reverse=True).to_list()
+    assert merged == sorted(merged, reverse=True)
+    assert len(merged) == 50
+    pairs = LazyList([(1, "a"), (2, "a")]).merge_sorted([(1, "b"), (2, "b")], key=itemgetter(0))
+    assert pairs.known_length == 4
+    assert pairs.to_list() == [(1, "a"), (1, "b"), (2, "a"), (2, "b")]
+
+
+def test_lazy_list_explain():
+    output = io.StringIO()
+    LazyList.once(itertools.count()).map(str).sort().explain(file=output)
+    lines = output.getvalue().splitlines()
+    assert lines[0].startswith("sort") and "O(n)" in lines[0] and "!" in lines[0]
+    assert [line.split()[1] for line in lines[1:]] == ["map(str)", "source(count,"]
+
+    output = io.StringIO()
+    _list = LazyList(iter(range(100))).filter(None).sort().take(3).group_by(len, memory_limit=100)
+    _list.explain("to_list", file=output)
+    lines = output.getvalue().splitlines()
+    assert lines[0].split() == ["to_list", "O(n)"]
+    assert "group_by(memory_limit=100, spills to disk)" in lines[1]
+    assert "sort(limit=3)" in lines[3] and "O(k)" in lines[3]
+    assert "!" not in output.getvalue()
+    assert "replay buffer" in output.getvalue()
+
+
+def _explained(_list: LazyList) -> str:
+    output = io.StringIO()
+    _list.explain(file=output)
+    return output.getvalue()
+
+
+def test_lazy_list_explain_referenced_barrier():
+    ordered = LazyList(x for x in range(100)).sort()
+    top = ordered.take(3)
+    assert "sort(limit=3)" in _explained(top)
+    ordered.to_list()
+    # the sorted items are now read from the buffer of `ordered`
+    lines = _explained(top).splitlines()
+    assert lines[0].startswith("slice(:3)")
+    assert lines[1].split()[1:3] == ["sort", "O(n)"] and "!" in lines[1]
+
+
+def test_lazy_list_explain_secondary_inputs():
+    lines = _explained(LazyList(range(5)).zip(LazyList(x for x in range(5)).sort())).splitlines()
+    assert [line.split()[0] for line in lines[:4]] == ["zip", "└─", "└─", "└─"]
+    assert "source(range, 5 items)" in lines[1]
+    assert "sort" in lines[2] and "!" in lines[2]
+    assert "generator" in lines[3]
+    lines = _explained(LazyList(range(3)).extend([3], LazyList(range(4, 6)))).splitlines()
+    assert lines[0].startswith("extend") and "source(list, 1 items)" in lines[2] and "source(range" in lines[3]
@@ -0,0 +1,117 @@
+import warnings
+
+import pytest
+
+import lazy_list
+from lazy_list import LazyList, memory
+
+
+def test_track_memory_sort_and_replay():
+    with lazy_list.track_memory() as m:
+        a = LazyList(iter(range(100)))
+        top = a.sort(reverse=True).take(3).to_list()
+        assert top == [99, 98, 97]
+        assert a.sort().to_list() == list(range(100))
+    # the limited sort only keeps 3 items, in a heap that is not tracked
+    assert [stats.name for stats in m.buffers].count("sort") == 1
+    assert m.peak("replay") == 100
+    assert m.peak("sort") == 100
+    assert m.peak("group_by") == 0
+
+
+def test_track_memory_releases_freed_replay_buffers():
+    with lazy_list.track_memory(measure_bytes=True) as m:
+        a = LazyList(iter(range(1000)))
+        assert a.to_list() == list(range(1000))
+        (replay,) = m.buffers
+        assert replay.items == 1000
+        del a
+        result = LazyList(iter(range(100))).sort().to_list()
+    assert result == list(range(100))
+    assert (replay.items, replay.bytes, replay.peak_items) == (0, 0, 1000)
+    # the source of the sorted list is not buffered, as nothing else can iterate it
+    assert [(stats.name, stats.peak_items, stats.items) for stats in m.buffers[1:]] == [
+        ("sort", 100, 100),
+        ("replay", 100, 0),
+    ]
+
+
+def test_track_memory_bytes():
+    with lazy_list.track_memory(measure_bytes=True) as m:
+        LazyList(iter(range(10))).map(str).reverse().to_list()
+    (reverse,) = [stats for stats in m.buffers if stats.name == "reverse"]
+    assert reverse.peak_items == 10
+    assert reverse.peak_bytes == sum(memory.sizeof(str(i)) for i in range(10))
+    assert m.to_dict()["buffers"][reverse.index]["peak_bytes"] == reverse.peak_bytes
+
+
+def test_track_memory_group_by_and_cache():
+    with lazy_list.track_memory() as m:
+        groups = LazyList(range(10)).group_by(lambda x: x % 3)
+        cached = LazyList(range(50)).map(str).cache(max_items=20, chunksize=10)
+        cached.to_list()
+    assert groups[0] == [0, 3, 6, 9]
+    assert m.peak("group_by") == 10
+    (cache,) = [stats for stats in m.buffers if stats.name == "cache"]
+    assert cache.peak_items == 30
+    assert cache.items == cached.cache_info().items == 20
+
+
+def test_track_memory_cache_over_iterator():
+    with lazy_list.track_memory() as m:
+        cached = LazyList(range(50)).map(str).cache(max_items=20, chunksize=10)
+        assert cached.to_list() == cached.to_list()
+    assert m.peak("cache") == 30
+    assert m.peak("replay") == 0
+    with lazy_list.track_memory() as m:
+        cached = LazyList(iter(range(50))).map(str).cache(max_items=20, chunksize=10)
+        assert cached.to_list() == cached.to_list()
+    # the evicted chunks are computed again from the items of the iterator, kept in its replay buffer
+    assert m.peak("cache") == 30
+    assert m.peak("replay") == 50
+
+
+def test_track_memory_external_sort_runs():
+    with lazy_list.track_memory() as m:
+        result = LazyList(range(1000, 0, -1)).sort(memory_limit=2000).to_list()
+    assert result == list(range(1, 1001))
+    (runs,) = [stats for stats in m.buffers if stats.name == "external_sort"]
+    # a run is spilled once the item after it is pulled
+    assert 0 < runs.peak_items < 200
+    assert runs.items < 200
+
+
+def test_track_memory_warns_once():
+    with lazy_list.track_memory(limits={"sort": 10}) as m:
+        with pytest.warns(RuntimeWarning, match="sort buffer holds 11 items") as caught:
+            LazyList(range(20)).sort().to_list()
+    assert len([w for w in caught if "sort" in str(w.message)]) == 1
+    assert [stats.exceeded for stats in m.buffers if stats.name == "sort"] == [True]
+    assert "yes" in m.report()
+
+
+def test_track_memory_stage_limits_raise():
+    with lazy_list.track_memory(limits={"group_by": 5}, on_exceed="raise") as m:
+        assert LazyList(range(20)).sort().to_list() == list(range(20))
+        with pytest.raises(MemoryError, match="group_by"):
+            LazyList(range(20)).group_by(lambda x: x % 2)
+    assert m.peak("group_by") == 6
+
+
+def test_track_memory_max_bytes():
+    with lazy_list.track_memory(max_bytes=100, on_exceed="raise"):
+        with pytest.raises(MemoryError, match="bytes"):
+            LazyList(["x" * 50, "y" * 50, "z" * 50]).sort().to_list()
+
+
+def test_track_memory_is_scoped():
+    with lazy_list.track_memory() as m:
+        pass
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        LazyList(iter(range(10))).sort().to_list()
+    assert m.buffers == []
+    assert memory.buffer("sort") is None
+    with pytest.raises(ValueError):
+        with lazy_list.track_memory(on_exceed="ignore"):
+            pass
@@ -1,7 +1,11 @@
 import math
+import random
+import statistics
 
+import pytest
 from pytest import approx
 
+from lazy_list import rolling
 from lazy_list.num_list import NumList
 
 
@@ -335,3 +339,82 @@ def test_moving_average():
     for i, j in zip(out, expected):
         assert i == approx(j)
     assert isinstance(out, NumList)
+
+
+def test_numlist_rolling():
+    rng = random.Random(0)
+    lst = NumList(rng.uniform(-10, 10) for _ in range(200))
+    windows = [window for window in zip(*(lst[i:] for i in range(5)))]
+    assert lst.rolling_sum(5) == approx([sum(w) for w in windows])
+    assert lst.rolling_mean(5) == approx([statistics.mean(w) for w in windows])
+    assert lst.rolling_variance(5) == approx([statistics.variance(w) for w in windows])
+    assert lst.rolling_std_dev(5) == approx([statistics.stdev(w) for w in windows])
+    assert lst.rolling_min(5) == [min(w) for w in windows]
+    assert lst.rolling_max(5) == [max(w) for w in windows]
+    assert isinstance(lst.rolling_max(5), NumList)
+    assert NumList([1, 2, 3]).rolling_sum(4) == []
+    assert NumList([1, math.nan, 3, 4]).rolling_count(2) == [1, 1, 2]
+    with pytest.raises(ValueError):
+        lst.rolling_sum(0)
+    with pytest.raises(ValueError):
+        lst.rolling_variance(1)
+
+
+@pytest.mark.parametrize(
+    "function", [rolling.rolling_sum, rolling.rolling_variance, rolling.rolling_min, rolling.rolling_max]
+)
+def test_rolling_checks_window_when_called(function):
+    # the window is checked when the function is called, before any item is pulled
+    with pytest.raises(ValueError):
+        function([], 0)
+    with pytest.raises(ValueError):
+        function([1.0, 2.0], -1)
+    assert list(function([1.0], 2)) == []
+    with pytest.raises(ValueError):
+        rolling.rolling_variance([], 1)
+
+
+def test_numlist_rolling_large_magnitudes():
+    assert NumList([1e20, 1, 2, 3]).moving_average(1) == [1e20, 1, 2, 3]
+    assert NumList([1.5, 1e100, 1.0, -1e100, 2.5]).rolling_sum(3) == [1e100, 1.0, -1e100]
+    assert NumList([1e20, 1, 2, 3, 7]).rolling_variance(2) == approx([5e39, 0.5, 0.5, 8.0])
+    rng = random.Random(1)
+    lst = NumList(rng.choice([rng.uniform(-10, 10), 1e18, -1e18]) for _ in range(1000))
+    windows = [window for window in zip(*(lst[i:] for i in range(7)))]
+    assert lst.rolling_sum(7) == approx([math.fsum(w) for w in windows], rel=1e-9, abs=1e-6)
+    assert lst.rolling_variance(7) == approx([statistics.variance(w) for w in windows])
+
+
+def test_numlist_rolling_nan():
+    out = NumList([1, math.nan, 2, 3, 4, 5]).moving_average(2)
+    assert all(math.isnan(x) for x in out[:2])
+    assert out[2:] == [2.5, 3.5, 4.5]
+    out = NumList([1.0, math.inf, 2, 3, -math.inf, 5, math.inf, -math.inf, 1]).rolling_sum(2)
+    assert out[:6] == [math.inf, math.inf, 5, -math.inf, -math.inf, math.inf]
+    assert math.isnan(out[6]) and out[7] == -math.inf
+    out = NumList([1, math.nan, 2, 3, 4.5]).rolling_variance(2)
+    assert all(math.isnan(x) for x in out[:2])
+    assert out[2:] == [0.5, 1.125]
+
+
+def test_numlist_shift():
+    lst = NumList([1, 2, 3])
+    assert lst.shift(1, fill=0) == [0, 1, 2]
+    assert lst.shift(-2, fill=0) == [3, 0, 0]
+    assert lst.shift(5, fill=0) == [0, 0, 0]
+    assert math.isnan(lst.shift()[0])
+    assert isinstance(lst.shift(), NumList)
+
+
+def test_numlist_diff_k():
+    lst = NumList([1, 2, 4, 8])
+    assert lst.diff(2) == [3, 6]
+    with pytest.raises(ValueError):
+        lst.diff(0)
+
+
+def test_numlist_pct_change():
+    lst = NumList([1, 2, 3, 6])
+    assert lst.pct_change() == approx([1.0, 0.5, 1.0])
+    assert lst.pct_change(2) == approx([2.0, 2.0])
+    assert isinstance(lst.pct_change(), NumList)
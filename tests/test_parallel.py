@@ -0,0 +1,88 @@
+import operator
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from lazy_list import aggregate
+from lazy_list.parallel import aggregate_chunks, map_chunks
+
+
+def test_map_chunks_ordered():
+    result = list(map_chunks(lambda x: x * 2, range(100), workers=4, chunksize=7))
+    assert result == [x * 2 for x in range(100)]
+
+
+def test_map_chunks_unordered():
+    def slow_first(x):
+        if x == 0:
+            time.sleep(0.2)
+        return x
+
+    result = list(map_chunks(slow_first, range(20), workers=4, ordered=False))
+    assert sorted(result) == list(range(20))
+    assert result[0] != 0
+
+
+def test_map_chunks_process():
+    assert list(map_chunks(abs, [-1, -2, 3], workers=2, executor="process")) == [1, 2, 3]
+
+
+def test_map_chunks_raises():
+    def fail(x):
+        if x == 5:
+            raise ZeroDivisionError()
+        return x
+
+    with pytest.raises(ZeroDivisionError):
+        list(map_chunks(fail, range(10), workers=2))
+
+
+def test_map_chunks_backpressure():
+    pulled = []
+
+    def source():
+        for i in range(1000):
+            pulled.append(i)
+            yield i
+
+    results = map_chunks(lambda x: x, source(), workers=2, chunksize=10)
+    assert next(results) == 0
+    assert len(pulled) <= 60
+    results.close()
+    pool_threads = [thread for thread in threading.enumerate() if thread.name.startswith("ThreadPoolExecutor")]
+    assert not any(thread.is_alive() for thread in pool_threads)
+
+
+def test_map_chunks_invalid_arguments():
+    with pytest.raises(ValueError):
+        map_chunks(abs, [1], executor="fiber")
+    with pytest.raises(ValueError):
+        map_chunks(abs, [1], chunksize=0)
+    with pytest.raises(ValueError):
+        map_chunks(abs, [1], workers=-1)
+    with pytest.raises(ValueError):
+        map_chunks(abs, [1], workers=0)
+
+
+def test_aggregate_chunks_count():
+    values = list("abracadabra") * 10
+    result = aggregate_chunks(values, None, aggregate.COUNT, workers=2, executor="process", chunksize=7)
+    assert result == Counter(values)
+
+
+def test_aggregate_chunks_keeps_order():
+    values = list(range(100))
+    grouping = aggregate.grouping(tuple)
+    result = aggregate_chunks(values, lambda x: x % 3, grouping, workers=3, executor="thread", chunksize=8)
+    assert result == {k: tuple(range(k, 100, 3)) for k in range(3)}
+    reduction = aggregate.reduction(operator.add)
+    assert aggregate_chunks(values, None, reduction, workers=2, executor="thread", chunksize=8) == {
+        x: x for x in values
+    }
+
+
+def test_aggregate_chunks_chunksize():
+    with pytest.raises(ValueError):
+        aggregate_chunks([], None, aggregate.COUNT, chunksize=0)
@@ -0,0 +1,68 @@
+import itertools
+
+import pytest
+
+from lazy_list.plan import Stage, compile_stages, extend, run_stages, shape
+
+STAGE_RUNS = [
+    (),
+    (Stage("map", lambda x: x * 2),),
+    (Stage("filter", lambda x: x % 3), Stage("map", str)),
+    (Stage("filter"), Stage("filterfalse", lambda x: x % 2)),
+    (Stage("filterfalse"), Stage("enumerate")),
+    (Stage("dropwhile", lambda x: x < 5), Stage("takewhile", lambda x: x < 15)),
+    (Stage("slice", slice(2, 20, 3)), Stage("enumerate"), Stage("map", sum)),
+    (Stage("slice", slice(0, 5, 1)), Stage("slice", slice(1, None, 2))),
+    (Stage("slice", slice(5, 3, 1)),),
+    (Stage("slice", slice(0, 0, 1)),),
+    (Stage("map", lambda x: x + 1), Stage("slice", slice(0, None, 4)), Stage("filter", lambda x: x > 4)),
+    (Stage("map", lambda x: -x), Stage("sort", (None, False, 3)), Stage("enumerate")),
+    (Stage("sort", (lambda x: x % 4, True, None)), Stage("map", str)),
+    (Stage("filter", lambda x: x % 2), Stage("reverse", 2)),
+]
+
+
+class Source:
+    def __init__(self, n: int):
+        self.values = iter(range(n))
+        self.pulled = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        value = next(self.values)
+        self.pulled += 1
+        return value
+
+
+@pytest.mark.parametrize("stages", STAGE_RUNS)
+def test_compiled_stages_match_iterators(stages):
+    for n in (0, 1, 7, 30):
+        source1, source2 = Source(n), Source(n)
+        assert list(run_stages(source1, stages, compiled=True)) == list(run_stages(source2, stages))
+        assert source1.pulled == source2.pulled
+
+
+def test_compiled_stages_stop_early():
+    source = Source(100)
+    result = run_stages(source, (Stage("map", lambda x: x + 1), Stage("slice", slice(0, 3, 1))), compiled=True)
+    assert list(result) == [1, 2, 3]
+    assert source.pulled == 3
+
+
+def test_compiled_stages_cached_by_shape():
+    run1 = (Stage("map", abs), Stage("slice", slice(1, 5, 1)))
+    run2 = (Stage("map", str), Stage("slice", slice(2, 9, 1)))
+    assert shape(run1) == shape(run2)
+    assert compile_stages(shape(run1)) is compile_stages(shape(run2))
+    assert list(run_stages(itertools.count(), run2, compiled=True)) == ["2", "3", "4", "5", "6", "7", "8"]
+
+
+def test_extend_pushes_limit_into_barrier():
+    stages = extend((Stage("sort", (None, False, None)),), (Stage("slice", slice(0, 5, 1)),))
+    assert stages[0] == Stage("sort", (None, False, 5))
+    stages = extend((Stage("reverse", 3),), (Stage("slice", slice(1, 10, 1)),))
+    assert stages[0] == Stage("reverse", 3)
+    stages = extend((Stage("reverse"),), (Stage("slice", slice(2, None, 1)),))
+    assert stages[0] == Stage("reverse")
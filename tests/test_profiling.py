@@ -0,0 +1,69 @@
+import time
+
+import lazy_list
+from lazy_list import LazyList, profiling
+
+
+def slow_double(x):
+    time.sleep(0.001)
+    return x * 2
+
+
+def test_profile_records_stages():
+    with lazy_list.profile() as p:
+        result = LazyList(iter(range(20))).map(slow_double).filter(lambda x: x % 3).take(5).to_list()
+    assert result == [2, 4, 8, 10, 14]
+    assert [stats.name for stats in p.stages] == ["LazyList", "map", "filter", "take"]
+    source, mapped, filtered, taken = p.stages
+    assert mapped.parent is source
+    assert mapped.items_in == source.items_out
+    assert (filtered.items_in, filtered.items_out, taken.items_out) == (filtered.parent.items_out, 5, 5)
+    assert mapped.calls == mapped.items_out
+    assert mapped.call_wall >= 0.001 * mapped.calls
+    assert filtered.upstream == mapped.wall >= mapped.call_wall
+    assert taken.wall >= filtered.wall
+
+
+def test_profile_records_sequence_sources():
+    with lazy_list.profile() as p:
+        result = LazyList([1, 2, 3, 4, 5]).map(slow_double).enumerate().to_list()
+    assert result == list(enumerate([2, 4, 6, 8, 10]))
+    source, mapped, enumerated = p.stages
+    assert (source.items_out, mapped.items_in, mapped.items_out, mapped.calls) == (5, 5, 5, 5)
+    assert mapped.call_wall >= 0.001 * 5
+    assert (enumerated.items_in, enumerated.items_out) == (5, 5)
+    with lazy_list.profile() as p:
+        assert LazyList([1, 2, 3]).map(slow_double).last == 6
+    # the items are computed once into the replay buffer to look the last one up
+    assert p.stages[1].calls == 3
+
+
+def test_profile_report():
+    with lazy_list.profile() as p:
+        LazyList(range(10)).sort(key=lambda x: -x).unique().to_list()
+    report = p.report()
+    assert report.splitlines()[0].split()[:5] == ["#", "stage", "from", "in", "out"]
+    assert "sort" in report and "unique" in report
+    stages = p.to_dict()["stages"]
+    assert [stage["stage"] for stage in stages] == ["LazyList", "sort", "unique"]
+    assert stages[1]["calls"] == 10
+    assert stages[2]["upstream_stage"] == 1
+    assert stages[2]["items_in"] == stages[2]["items_out"] == 10
+
+
+def test_profile_pop_and_insert_read_their_list():
+    for name, derive in (("pop", lambda values: values.pop(2)), ("insert", lambda values: values.insert(2, "x"))):
+        with lazy_list.profile() as p:
+            derive(LazyList(iter(range(6))).map(str)).to_list()
+        stages = p.to_dict()["stages"]
+        assert [stage["stage"] for stage in stages] == ["LazyList", "map", name]
+        assert stages[2]["upstream_stage"] == 1
+        assert stages[1]["items_out"] == stages[2]["items_in"] == 6
+
+
+def test_profile_is_scoped():
+    with lazy_list.profile() as p:
+        assert profiling.active() is p
+    assert profiling.active() is None
+    LazyList(range(3)).map(str).to_list()
+    assert len(p.stages) == 0
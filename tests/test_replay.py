@@ -0,0 +1,94 @@
+import gc
+import weakref
+
+import pytest
+
+from lazy_list.replay import ReplayBuffer
+
+
+class Item:
+    pass
+
+
+def test_replay_buffer_replays():
+    buffer = ReplayBuffer(iter(range(10)), segment_size=3)
+    assert list(buffer) == list(range(10))
+    assert list(buffer) == list(range(10))
+
+
+def test_replay_buffer_interleaved_cursors():
+    buffer = ReplayBuffer(iter(range(10)), segment_size=4)
+    cursor1 = iter(buffer)
+    cursor2 = iter(buffer)
+    assert [next(cursor1) for _ in range(6)] == list(range(6))
+    assert next(cursor2) == 0
+    assert list(cursor1) == list(range(6, 10))
+    assert list(cursor2) == list(range(1, 10))
+
+
+def test_replay_buffer_cursors_take_turns_at_the_end():
+    buffer = ReplayBuffer(iter(range(10)), segment_size=4)
+    cursor1 = iter(buffer)
+    cursor2 = iter(buffer)
+    values1, values2 = [], []
+    for _ in range(5):
+        values1.append(next(cursor1))
+        values2.append(next(cursor2))
+        values2.append(next(cursor2))
+    assert buffer.item(9) == 9
+    assert values1 + list(cursor1) == list(range(10))
+    assert values2 + list(cursor2) == list(range(10))
+
+
+def test_replay_buffer_pulls_lazily():
+    pulled = []
+
+    def source():
+        for i in range(10):
+            pulled.append(i)
+            yield i
+
+    buffer = ReplayBuffer(source(), segment_size=4)
+    cursor = iter(buffer)
+    next(cursor)
+    next(cursor)
+    assert pulled == [0, 1]
+
+
+def test_replay_buffer_empty():
+    buffer = ReplayBuffer(iter([]))
+    assert list(buffer) == []
+    assert list(buffer) == []
+
+
+def test_replay_buffer_frees_unreachable_segments():
+    refs = []
+
+    def source():
+        for _ in range(10):
+            item = Item()
+            refs.append(weakref.ref(item))
+            yield item
+
+    buffer = ReplayBuffer(source(), segment_size=2)
+    cursor = iter(buffer)
+    del buffer
+    for _ in range(6):
+        next(cursor)
+    gc.collect()
+    assert all(ref() is None for ref in refs[:4])
+    assert all(ref() is not None for ref in refs[4:6])
+
+
+def test_replay_buffer_invalid_segment_size():
+    with pytest.raises(ValueError):
+        ReplayBuffer([], segment_size=0)
+
+
+def test_replay_buffer_item():
+    buffer = ReplayBuffer(iter(range(10)), segment_size=3)
+    assert buffer.item(7) == 7
+    assert buffer.item(0) == 0
+    assert list(buffer) == list(range(10))
+    with pytest.raises(IndexError):
+        buffer.item(10)
@@ -0,0 +1,58 @@
+import random
+from collections import Counter
+
+import pytest
+
+from lazy_list.sampling import choices, sample, weighted_sample
+
+
+def test_choices_uniform():
+    rng = random.Random(0)
+    counts = Counter(choices(((i, 1) for i in range(10)), 20000, rng))
+    assert set(counts) == set(range(10))
+    assert all(1700 < count < 2300 for count in counts.values())
+
+
+def test_choices_weighted():
+    rng = random.Random(1)
+    counts = Counter(choices([("a", 1), ("b", 0), ("c", 3)], 20000, rng))
+    assert "b" not in counts
+    assert 0.7 < counts["c"] / 20000 < 0.8
+
+
+def test_choices_empty_population():
+    with pytest.raises(IndexError):
+        list(choices([], 3, random.Random()))
+    assert list(choices([], 0, random.Random())) == []
+
+
+def test_sample_uniform():
+    rng = random.Random(2)
+    counts = Counter()
+    for _ in range(2000):
+        result = list(sample(iter(range(100)), 5, rng))
+        assert len(set(result)) == 5
+        counts.update(result)
+    assert all(50 < count < 160 for count in counts.values())
+
+
+def test_sample_too_large():
+    with pytest.raises(ValueError):
+        list(sample(range(3), 4, random.Random()))
+    assert sorted(sample(range(3), 3, random.Random())) == [0, 1, 2]
+
+
+def test_weighted_sample():
+    rng = random.Random(3)
+    counts = Counter()
+    for _ in range(2000):
+        result = list(weighted_sample([("a", 1), ("b", 0), ("c", 8), ("d", 1)], 2, rng))
+        assert len(set(result)) == 2
+        counts.update(result)
+    assert "b" not in counts
+    assert counts["c"] > 1800
+
+
+def test_weighted_sample_too_large():
+    with pytest.raises(ValueError):
+        list(weighted_sample([("a", 1), ("b", 0)], 2, random.Random()))
@@ -0,0 +1,93 @@
+import pickle
+import random
+from collections import Counter
+
+import pytest
+
+from lazy_list.sketches import BloomFilter, CountMinSketch, HyperLogLog, MisraGries, item_hash
+
+
+def test_item_hash():
+    assert item_hash("abc") == item_hash("abc")
+    assert item_hash((1, 2)) == item_hash((1, 2))
+    assert item_hash(1) == item_hash(1.0) == item_hash(True)
+    assert 0 <= item_hash(12) < 2 ** 64
+
+
+def test_sketches_follow_equality():
+    assert HyperLogLog().update([1, 1.0, True]).estimate() == 1
+    sketch = CountMinSketch().update([1.0] * 5)
+    assert sketch[1] == sketch[True] == 5
+    key = lambda x: x  # noqa: E731
+    assert HyperLogLog().update([key, key, len]).estimate() == 2
+    assert CountMinSketch().update([key, key])[key] == 2
+
+
+def test_hyperloglog():
+    sketch = HyperLogLog(error=0.02).update(range(50_000))
+    assert abs(sketch.estimate() - 50_000) < 50_000 * 0.08
+    assert HyperLogLog().update("aaabbc").estimate() == 3
+    assert HyperLogLog().estimate() == 0
+
+
+def test_hyperloglog_merge():
+    left = HyperLogLog(precision=12).update(range(0, 6000))
+    right = pickle.loads(pickle.dumps(HyperLogLog(precision=12).update(range(4000, 10_000))))
+    assert abs(left.merge(right).estimate() - 10_000) < 10_000 * 0.08
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(precision=10))
+
+
+def test_misra_gries():
+    rng = random.Random(0)
+    values = [rng.choice("ab") if rng.random() < 0.5 else rng.randrange(1000) for _ in range(10_000)]
+    counts = Counter(values)
+    summary = MisraGries(9).update(values)
+    top = dict(summary.most_common())
+    assert {"a", "b"} <= set(top)
+    for item, count in top.items():
+        assert counts[item] - summary.error() <= count <= counts[item]
+    assert summary.error() <= len(values) // 10
+
+
+def test_misra_gries_merge():
+    values = list("aaaabbbcd" * 50) + list(range(200))
+    summary = MisraGries(3).update(values[:300]).merge(MisraGries(3).update(values[300:]))
+    assert summary.n == len(values)
+    assert summary.most_common()[0][0] == "a"
+    with pytest.raises(ValueError):
+        summary.merge(MisraGries(4))
+    with pytest.raises(ValueError):
+        MisraGries(0)
+
+
+def test_count_min_sketch():
+    values = [random.Random(i).randrange(100) for i in range(5000)]
+    counts = Counter(values)
+    sketch = CountMinSketch(error=0.01, confidence=0.99).update(values)
+    for value, count in counts.items():
+        assert count <= sketch[value] <= count + 0.01 * len(values) * 3
+    merged = CountMinSketch(0.01).update(values[:2500]).merge(CountMinSketch(0.01).update(values[2500:]))
+    assert merged.count(7) == sketch.count(7)
+    with pytest.raises(ValueError):
+        merged.merge(CountMinSketch(0.1))
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    assert not bloom.add("a")
+    assert bloom.add("a")
+    assert "a" in bloom
+    bloom.merge(_filled(range(100)))
+    assert all(i in bloom for i in range(100))
+    false_positives = sum(i in bloom for i in range(1000, 11_000))
+    assert false_positives < 10_000 * 0.03
+    with pytest.raises(ValueError):
+        bloom.merge(BloomFilter(capacity=10))
+
+
+def _filled(values):
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for value in values:
+        bloom.add(value)
+    return bloom
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from lazy_list import spill
+
+
+def test_spill_file_roundtrip(monkeypatch):
+    monkeypatch.setattr(spill, "FRAME_SIZE", 3)
+    file = spill.SpillFile()
+    file.write_all(range(10))
+    assert file.count == 10
+    assert list(file) == list(range(10))
+    # readers are independent
+    first, second = iter(file), iter(file)
+    assert [next(first), next(first), next(second)] == [0, 1, 0]
+    file.close()
+
+
+def test_runs():
+    chunks = list(spill.runs(["x" * 100] * 10, memory_limit=400))
+    assert sum(map(len, chunks)) == 10
+    assert all(1 <= len(chunk) <= 3 for chunk in chunks)
+    assert list(spill.runs([], memory_limit=10)) == []
+    # items larger than the limit get a run of their own
+    assert list(spill.runs(["x" * 100, "y" * 100], memory_limit=10)) == [["x" * 100], ["y" * 100]]
+    with pytest.raises(ValueError):
+        list(spill.runs([1], memory_limit=0))
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_external_sort_is_stable(reverse):
+    rng = random.Random(0)
+    values = [(rng.randrange(20), i) for i in range(2000)]
+    result = list(spill.external_sort(values, key=lambda x: x[0], reverse=reverse, memory_limit=2000))
+    assert result == sorted(values, key=lambda x: x[0], reverse=reverse)
+
+
+def test_external_sort_merges_in_passes(monkeypatch):
+    monkeypatch.setattr(spill, "MAX_MERGE", 3)
+    values = list(range(500))
+    random.Random(1).shuffle(values)
+    assert list(spill.external_sort(values, memory_limit=500)) == list(range(500))
+
+
+def test_external_sort_in_memory():
+    assert list(spill.external_sort([3, 1, 2])) == [1, 2, 3]
+    assert list(spill.external_sort([])) == []
@@ -0,0 +1,56 @@
+import pytest
+
+from lazy_list.plan import Stage
+from lazy_list.replay import ReplayBuffer
+from lazy_list.views import BufferedView, EnumeratedView, MappedView, SliceView, apply, is_computed
+
+
+def test_mapped_view():
+    view = MappedView([1, 2, 3], lambda x: x * 10)
+    assert list(view) == [10, 20, 30]
+    assert view[1] == 20
+    assert view[-1] == 30
+    assert len(view) == 3
+    assert is_computed(view)
+
+
+def test_enumerated_view():
+    view = EnumeratedView("abc")
+    assert list(view) == [(0, "a"), (1, "b"), (2, "c")]
+    assert view[-1] == (2, "c")
+    assert not is_computed(view)
+
+
+@pytest.mark.parametrize(
+    "bounds", [slice(None, None, -1), slice(1, 8, 3), slice(-3, None), slice(-1, 2, -2), slice(5, 2)]
+)
+def test_slice_view(bounds):
+    values = list(range(10))
+    view = SliceView(values, bounds)
+    assert list(view) == values[bounds]
+    assert len(view) == len(values[bounds])
+    assert [view[i] for i in range(len(view))] == values[bounds]
+
+
+def test_slice_view_follows_base():
+    values = [1, 2, 3]
+    view = SliceView(values, slice(None, None, -1))
+    values.append(4)
+    assert list(view) == [4, 3, 2, 1]
+
+
+def test_buffered_view():
+    view = BufferedView(ReplayBuffer(iter("abcd")), 3)
+    assert (len(view), view[-1], view[0]) == (3, "c", "a")
+    assert list(view[::-1]) == ["c", "b", "a"]
+    assert not is_computed(view)
+    with pytest.raises(IndexError):
+        view[3]
+
+
+def test_apply():
+    view = apply(range(10), (Stage("map", str), Stage("reverse", 3), Stage("enumerate")))
+    assert list(view) == [(0, "9"), (1, "8"), (2, "7")]
+    assert is_computed(view)
+    assert apply(range(10), (Stage("map", str), Stage("filter", None))) is None
+    assert apply(None, (Stage("map", str),)) is None